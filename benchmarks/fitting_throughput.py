@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vazão do ajuste em lote de curvas J-V (modules/fitting.py).
+
+Gera curvas sintéticas com parâmetros aleatórios e ruído gaussiano,
+ajusta todas e informa curvas por segundo, taxa de convergência e erro
+relativo mediano dos parâmetros recuperados.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.fitting_throughput --curvas 20000 --processos 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+from modules.constants import k_B, q
+from modules.device import corrente_diodo_lambertw
+from modules.fitting import ajustar_curvas_JV
+
+
+def gerar_curvas(num_curvas, num_pontos, ruido, semente=0, temperatura=300.0):
+    """Curvas J-V sintéticas de células tipo silício com ruído em J [A/m^2]."""
+    gerador = np.random.default_rng(semente)
+    referencia = {
+        "J_ph": gerador.uniform(300.0, 450.0, num_curvas),
+        "fator_idealidade": gerador.uniform(1.0, 1.8, num_curvas),
+        "resistencia_serie": gerador.uniform(0.0, 3e-4, num_curvas),
+        "resistencia_shunt": 10.0 ** gerador.uniform(-1.5, 1.0, num_curvas),
+    }
+    # J0 escolhido para V_oc perto de 0,65 V
+    referencia["J0"] = np.exp(np.log(referencia["J_ph"]) - 0.65 * q
+                              / (referencia["fator_idealidade"] * k_B * temperatura))
+
+    tensoes_V = np.linspace(0.0, 0.72, num_pontos)
+    correntes_J = corrente_diodo_lambertw(
+        tensoes_V,
+        *(referencia[chave][:, None] for chave in ("J_ph", "J0")),
+        temperatura,
+        *(referencia[chave][:, None] for chave in
+          ("fator_idealidade", "resistencia_serie", "resistencia_shunt")),
+    )
+    correntes_J = correntes_J + gerador.normal(0.0, ruido, correntes_J.shape)
+    return tensoes_V, correntes_J, referencia
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--curvas", type=int, default=10_000)
+    parser.add_argument("--pontos", type=int, default=120)
+    parser.add_argument("--ruido", type=float, default=0.05, help="Desvio do ruído [A/m^2]")
+    parser.add_argument("--processos", type=int, default=1)
+    args = parser.parse_args()
+
+    tensoes_V, correntes_J, referencia = gerar_curvas(args.curvas, args.pontos, args.ruido)
+
+    inicio = time.perf_counter()
+    resultado = ajustar_curvas_JV(tensoes_V, correntes_J, num_processos=args.processos)
+    duracao = time.perf_counter() - inicio
+
+    print(f"Curvas: {args.curvas} × {args.pontos} pontos, {args.processos} processo(s)")
+    print(f"Tempo: {duracao:.2f} s  ({args.curvas / duracao:,.0f} curvas/s)")
+    print(f"Convergidas: {resultado['Convergido'].mean():.1%}, "
+          f"estagnadas: {resultado['Estagnado'].mean():.1%}, "
+          f"iterações medianas: {np.median(resultado['Iteracoes']):.0f}")
+    print(f"Resíduo RMS mediano: {np.median(resultado['Residuo_RMS']):.3g} A/m^2")
+    for chave, valores in referencia.items():
+        erro = np.median(np.abs(resultado[chave] / valores - 1.0))
+        print(f"  erro relativo mediano {chave:18s}: {erro:.2e}")
+
+
+if __name__ == "__main__":
+    main()
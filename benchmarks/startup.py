@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orçamento de inicialização da execução sem gráficos.
+
+Mede, em processos novos, o tempo de `import main` e de uma execução
+completa de `python main.py --sem-graficos`, e verifica que a execução sem
+gráficos não carrega matplotlib, Tk nem SciPy.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --orcamento 0.3
+
+Código de saída 1 quando a mediana de `import main` passa do orçamento ou
+algum módulo proibido é carregado.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+ORCAMENTO_INICIALIZACAO_S = 0.3     # mediana de `import main`, processo novo
+MODULOS_PROIBIDOS = ("matplotlib", "tkinter", "scipy")
+
+VERIFICACAO = f"""
+import contextlib, io, json, sys
+import main
+with contextlib.redirect_stdout(io.StringIO()):
+    main.main(["--sem-graficos"])
+print(json.dumps(sorted(m for m in {MODULOS_PROIBIDOS!r} if m in sys.modules)))
+"""
+
+
+def _cronometrar(comando, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=RAIZ, check=True, stdout=subprocess.DEVNULL)
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos))
+
+
+def medir_inicializacao(repeticoes: int = 5) -> dict:
+    """
+    Tempos medianos [s] em processos novos: interpretador vazio, `import
+    main` e `main.py --sem-graficos` completo.
+    """
+    return {
+        "interpretador_s": _cronometrar([sys.executable, "-c", "pass"], repeticoes),
+        "import_main_s": _cronometrar([sys.executable, "-c", "import main"], repeticoes),
+        "sem_graficos_s": _cronometrar([sys.executable, "main.py", "--sem-graficos"],
+                                       repeticoes),
+    }
+
+
+def modulos_carregados_sem_graficos() -> list:
+    """Módulos proibidos presentes em sys.modules após uma execução sem gráficos."""
+    saida = subprocess.run([sys.executable, "-c", VERIFICACAO], cwd=RAIZ, check=True,
+                           capture_output=True, text=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--orcamento", type=float, default=ORCAMENTO_INICIALIZACAO_S,
+                        help="Tempo máximo [s] da mediana de `import main`")
+    args = parser.parse_args()
+
+    tempos = medir_inicializacao(args.repeticoes)
+    print("Tempo em processo novo (mediana):")
+    print(f"  interpretador vazio       {tempos['interpretador_s'] * 1e3:8.1f} ms")
+    print(f"  import main               {tempos['import_main_s'] * 1e3:8.1f} ms"
+          f"  (orçamento {args.orcamento * 1e3:.0f} ms)")
+    print(f"  main.py --sem-graficos    {tempos['sem_graficos_s'] * 1e3:8.1f} ms")
+
+    proibidos = modulos_carregados_sem_graficos()
+    falhas = 0
+    if proibidos:
+        print(f"Módulos carregados sem necessidade: {', '.join(proibidos)}")
+        falhas += 1
+    if tempos["import_main_s"] > args.orcamento:
+        print("Orçamento de inicialização excedido.")
+        falhas += 1
+    if not falhas:
+        print("Dentro do orçamento; nenhum módulo proibido carregado.")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suíte de benchmarks das etapas do pipeline.
+
+Mede o tempo por chamada de cada caso (mínimo e mediana de várias
+repetições, com número de laços calibrado por timeit), grava a execução num
+histórico JSON e compara com uma linha de base, acusando regressões acima
+do limiar. O modo de escala mede a vazão conforme o tamanho do lote e o
+número de processos crescem.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.suite                      # mede, grava e compara
+    python -m benchmarks.suite --salvar-baseline    # redefine a linha de base
+    python -m benchmarks.suite --filtro curva_JV    # só os casos que casam
+    python -m benchmarks.suite --escala             # vazão × lote e × processos
+
+Código de saída 1 quando há regressão em relação à linha de base.
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+from modules.constants import eV_to_J
+from modules.solar import fluxo_fotons_corpo_negro, calcular_corrente_fotogerada_limite
+from modules.device import (calcular_corrente_saturacao_radiativa, curva_JV_diodo,
+                            curvas_JV_lote)
+from modules.analysis import extrair_parametros
+from modules.cache import CACHE_PADRAO
+from main import simulacao_padrao
+
+DIRETORIO = Path(__file__).resolve().parent
+HISTORICO_PADRAO = DIRETORIO / "historico.json"
+BASELINE_PADRAO = DIRETORIO / "baseline.json"
+LIMIAR_PADRAO = 0.20     # regressão: mediana 20% acima da linha de base
+
+# Regimes de resistência para a curva J-V: (Rs [Ω·m²], Rsh [Ω·m²])
+REGIMES_RESISTENCIA = {
+    "ideal": (0.0, np.inf),
+    "moderado": (1e-4, 1e2),
+    "rs_alto": (0.5, 1e4),
+}
+TAMANHOS_CURVA = (100, 400, 2000)
+
+
+def _caso_simulacao_padrao():
+    def executar():
+        CACHE_PADRAO.invalidar()      # mede o caminho completo, sem J_ph/J0 em cache
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulacao_padrao(plotar=False)
+    return executar
+
+
+def casos_benchmark() -> dict:
+    """
+    Casos da suíte: nome → função sem argumentos a ser cronometrada.
+    As entradas são preparadas aqui, fora da medição.
+    """
+    energias_J = np.linspace(0.01, 10.0, 4000) * eV_to_J
+    J_ph = calcular_corrente_fotogerada_limite(1.12)
+    J0 = calcular_corrente_saturacao_radiativa(1.12)
+
+    casos = {
+        "fluxo_fotons_corpo_negro[4000]":
+            lambda: fluxo_fotons_corpo_negro(energias_J, 5778.0),
+    }
+    for integrador in ("trapezio", "analitico"):
+        casos[f"J_ph[{integrador}]"] = lambda integrador=integrador: \
+            calcular_corrente_fotogerada_limite(1.12, integrador=integrador)
+        casos[f"J0[{integrador}]"] = lambda integrador=integrador: \
+            calcular_corrente_saturacao_radiativa(1.12, integrador=integrador)
+
+    for regime, (Rs, Rsh) in REGIMES_RESISTENCIA.items():
+        for num_pontos in TAMANHOS_CURVA:
+            casos[f"curva_JV[newton,{regime},{num_pontos}]"] = (
+                lambda Rs=Rs, Rsh=Rsh, num_pontos=num_pontos: curva_JV_diodo(
+                    J_ph, J0, resistencia_serie=Rs, resistencia_shunt=Rsh,
+                    num_pontos_tensao=num_pontos))
+        for metodo in ("newton_vetorizado", "lambertw"):
+            casos[f"curva_JV[{metodo},{regime},400]"] = (
+                lambda Rs=Rs, Rsh=Rsh, metodo=metodo: curva_JV_diodo(
+                    J_ph, J0, resistencia_serie=Rs, resistencia_shunt=Rsh, metodo=metodo))
+
+    tensoes_V, correntes_J = curva_JV_diodo(J_ph, J0, resistencia_serie=1e-4,
+                                            resistencia_shunt=1e2)
+    casos["extrair_parametros[400]"] = lambda: extrair_parametros(
+        tensoes_V, correntes_J, J_ph, J0, 300.0, 1.0)
+    casos["simulacao_padrao[sem_graficos]"] = _caso_simulacao_padrao()
+    return casos
+
+
+def medir(funcao, repeticoes: int = 5) -> dict:
+    """
+    Tempo por chamada [s]: número de laços calibrado por timeit.autorange
+    (≥ 0,2 s por repetição), mínimo e mediana entre as repetições.
+    """
+    cronometro = timeit.Timer(funcao)
+    lacos, _ = cronometro.autorange()
+    tempos = np.array(cronometro.repeat(repeat=repeticoes, number=lacos)) / lacos
+    return {
+        "minimo_s": float(tempos.min()),
+        "mediana_s": float(np.median(tempos)),
+        "lacos": lacos,
+        "repeticoes": repeticoes,
+    }
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=DIRETORIO, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar_suite(filtro: str = None, repeticoes: int = 5) -> dict:
+    """Mede todos os casos (ou os que contêm `filtro`) e devolve o registro da execução."""
+    resultados = {}
+    for nome, funcao in casos_benchmark().items():
+        if filtro and filtro not in nome:
+            continue
+        resultados[nome] = medir(funcao, repeticoes)
+        print(f"  {nome:45s} {resultados[nome]['mediana_s'] * 1e3:10.3f} ms")
+    return {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_atual(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.machine(),
+        "cpus": os.cpu_count(),
+        "resultados": resultados,
+    }
+
+
+def gravar_historico(execucao: dict, caminho=HISTORICO_PADRAO):
+    """Acrescenta a execução ao histórico JSON (lista de execuções)."""
+    caminho = Path(caminho)
+    historico = json.loads(caminho.read_text(encoding="utf-8")) if caminho.exists() else []
+    historico.append(execucao)
+    caminho.write_text(json.dumps(historico, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def comparar(execucao: dict, baseline: dict, limiar: float = LIMIAR_PADRAO) -> list:
+    """
+    Compara as medianas com a linha de base.
+
+    Retorna:
+        lista de (nome, razão atual/base) dos casos com razão > 1 + limiar
+    """
+    regressoes = []
+    for nome, atual in execucao["resultados"].items():
+        base = baseline["resultados"].get(nome)
+        if base is None:
+            print(f"  {nome:45s} {'(sem linha de base)':>22s}")
+            continue
+        razao = atual["mediana_s"] / base["mediana_s"]
+        marca = "  ← REGRESSÃO" if razao > 1.0 + limiar else ""
+        print(f"  {nome:45s} {razao:8.2f}× da base{marca}")
+        if marca:
+            regressoes.append((nome, razao))
+    return regressoes
+
+
+def medir_escala():
+    """
+    Vazão conforme o problema cresce: curvas_JV_lote com lotes crescentes
+    (curvas/s) e mapa_eficiencia com 1, 2, 4, ... processos (pontos/s).
+    """
+    from modules.sweep import mapa_eficiencia
+
+    J_ph = calcular_corrente_fotogerada_limite(1.12, integrador="analitico")
+    J0 = calcular_corrente_saturacao_radiativa(1.12, integrador="analitico")
+    gerador = np.random.default_rng(0)
+
+    print("Vazão × tamanho do lote (curvas_JV_lote, lambertw, 400 pontos):")
+    for num_curvas in (100, 1_000, 10_000, 100_000):
+        Rs = gerador.uniform(0.0, 1e-3, num_curvas)
+        inicio = time.perf_counter()
+        curvas_JV_lote(J_ph, J0, resistencia_serie=Rs, resistencia_shunt=1e2)
+        duracao = time.perf_counter() - inicio
+        print(f"  {num_curvas:>8d} curvas: {num_curvas / duracao:12,.0f} curvas/s")
+
+    eixos = {
+        "energia_gap_eV": np.linspace(0.5, 3.0, 1000),
+        "temperatura_celula": np.linspace(250.0, 400.0, 400),
+    }
+    total = 1000 * 400
+    print(f"Vazão × processos (mapa_eficiencia, {total:,} pontos):")
+    num_processos = 1
+    while num_processos <= (os.cpu_count() or 1):
+        inicio = time.perf_counter()
+        mapa_eficiencia(eixos, num_processos=num_processos, integrador="analitico",
+                        resistencia_serie=1e-4)
+        duracao = time.perf_counter() - inicio
+        print(f"  {num_processos:>3d} processo(s): {total / duracao:12,.0f} pontos/s")
+        num_processos *= 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--filtro", help="Executa só os casos cujo nome contém o texto")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--historico", default=HISTORICO_PADRAO)
+    parser.add_argument("--baseline", default=BASELINE_PADRAO)
+    parser.add_argument("--limiar", type=float, default=LIMIAR_PADRAO,
+                        help="Aumento relativo da mediana considerado regressão")
+    parser.add_argument("--salvar-baseline", action="store_true",
+                        help="Grava esta execução como a nova linha de base")
+    parser.add_argument("--escala", action="store_true",
+                        help="Mede a vazão × lote e × processos em vez da suíte")
+    args = parser.parse_args()
+
+    if args.escala:
+        medir_escala()
+        return 0
+
+    print("Tempo por chamada (mediana):")
+    execucao = executar_suite(args.filtro, args.repeticoes)
+    gravar_historico(execucao, args.historico)
+
+    caminho_baseline = Path(args.baseline)
+    if args.salvar_baseline:
+        caminho_baseline.write_text(json.dumps(execucao, indent=2, ensure_ascii=False),
+                                    encoding="utf-8")
+        print(f"Linha de base gravada em {caminho_baseline}")
+        return 0
+    if not caminho_baseline.exists():
+        print("Sem linha de base; use --salvar-baseline para criar uma.")
+        return 0
+
+    print(f"Comparação com a linha de base (limiar {args.limiar:.0%}):")
+    baseline = json.loads(caminho_baseline.read_text(encoding="utf-8"))
+    regressoes = comparar(execucao, baseline, args.limiar)
+    if regressoes:
+        print(f"{len(regressoes)} regressão(ões) acima do limiar.")
+        return 1
+    print("Nenhuma regressão.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,4 @@
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import matplotlib.pyplot as plt
@@ -6,9 +7,11 @@ from matplotlib.figure import Figure
 import numpy as np
 
 from modules.quantum import SILICON, GAAS, PEROVSKITE
-from modules.solar import calcular_corrente_fotogerada_limite
-from modules.device import calcular_corrente_saturacao_radiativa, curva_JV_diodo
-from modules.analysis import extrair_parametros
+from modules.worker import TrabalhadorCalculo
+from modules.simulation import Simulacao
+
+# Intervalo de consulta ao processo de cálculo (ms)
+INTERVALO_CONSULTA_MS = 50
 
 
 class CalculadoraFotovoltaica:
@@ -28,7 +31,19 @@ class CalculadoraFotovoltaica:
         self.cor_fundo = '#f0f0f0'
         self.cor_texto = '#333333'
         
+        # Grafo de cálculo para os sliders: só os nós afetados são refeitos,
+        # com partida a quente do Newton a partir da curva anterior
+        self.simulacao_ao_vivo = Simulacao()
+        self.atualizacao_agendada = False
+        self.instantes_atualizacao = []
+
         self.criar_interface()
+
+        # Cálculo em processo separado; resultados chegam por consulta periódica
+        self.trabalhador = TrabalhadorCalculo()
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar)
+        self.root.after(INTERVALO_CONSULTA_MS, self.verificar_trabalhador)
+        self.agendar_atualizacao_ao_vivo()
         
     def criar_interface(self):
         """Cria todos os elementos da interface."""
@@ -109,20 +124,20 @@ class CalculadoraFotovoltaica:
         # ========== MATERIAL ==========
         self.criar_grupo("📦 MATERIAL", scrollable_frame, [
             ("Material:", "combobox", ["Silício (Si)", "Arsenieto de Gálio (GaAs)", "Perovskita (MAPI)"], "Silício (Si)", "material"),
-            ("Energia de Gap (eV):", "entry", None, "1.12", "energia_gap"),
+            ("Energia de Gap (eV):", "slider", (0.5, 3.0, 0.01), 1.12, "energia_gap"),
         ])
         
         # ========== TEMPERATURA ==========
         self.criar_grupo("🌡️ TEMPERATURA", scrollable_frame, [
-            ("Temperatura da Célula (K):", "entry", None, "300.0", "temp_celula"),
-            ("Temperatura do Sol (K):", "entry", None, "5778.0", "temp_sol"),
+            ("Temperatura da Célula (K):", "slider", (200.0, 400.0, 0.5), 300.0, "temp_celula"),
+            ("Temperatura do Sol (K):", "slider", (3000.0, 7000.0, 10.0), 5778.0, "temp_sol"),
         ])
         
         # ========== PARÂMETROS DO DIODO ==========
         self.criar_grupo("⚡ PARÂMETROS DO DIODO", scrollable_frame, [
-            ("Fator de Idealidade (n):", "entry", None, "1.0", "fator_idealidade"),
-            ("Resistência Série Rs (Ω·m²):", "entry", None, "0.5", "res_serie"),
-            ("Resistência Shunt Rsh (Ω·m²):", "entry", None, "10000", "res_shunt"),
+            ("Fator de Idealidade (n):", "slider", (1.0, 3.0, 0.01), 1.0, "fator_idealidade"),
+            ("Resistência Série Rs (Ω·m²):", "slider_log", (-6.0, 0.0, 0.001), 0.5, "res_serie"),
+            ("Resistência Shunt Rsh (Ω·m²):", "slider_log", (-2.0, 6.0, 0.001), 10000.0, "res_shunt"),
         ])
         
         # ========== SIMULAÇÃO ===========
@@ -142,6 +157,47 @@ class CalculadoraFotovoltaica:
             command=self.calcular
         )
         btn_calcular_esquerda.pack(pady=10)
+
+        # Progresso e cancelamento do cálculo em segundo plano
+        progresso_frame = tk.Frame(parent, bg='white')
+        progresso_frame.pack(fill='x', padx=10)
+
+        self.barra_progresso = ttk.Progressbar(
+            progresso_frame, orient='horizontal', mode='determinate', maximum=1.0
+        )
+        self.barra_progresso.pack(side='left', fill='x', expand=True, padx=(0, 10))
+
+        self.btn_cancelar = tk.Button(
+            progresso_frame,
+            text="⏹ CANCELAR",
+            font=('Arial', 9, 'bold'),
+            bg=self.cor_secundaria,
+            fg='white',
+            relief='flat',
+            state='disabled',
+            cursor='hand2',
+            command=self.cancelar
+        )
+        self.btn_cancelar.pack(side='right')
+
+        self.status_calculo = tk.Label(
+            parent, text="", font=('Arial', 9), bg='white', fg=self.cor_texto, anchor='w'
+        )
+        self.status_calculo.pack(fill='x', padx=10)
+
+        # Modo ao vivo: os sliders recalculam a curva enquanto são arrastados
+        self.modo_ao_vivo = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            parent, text="Atualizar ao vivo com os sliders", variable=self.modo_ao_vivo,
+            font=('Arial', 9), bg='white', anchor='w',
+            command=self.agendar_atualizacao_ao_vivo
+        ).pack(fill='x', padx=10)
+
+        self.status_ao_vivo = tk.Label(
+            parent, text="", font=('Courier New', 9), bg='white', fg=self.cor_texto,
+            anchor='w', justify='left'
+        )
+        self.status_ao_vivo.pack(fill='x', padx=10)
         # Área de resultados à esquerda (após o botão)
         self.criar_area_resultados_esquerda(parent)
         # ========== SIMULAÇÃO ==========
@@ -167,6 +223,8 @@ class CalculadoraFotovoltaica:
         
         if not hasattr(self, 'inputs'):
             self.inputs = {}
+            self.rotulos_slider = {}
+            self.sliders_log = set()
         
         for label_text, tipo, opcoes, valor_padrao, chave in campos:
             frame_campo = tk.Frame(grupo_frame, bg='white')
@@ -185,8 +243,27 @@ class CalculadoraFotovoltaica:
                 entrada = tk.Entry(frame_campo, font=('Arial', 10), width=15)
                 entrada.insert(0, valor_padrao)
                 entrada.pack(side='right')
+                entrada.bind('<Return>', lambda _evento: self.agendar_atualizacao_ao_vivo())
+                entrada.bind('<FocusOut>', lambda _evento: self.agendar_atualizacao_ao_vivo())
                 self.inputs[chave] = entrada
             
+            elif tipo in ("slider", "slider_log"):
+                # Sliders em escala log10 para grandezas que variam em décadas
+                minimo, maximo, resolucao = opcoes
+                rotulo_valor = tk.Label(frame_campo, font=('Arial', 9), bg='white', width=9)
+                rotulo_valor.pack(side='right')
+                entrada = tk.Scale(
+                    frame_campo, from_=minimo, to=maximo, resolution=resolucao,
+                    orient='horizontal', showvalue=False, length=160, bg='white',
+                    highlightthickness=0, command=self.ao_mover_slider
+                )
+                entrada.pack(side='right')
+                self.inputs[chave] = entrada
+                self.rotulos_slider[chave] = rotulo_valor
+                if tipo == "slider_log":
+                    self.sliders_log.add(chave)
+                self.definir_slider(chave, valor_padrao)
+
             elif tipo == "combobox":
                 entrada = ttk.Combobox(frame_campo, values=opcoes, state='readonly', width=25)
                 entrada.set(valor_padrao)
@@ -225,6 +302,9 @@ class CalculadoraFotovoltaica:
         
         # Inserir conteúdo teórico
         self.preencher_teoria()
+
+        # Gráficos J-V e P-V atualizados no lugar
+        self.criar_grafico_ao_vivo(parent)
         
         # Área de resultados
         self.criar_area_resultados(parent)
@@ -338,6 +418,80 @@ Concentração intrínseca:
         self.texto_resultados.insert('1.0', "Configure os parâmetros e clique em 'CALCULAR' para ver os resultados...")
         self.texto_resultados.config(state='disabled')
         
+    def criar_grafico_ao_vivo(self, parent):
+        """
+        Cria os gráficos J-V e P-V embutidos. As linhas são criadas uma vez
+        e atualizadas com set_data e blitting: só as linhas são redesenhadas
+        sobre o fundo (eixos, grade, rótulos) guardado em memória.
+        """
+        grafico_frame = tk.Frame(parent, bg='white')
+        grafico_frame.pack(fill='both', expand=True, padx=10)
+
+        self.figura = Figure(figsize=(6, 2.6))
+        self.ax_jv = self.figura.add_subplot(121)
+        self.ax_pv = self.figura.add_subplot(122)
+        for ax, titulo, rotulo_y in (
+            (self.ax_jv, 'Curva J-V', 'J [mA/cm²]'),
+            (self.ax_pv, 'Curva P-V', 'P [W/m²]'),
+        ):
+            ax.set_title(titulo, fontsize=10, fontweight='bold')
+            ax.set_xlabel('Tensão [V]', fontsize=9)
+            ax.set_ylabel(rotulo_y, fontsize=9)
+            ax.tick_params(labelsize=8)
+            ax.grid(True, alpha=0.3)
+        self.ax_jv.axhline(0, linestyle='--', color='gray', alpha=0.7)
+
+        linha_jv, = self.ax_jv.plot([], [], linewidth=2, color='#2E86AB', animated=True)
+        linha_pv, = self.ax_pv.plot([], [], linewidth=2, color='#A23B72', animated=True)
+        self.linhas = ((self.ax_jv, linha_jv), (self.ax_pv, linha_pv))
+        self.figura.tight_layout()
+
+        self.canvas_ao_vivo = FigureCanvasTkAgg(self.figura, master=grafico_frame)
+        self.canvas_ao_vivo.get_tk_widget().pack(fill='both', expand=True)
+        self.fundo_grafico = None
+        self.canvas_ao_vivo.mpl_connect('draw_event', self.capturar_fundo)
+        self.canvas_ao_vivo.draw_idle()
+
+    def capturar_fundo(self, _evento=None):
+        """Guarda o fundo após um desenho completo e redesenha as linhas."""
+        self.fundo_grafico = self.canvas_ao_vivo.copy_from_bbox(self.figura.bbox)
+        self.desenhar_linhas()
+
+    def desenhar_linhas(self):
+        """Restaura o fundo e desenha apenas as linhas (blitting)."""
+        if self.fundo_grafico is None:
+            return
+        self.canvas_ao_vivo.restore_region(self.fundo_grafico)
+        for ax, linha in self.linhas:
+            ax.draw_artist(linha)
+        self.canvas_ao_vivo.blit(self.figura.bbox)
+
+    def desenhar_curvas(self, tensoes, correntes, potencias):
+        """
+        Atualiza as curvas no lugar. Os eixos só são refeitos (desenho
+        completo) quando os dados saem dos limites ou ficam muito menores
+        que eles; nos demais casos basta o blitting.
+        """
+        redesenhar = False
+        for (ax, linha), y in zip(self.linhas, (correntes * 0.1, potencias)):
+            linha.set_data(tensoes, y)
+            # Abaixo de zero mostra-se no máximo 20% da escala (após V_oc a
+            # corrente cai exponencialmente)
+            y_max = max(float(np.max(y)), 1e-12)
+            y_min = max(min(float(np.min(y)), 0.0), -0.2 * y_max)
+            x_max = float(tensoes[-1])
+            inferior, superior = ax.get_ylim()
+            if (y_max > superior or y_max < 0.5 * superior or y_min < inferior
+                    or ax.get_xlim() != (0.0, x_max)):
+                ax.set_xlim(0.0, x_max)
+                ax.set_ylim(y_min * 1.1, y_max * 1.15)
+                redesenhar = True
+
+        if redesenhar or self.fundo_grafico is None:
+            self.canvas_ao_vivo.draw()   # dispara capturar_fundo
+        else:
+            self.desenhar_linhas()
+
     def criar_rodape(self):
         """Cria o rodapé com botões de ação."""
         
@@ -374,78 +528,146 @@ Concentração intrínseca:
         self.texto_resultado_esquerda.insert('1.0', "Configure os parâmetros e clique em 'CALCULAR' para ver os resultados...")
         self.texto_resultado_esquerda.config(state='disabled')
         
-    def obter_valores(self):
+    def definir_slider(self, chave, valor):
+        """Posiciona um slider no valor dado (em escala log10 se for o caso)."""
+        if chave in self.sliders_log:
+            valor = np.log10(valor)
+        self.inputs[chave].set(valor)
+        self.ao_mover_slider()
+
+    def valor_slider(self, chave):
+        """Valor físico de um slider."""
+        valor = float(self.inputs[chave].get())
+        return 10.0 ** valor if chave in self.sliders_log else valor
+
+    def obter_valores(self, silencioso=False):
         """Obtém valores dos campos de entrada."""
         try:
             valores = {
                 'material': self.inputs['material'].get(),
-                'energia_gap': float(self.inputs['energia_gap'].get()),
-                'temp_celula': float(self.inputs['temp_celula'].get()),
-                'temp_sol': float(self.inputs['temp_sol'].get()),
-                'fator_idealidade': float(self.inputs['fator_idealidade'].get()),
-                'res_serie': float(self.inputs['res_serie'].get()),
-                'res_shunt': float(self.inputs['res_shunt'].get()),
+                'energia_gap': self.valor_slider('energia_gap'),
+                'temp_celula': self.valor_slider('temp_celula'),
+                'temp_sol': self.valor_slider('temp_sol'),
+                'fator_idealidade': self.valor_slider('fator_idealidade'),
+                'res_serie': self.valor_slider('res_serie'),
+                'res_shunt': self.valor_slider('res_shunt'),
                 'v_max': float(self.inputs['v_max'].get()),
                 'num_pontos': int(self.inputs['num_pontos'].get()),
             }
             return valores
         except ValueError:
-            messagebox.showerror("Erro", "Por favor, insira valores numéricos válidos!")
+            if not silencioso:
+                messagebox.showerror("Erro", "Por favor, insira valores numéricos válidos!")
             return None
-    
+
+    def ao_mover_slider(self, _valor=None):
+        """Atualiza os rótulos dos sliders e agenda o recálculo ao vivo."""
+        for chave, rotulo in self.rotulos_slider.items():
+            rotulo.config(text=f"{self.valor_slider(chave):.4g}")
+        self.agendar_atualizacao_ao_vivo()
+
+    def agendar_atualizacao_ao_vivo(self):
+        """
+        Agenda um recálculo ao vivo para quando o laço de eventos ficar
+        ocioso; vários movimentos de slider até lá geram um só recálculo.
+        """
+        if not hasattr(self, 'linhas') or self.atualizacao_agendada:
+            return
+        if not self.modo_ao_vivo.get():
+            return
+        self.atualizacao_agendada = True
+        self.root.after_idle(self.atualizar_ao_vivo)
+
+    def atualizar_ao_vivo(self):
+        """Recalcula a curva de forma incremental e redesenha os gráficos."""
+        self.atualizacao_agendada = False
+        valores = self.obter_valores(silencioso=True)
+        if not valores or valores['num_pontos'] < 2:
+            return
+
+        simulacao = self.simulacao_ao_vivo
+        simulacao.definir(
+            energia_gap_eV=valores['energia_gap'],
+            temperatura_celula=valores['temp_celula'],
+            temperatura_sol=valores['temp_sol'],
+            fator_idealidade=valores['fator_idealidade'],
+            resistencia_serie=valores['res_serie'],
+            resistencia_shunt=valores['res_shunt'],
+            tensao_max=valores['v_max'],
+            num_pontos_tensao=valores['num_pontos'],
+        )
+        resultados = simulacao.obter("resultados")
+        recalculados = simulacao.recalculados
+        tensoes, correntes = simulacao.obter("curva_JV")
+        self.desenhar_curvas(tensoes, correntes, resultados['Potencias'])
+
+        # Taxa de atualização medida no último segundo
+        agora = time.perf_counter()
+        self.instantes_atualizacao = [t for t in self.instantes_atualizacao if agora - t < 1.0]
+        self.instantes_atualizacao.append(agora)
+        self.status_ao_vivo.config(text=(
+            f"J_sc = {resultados['J_sc']*0.1:7.2f} mA/cm²   V_oc = {resultados['V_oc_numerico']:.3f} V\n"
+            f"FF   = {resultados['FF']*100:7.2f} %       η    = {resultados['Eficiencia']*100:.2f} %\n"
+            f"Recalculados: {', '.join(recalculados) or '—'}  ({len(self.instantes_atualizacao)} atualizações/s)"
+        ))
+
     def calcular(self):
-        """Executa o cálculo da simulação."""
+        """
+        Pede o cálculo da simulação ao processo em segundo plano. Cliques
+        repetidos durante um cálculo são agrupados: só o último é executado.
+        """
         
         valores = self.obter_valores()
         if not valores:
             return
-        
-        try:
-            # Calcular J_ph
-            J_ph = calcular_corrente_fotogerada_limite(
-                energia_gap_eV=valores['energia_gap'],
-                temperatura_sol=valores['temp_sol'],
-                num_pontos_energia=4000
-            )
-            
-            # Calcular J0
-            J0 = calcular_corrente_saturacao_radiativa(
-                energia_gap_eV=valores['energia_gap'],
-                temperatura_celula=valores['temp_celula'],
-                num_pontos_energia=4000
-            )
-            
-            # Calcular curva J-V
-            tensoes_V, correntes_J = curva_JV_diodo(
-                J_ph=J_ph,
-                J0=J0,
-                temperatura_celula=valores['temp_celula'],
-                fator_idealidade=valores['fator_idealidade'],
-                resistencia_serie=valores['res_serie'],
-                resistencia_shunt=valores['res_shunt'],
-                tensao_min=0.0,
-                tensao_max=valores['v_max'],
-                num_pontos_tensao=valores['num_pontos']
-            )
-            
-            # Extrair parâmetros
-            resultados = extrair_parametros(
-                tensoes_V, correntes_J, J_ph, J0,
-                valores['temp_celula'], valores['fator_idealidade']
-            )
-            
-            # Armazenar para plotagem
-            self.tensoes = tensoes_V
-            self.correntes = correntes_J
-            self.potencias = resultados['Potencias']
-            
-            # Exibir resultados
-            self.exibir_resultados(valores, J_ph, J0, resultados)
-            
-            messagebox.showinfo("Sucesso", "Cálculo concluído com sucesso! ✓")
-            
-        except Exception as e:
-            messagebox.showerror("Erro no Cálculo", f"Ocorreu um erro: {str(e)}")
+
+        self.trabalhador.submeter(valores)
+        self.barra_progresso['value'] = 0.0
+        self.btn_cancelar.config(state='normal')
+        self.status_calculo.config(text="⏳ Calculando...")
+
+    def cancelar(self):
+        """Cancela o cálculo em andamento."""
+        self.trabalhador.cancelar()
+        self.status_calculo.config(text="⏳ Cancelando...")
+
+    def verificar_trabalhador(self):
+        """Consulta o processo de cálculo (chamado periodicamente via root.after)."""
+        for tipo, conteudo in self.trabalhador.mensagens():
+            if tipo == "progresso":
+                self.barra_progresso['value'] = conteudo
+            elif tipo == "resultado":
+                self.receber_resultado(conteudo)
+            elif tipo == "cancelado":
+                self.barra_progresso['value'] = 0.0
+                self.status_calculo.config(text="⏹ Cálculo cancelado")
+            elif tipo == "erro":
+                self.status_calculo.config(text="❌ Erro no cálculo")
+                messagebox.showerror("Erro no Cálculo", f"Ocorreu um erro: {conteudo}")
+
+        if not self.trabalhador.ocupado:
+            self.btn_cancelar.config(state='disabled')
+        self.root.after(INTERVALO_CONSULTA_MS, self.verificar_trabalhador)
+
+    def receber_resultado(self, saida):
+        """Armazena e exibe o resultado de um cálculo concluído."""
+        resultados = saida['resultados']
+
+        # Armazenar para plotagem
+        self.tensoes = saida['tensoes']
+        self.correntes = saida['correntes']
+        self.potencias = resultados['Potencias']
+
+        # Exibir resultados
+        self.exibir_resultados(saida['valores'], saida['J_ph'], saida['J0'], resultados)
+        self.desenhar_curvas(self.tensoes, self.correntes, self.potencias)
+        self.barra_progresso['value'] = 1.0
+        self.status_calculo.config(text="✓ Cálculo concluído")
+
+    def fechar(self):
+        """Encerra o processo de cálculo e fecha a janela."""
+        self.trabalhador.encerrar()
+        self.root.destroy()
     
     def exibir_resultados(self, valores, J_ph, J0, resultados):
         """Exibe os resultados na área de texto."""
@@ -540,18 +762,10 @@ FF (fator preenchimento)    : {resultados['FF']*100:.2f} %
         resposta = messagebox.askyesno("Confirmar", "Resetar todos os valores para o padrão?")
         if resposta:
             self.inputs['material'].set("Silício (Si)")
-            self.inputs['energia_gap'].delete(0, tk.END)
-            self.inputs['energia_gap'].insert(0, "1.12")
-            self.inputs['temp_celula'].delete(0, tk.END)
-            self.inputs['temp_celula'].insert(0, "300.0")
-            self.inputs['temp_sol'].delete(0, tk.END)
-            self.inputs['temp_sol'].insert(0, "5778.0")
-            self.inputs['fator_idealidade'].delete(0, tk.END)
-            self.inputs['fator_idealidade'].insert(0, "1.0")
-            self.inputs['res_serie'].delete(0, tk.END)
-            self.inputs['res_serie'].insert(0, "0.5")
-            self.inputs['res_shunt'].delete(0, tk.END)
-            self.inputs['res_shunt'].insert(0, "10000")
+            for chave, valor in (('energia_gap', 1.12), ('temp_celula', 300.0),
+                                 ('temp_sol', 5778.0), ('fator_idealidade', 1.0),
+                                 ('res_serie', 0.5), ('res_shunt', 10000.0)):
+                self.definir_slider(chave, valor)
             self.inputs['v_max'].delete(0, tk.END)
             self.inputs['v_max'].insert(0, "1.2")
             self.inputs['num_pontos'].delete(0, tk.END)
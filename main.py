@@ -10,12 +10,13 @@ física quântica e equações de dispositivos semicondutores.
 ============================================================
 """
 
+import argparse
+
 import numpy as np
 from modules.quantum import SILICON, GAAS, PEROVSKITE
-from modules.solar import calcular_corrente_fotogerada_limite
-from modules.device import calcular_corrente_saturacao_radiativa, curva_JV_diodo
-from modules.analysis import extrair_parametros
-from modules.visualization import plotar_curvas
+from modules.simulation import Simulacao
+from modules.batch import CAMPOS_CENARIO, MATERIAIS, executar_lote
+from modules.temperature import varredura_temperatura
 
 
 def obter_numero(prompt, valor_padrao, minimo=None, maximo=None):
@@ -75,15 +76,15 @@ def calculadora_interativa():
     
     # Parâmetros do material
     temperatura_celula = obter_numero(
-        "\nTemperatura da célula [K]", 300.0, minimo=0, maximo=500
+        "\nTemperatura da célula [K]", *CAMPOS_CENARIO["temperatura_celula"]
     )
     
     energia_gap_eV = obter_numero(
-        "Energia de gap [eV]", 1.12, minimo=0.5, maximo=4.0
+        "Energia de gap [eV]", *CAMPOS_CENARIO["energia_gap_eV"]
     )
     
     temperatura_sol = obter_numero(
-        "Temperatura do Sol [K]", 5778.0, minimo=3000, maximo=8000
+        "Temperatura do Sol [K]", *CAMPOS_CENARIO["temperatura_sol"]
     )
     
     # ========================================
@@ -94,15 +95,15 @@ def calculadora_interativa():
     print("─" * 70)
     
     fator_idealidade = obter_numero(
-        "\nFator de idealidade (n)", 1.0, minimo=1.0, maximo=2.0
+        "\nFator de idealidade (n)", *CAMPOS_CENARIO["fator_idealidade"]
     )
     
     resistencia_serie = obter_numero(
-        "Resistência série (Rs) [Ω·m²]", 0.5, minimo=0.0
+        "Resistência série (Rs) [Ω·m²]", *CAMPOS_CENARIO["resistencia_serie"]
     )
     
     resistencia_shunt = obter_numero(
-        "Resistência shunt (Rsh) [Ω·m²]", 1e4, minimo=1.0
+        "Resistência shunt (Rsh) [Ω·m²]", *CAMPOS_CENARIO["resistencia_shunt"]
     )
     
     # ========================================
@@ -113,11 +114,11 @@ def calculadora_interativa():
     print("─" * 70)
     
     tensao_max = obter_numero(
-        "\nTensão máxima [V]", 1.2, minimo=0.1, maximo=5.0
+        "\nTensão máxima [V]", *CAMPOS_CENARIO["tensao_max"]
     )
     
     num_pontos = int(obter_numero(
-        "Número de pontos na curva J-V", 400, minimo=50, maximo=2000
+        "Número de pontos na curva J-V", *CAMPOS_CENARIO["num_pontos"]
     ))
     
     # ========================================
@@ -126,47 +127,39 @@ def calculadora_interativa():
     print("\n" + "=" * 70)
     print(" 🚀 EXECUTANDO SIMULAÇÃO...")
     print("=" * 70)
-    
-    # Cálculo da corrente fotogerada
-    print("\n⏳ Calculando corrente fotogerada (J_ph)...")
-    J_ph = calcular_corrente_fotogerada_limite(
+
+    simulacao = Simulacao(
+        material=material,
         energia_gap_eV=energia_gap_eV,
+        temperatura_celula=temperatura_celula,
         temperatura_sol=temperatura_sol,
-        num_pontos_energia=4000
+        fator_idealidade=fator_idealidade,
+        resistencia_serie=resistencia_serie,
+        resistencia_shunt=resistencia_shunt,
+        tensao_max=tensao_max,
+        num_pontos_tensao=num_pontos,
     )
+    
+    # Cálculo da corrente fotogerada
+    print("\n⏳ Calculando corrente fotogerada (J_ph)...")
+    J_ph = simulacao.obter("J_ph")
     J_ph_mA_cm2 = J_ph * 0.1
     print(f"✓ J_ph = {J_ph:.3e} A/m² (~{J_ph_mA_cm2:.2f} mA/cm²)")
     
     # Cálculo da corrente de saturação
     print("\n⏳ Calculando corrente de saturação (J₀)...")
-    J0 = calcular_corrente_saturacao_radiativa(
-        energia_gap_eV=energia_gap_eV,
-        temperatura_celula=temperatura_celula,
-        num_pontos_energia=4000
-    )
+    J0 = simulacao.obter("J0")
     J0_mA_cm2 = J0 * 0.1
     print(f"✓ J₀ = {J0:.3e} A/m² (~{J0_mA_cm2:.4e} mA/cm²)")
     
     # Cálculo da curva J-V
     print("\n⏳ Gerando curva J-V (Método de Newton)...")
-    tensoes_V, correntes_J = curva_JV_diodo(
-        J_ph=J_ph,
-        J0=J0,
-        temperatura_celula=temperatura_celula,
-        fator_idealidade=fator_idealidade,
-        resistencia_serie=resistencia_serie,
-        resistencia_shunt=resistencia_shunt,
-        tensao_min=0.0,
-        tensao_max=tensao_max,
-        num_pontos_tensao=num_pontos
-    )
+    tensoes_V, correntes_J = simulacao.obter("curva_JV")
     print("✓ Curva J-V calculada")
     
     # Extração de parâmetros
     print("\n⏳ Extraindo parâmetros elétricos...")
-    resultados = extrair_parametros(
-        tensoes_V, correntes_J, J_ph, J0, temperatura_celula, fator_idealidade
-    )
+    resultados = simulacao.obter("resultados")
     
     # ========================================
     # 5. EXIBIR RESULTADOS
@@ -191,16 +184,23 @@ def calculadora_interativa():
     print(f"{'η (eficiência)':<40} {resultados['Eficiencia']*100:.1f} %")
     print("=" * 70)
     
-    # Plotar gráficos
+    # Plotar gráficos (matplotlib só é importado aqui)
+    from modules.visualization import plotar_curvas
     print("\n📊 Gerando gráficos...")
     plotar_curvas(tensoes_V, correntes_J, resultados['Potencias'])
     
     return resultados
 
 
-def simulacao_padrao():
+def simulacao_padrao(plotar=True):
     """
     Executa simulação com parâmetros padrão (modo original).
+
+    Parâmetros:
+        plotar : Se False, não gera os gráficos (uso em lote/benchmarks)
+
+    Retorna:
+        dicionário de resultados de extrair_parametros
     """
     material = SILICON
     temperatura_celula = 300.0
@@ -213,15 +213,24 @@ def simulacao_padrao():
     print(f"Energia de gap (Eg)          : {energia_gap_eV:.3f} eV")
     print()
 
+    fator_idealidade = 1.0
+    resistencia_serie = 0.5
+    resistencia_shunt = 1e4
+
+    simulacao = Simulacao(
+        material=material,
+        energia_gap_eV=energia_gap_eV,
+        temperatura_celula=temperatura_celula,
+        fator_idealidade=fator_idealidade,
+        resistencia_serie=resistencia_serie,
+        resistencia_shunt=resistencia_shunt,
+    )
+
     print("=" * 60)
     print(" CORRENTE FOTOGERADA (Limite Quântico Shockley-Queisser)")
     print("=" * 60)
     
-    J_ph = calcular_corrente_fotogerada_limite(
-        energia_gap_eV=energia_gap_eV,
-        temperatura_sol=5778.0,
-        num_pontos_energia=4000
-    )
+    J_ph = simulacao.obter("J_ph")
     J_ph_mA_cm2 = J_ph * 0.1
 
     print(f"J_ph ~ {J_ph:.3e} A/m²  (~ {J_ph_mA_cm2:.2f} mA/cm²)")
@@ -231,11 +240,7 @@ def simulacao_padrao():
     print(" CORRENTE DE SATURAÇÃO RADIATIVA (J₀)")
     print("=" * 60)
     
-    J0 = calcular_corrente_saturacao_radiativa(
-        energia_gap_eV=energia_gap_eV,
-        temperatura_celula=temperatura_celula,
-        num_pontos_energia=4000
-    )
+    J0 = simulacao.obter("J0")
     J0_mA_cm2 = J0 * 0.1
 
     print(f"J₀ ~ {J0:.3e} A/m²  (~ {J0_mA_cm2:.4e} mA/cm²)")
@@ -244,35 +249,19 @@ def simulacao_padrao():
     print("=" * 60)
     print(" CÁLCULO DA CURVA J-V (Modelo de Diodo)")
     print("=" * 60)
-    
-    fator_idealidade = 1.0
-    resistencia_serie = 0.5
-    resistencia_shunt = 1e4
 
     print(f"Fator de idealidade (n)      : {fator_idealidade}")
     print(f"Resistência série (Rs)       : {resistencia_serie} Ω·m²")
     print(f"Resistência shunt (Rsh)      : {resistencia_shunt} Ω·m²")
     print()
 
-    tensoes_V, correntes_J = curva_JV_diodo(
-        J_ph=J_ph,
-        J0=J0,
-        temperatura_celula=temperatura_celula,
-        fator_idealidade=fator_idealidade,
-        resistencia_serie=resistencia_serie,
-        resistencia_shunt=resistencia_shunt,
-        tensao_min=0.0,
-        tensao_max=1.2,
-        num_pontos_tensao=400
-    )
+    tensoes_V, correntes_J = simulacao.obter("curva_JV")
 
     print("=" * 60)
     print(" PARÂMETROS ELÉTRICOS DA CÉLULA FOTOVOLTAICA")
     print("=" * 60)
     
-    resultados = extrair_parametros(
-        tensoes_V, correntes_J, J_ph, J0, temperatura_celula, fator_idealidade
-    )
+    resultados = simulacao.obter("resultados")
 
     print(f"J_sc (curto-circuito)        : {resultados['J_sc']:.3e} A/m² "
           f"(~ {resultados['J_sc']*0.1:.2f} mA/cm²)")
@@ -283,16 +272,97 @@ def simulacao_padrao():
     print(f"Eficiência (η)               : {resultados['Eficiencia']*100:.1f} %")
     print()
 
-    print("=" * 60)
-    print(" GERANDO GRÁFICOS...")
-    print("=" * 60)
-    plotar_curvas(tensoes_V, correntes_J, resultados['Potencias'])
+    if plotar:
+        # Importado sob demanda: a execução sem gráficos não carrega matplotlib
+        from modules.visualization import plotar_curvas
+        print("=" * 60)
+        print(" GERANDO GRÁFICOS...")
+        print("=" * 60)
+        plotar_curvas(tensoes_V, correntes_J, resultados['Potencias'])
+
+    return resultados
+
+
+def varredura_temperatura_cli(material, temperatura_min, temperatura_max, num_temperaturas,
+                              resistencia_serie=CAMPOS_CENARIO["resistencia_serie"][0],
+                              resistencia_shunt=CAMPOS_CENARIO["resistencia_shunt"][0]):
+    """
+    Varredura de temperatura com Eg(T) e ni(T) do material: tabela
+    resumida e coeficientes de temperatura a 25 °C. As resistências
+    padrão são as mesmas dos prompts e do lote (CAMPOS_CENARIO).
+    """
+    temperaturas = np.linspace(temperatura_min, temperatura_max, num_temperaturas)
+    varredura = varredura_temperatura(material, temperaturas,
+                                      resistencia_serie=resistencia_serie,
+                                      resistencia_shunt=resistencia_shunt)
+
+    print("=" * 70)
+    print(f" VARREDURA DE TEMPERATURA - {material.name}")
+    print(f" Rs = {resistencia_serie:g} Ω·m², Rsh = {resistencia_shunt:g} Ω·m²")
+    print("=" * 70)
+    print(f"{'T [K]':>8} {'Eg [eV]':>9} {'ni [cm⁻³]':>11} {'V_oc [V]':>9} "
+          f"{'FF [%]':>7} {'η [%]':>7}")
+    passo = max(1, len(varredura["temperaturas"]) // 10)
+    for i in range(0, len(varredura["temperaturas"]), passo):
+        print(f"{varredura['temperaturas'][i]:8.1f} {varredura['energia_gap'][i]:9.4f} "
+              f"{varredura['ni'][i]:11.3e} {varredura['V_oc_numerico'][i]:9.4f} "
+              f"{varredura['FF'][i] * 100:7.2f} {varredura['Eficiencia'][i] * 100:7.2f}")
+
+    T_25 = 298.15
+    if varredura["temperaturas"][0] <= T_25 <= varredura["temperaturas"][-1]:
+        def em_25(chave):
+            return np.interp(T_25, varredura["temperaturas"], varredura[chave])
+        print("─" * 70)
+        print(f"dV_oc/dT a 25 °C             : {em_25('dVoc_dT') * 1e3:.3f} mV/K "
+              f"({em_25('coeficiente_Voc') * 100:.3f} %/K)")
+        print(f"dη/dT a 25 °C                : {em_25('dEficiencia_dT') * 100:.4f} pontos %/K "
+              f"({em_25('coeficiente_Eficiencia') * 100:.3f} %/K relativo)")
+    return varredura
 
 
-def main():
+def main(argumentos=None):
     """
     Função principal com menu de seleção.
+
+    Com --sem-graficos executa a simulação padrão direto, sem menu e sem
+    importar matplotlib ou Tk (uso em lote, servidores sem display); com
+    --lote ENTRADA executa os cenários do arquivo (ver executar_lote); com
+    --varredura-temperatura T_MIN T_MAX N, a varredura de temperatura.
     """
+    parser = argparse.ArgumentParser(description="Simulador fotovoltaico modular")
+    parser.add_argument("--sem-graficos", action="store_true",
+                        help="Simulação padrão sem menu e sem gráficos")
+    parser.add_argument("--lote", metavar="ENTRADA",
+                        help="Executa os cenários de um arquivo .jsonl ou .csv")
+    parser.add_argument("--saida", default="resultados.jsonl",
+                        help="Arquivo .jsonl ou .csv de resultados do lote")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="Processos do lote (padrão: todos os núcleos)")
+    parser.add_argument("--varredura-temperatura", nargs=3, type=float,
+                        metavar=("T_MIN", "T_MAX", "N"),
+                        help="Varredura de temperatura da célula com Eg(T) do material")
+    parser.add_argument("--material", default="si", choices=("si", "gaas", "mapi"),
+                        help="Material da varredura de temperatura")
+    parser.add_argument("--rs", type=float, default=CAMPOS_CENARIO["resistencia_serie"][0],
+                        help="Resistência série da varredura de temperatura [Ω·m²]")
+    parser.add_argument("--rsh", type=float, default=CAMPOS_CENARIO["resistencia_shunt"][0],
+                        help="Resistência shunt da varredura de temperatura [Ω·m²]")
+    args = parser.parse_args(argumentos)
+    if args.varredura_temperatura:
+        temperatura_min, temperatura_max, num_temperaturas = args.varredura_temperatura
+        varredura_temperatura_cli(MATERIAIS[args.material], temperatura_min,
+                                  temperatura_max, int(num_temperaturas),
+                                  resistencia_serie=args.rs, resistencia_shunt=args.rsh)
+        return
+    if args.lote:
+        contagem = executar_lote(args.lote, args.saida, num_processos=args.processos)
+        print(f"{contagem['total']} cenário(s): {contagem['ok']} ok, "
+              f"{contagem['erros']} com erro → {args.saida}")
+        return
+    if args.sem_graficos:
+        simulacao_padrao(plotar=False)
+        return
+
     print("\n" + "=" * 70)
     print(" 🌞 SIMULADOR FOTOVOLTAICO MODULAR")
     print(" Autor: Luiz Tiago Wilcke (LT)")
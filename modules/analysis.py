@@ -1,5 +1,7 @@
 import numpy as np
 from modules.constants import k_B, q
+from modules.device import (corrente_diodo_lambertw, tensao_diodo_lambertw,
+                            tensao_maxima_potencia)
 
 def extrair_parametros(tensoes_V, correntes_J, J_ph, J0, temperatura_celula, fator_idealidade):
     """
@@ -62,3 +64,131 @@ def extrair_parametros(tensoes_V, correntes_J, J_ph, J0, temperatura_celula, fat
         "J_mp": J_mp,
         "Potencias": potencias
     }
+
+
+def extrair_parametros_lote(tensoes_V, correntes_J, J_ph, J0, temperatura_celula, fator_idealidade):
+    """
+    Versão em lote de extrair_parametros para a matriz de curvas J-V
+    produzida por curvas_JV_lote (uma curva por linha).
+
+    Parâmetros:
+        tensoes_V : Array de tensões [V] (N_tensoes,)
+        correntes_J : Matriz de densidades de corrente [A/m^2]
+                      (N_dispositivos, N_tensoes)
+        J_ph, J0 : Correntes fotogerada e de saturação [A/m^2]
+                   (escalares ou arrays por dispositivo)
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+
+    Retorna:
+        dicionário com as mesmas chaves de extrair_parametros (exceto
+        "Potencias"), cada uma com um array de N_dispositivos valores
+    """
+    tensoes_V = np.asarray(tensoes_V)
+    correntes_J = np.atleast_2d(correntes_J)
+    linhas = np.arange(correntes_J.shape[0])
+
+    J_sc = correntes_J[:, 0]
+
+    T = temperatura_celula
+    n = fator_idealidade
+    V_oc_ideal = (n * k_B * T / q) * np.log(J_ph / J0 + 1.0)
+    indice_voc = np.argmin(np.abs(correntes_J), axis=1)
+    V_oc_numerico = tensoes_V[indice_voc]
+
+    potencias = tensoes_V * correntes_J
+    indice_pmax = np.argmax(potencias, axis=1)
+    V_mp = tensoes_V[indice_pmax]
+    J_mp = correntes_J[linhas, indice_pmax]
+    P_max = potencias[linhas, indice_pmax]
+
+    FF = (V_mp * J_mp) / (V_oc_numerico * J_sc + 1e-30)
+
+    IRRADIANCIA_PADRAO = 1000.0
+    eficiencia = P_max / IRRADIANCIA_PADRAO
+
+    return {
+        "J_sc": J_sc,
+        "V_oc_ideal": np.broadcast_to(V_oc_ideal, J_sc.shape),
+        "V_oc_numerico": V_oc_numerico,
+        "P_max": P_max,
+        "FF": FF,
+        "Eficiencia": eficiencia,
+        "V_mp": V_mp,
+        "J_mp": J_mp,
+    }
+
+
+def extrair_parametros_modelo(J_ph,
+                              J0,
+                              temperatura_celula=300.0,
+                              fator_idealidade=1.0,
+                              resistencia_serie=0.0,
+                              resistencia_shunt=np.inf,
+                              tolerancia: float = 1e-9,
+                              max_iteracoes: int = 50):
+    """
+    Extrai J_sc, V_oc, P_max, FF e Eficiência diretamente do modelo de
+    diodo, sem amostrar a curva J-V:
+
+      - J_sc = J(V = 0) e V_oc = V(J = 0), pelas formas explícitas de
+        Lambert W (corrente_diodo_lambertw / tensao_diodo_lambertw);
+      - V_mp resolve dP/dV = 0 em [0, V_oc] por Newton salvaguardado
+        (ver tensao_maxima_potencia).
+
+    A precisão em V_mp é `tolerancia` (padrão 1 nV), independente de
+    qualquer malha de tensão. Todos os parâmetros são difundidos
+    (broadcast), de modo que um lote de dispositivos é resolvido de uma vez.
+
+    Parâmetros:
+        J_ph : Corrente fotogerada [A/m^2]
+        J0 : Corrente de saturação [A/m^2]
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+        tolerancia : Critério de parada em V_mp [V]
+        max_iteracoes : Limite de iterações do Newton
+
+    Retorna:
+        dicionário com as mesmas chaves de extrair_parametros (exceto
+        "Potencias"), mais "Convergido": False onde o Newton de V_mp não
+        convergiu ou onde J_sc, V_oc, V_mp ou J_mp não são finitos
+    """
+    J_ph, J0, T, n, Rs, Rsh = (
+        np.array(x, dtype=float) for x in np.broadcast_arrays(
+            J_ph, J0, temperatura_celula, fator_idealidade,
+            resistencia_serie, resistencia_shunt)
+    )
+    modelo = (J_ph, J0, T, n, Rs, Rsh)
+
+    J_sc = corrente_diodo_lambertw(0.0, *modelo)
+    V_oc = tensao_diodo_lambertw(0.0, *modelo)
+    V_oc_ideal = (n * k_B * T / q) * np.log(J_ph / J0 + 1.0)
+
+    V_mp, convergido = tensao_maxima_potencia(*modelo, tolerancia=tolerancia,
+                                              max_iteracoes=max_iteracoes)
+    J_mp = corrente_diodo_lambertw(V_mp, *modelo)
+    P_max = V_mp * J_mp
+
+    # As formas fechadas também falham (NaN/inf) com parâmetros degenerados
+    # (T = 0, Rs = ∞, Rsh ≤ 0, J0 = 0...), mesmo com o Newton de V_mp "convergido"
+    convergido = (convergido & np.isfinite(J_sc) & np.isfinite(V_oc)
+                  & np.isfinite(V_mp) & np.isfinite(J_mp))
+
+    FF = P_max / (V_oc * J_sc + 1e-30)
+
+    IRRADIANCIA_PADRAO = 1000.0
+    eficiencia = P_max / IRRADIANCIA_PADRAO
+
+    return {
+        "J_sc": J_sc[()],
+        "V_oc_ideal": V_oc_ideal[()],
+        "V_oc_numerico": V_oc[()],
+        "P_max": P_max[()],
+        "FF": FF[()],
+        "Eficiencia": eficiencia[()],
+        "V_mp": V_mp[()],
+        "J_mp": J_mp[()],
+        "Convergido": convergido[()],
+    }
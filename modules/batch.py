@@ -0,0 +1,270 @@
+import csv
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from modules.quantum import SILICON, GAAS, PEROVSKITE
+from modules.simulation import Simulacao
+
+# Campos numéricos de um cenário: nome → (padrão, mínimo, máximo); os mesmos
+# limites valem para os prompts de main.calculadora_interativa
+CAMPOS_CENARIO = {
+    "temperatura_celula": (300.0, 0, 500),
+    "energia_gap_eV": (1.12, 0.5, 4.0),
+    "temperatura_sol": (5778.0, 3000, 8000),
+    "fator_idealidade": (1.0, 1.0, 2.0),
+    "resistencia_serie": (0.5, 0.0, None),
+    "resistencia_shunt": (1e4, 1.0, None),
+    "tensao_min": (0.0, 0.0, 5.0),
+    "tensao_max": (1.2, 0.1, 5.0),
+    "num_pontos": (400, 50, 2000),
+}
+
+# Nomes aceitos no campo "material" (além do nome completo de cada material)
+MATERIAIS = {
+    "si": SILICON, "silicio": SILICON, SILICON.name.lower(): SILICON,
+    "gaas": GAAS, GAAS.name.lower(): GAAS,
+    "mapi": PEROVSKITE, "perovskita": PEROVSKITE, PEROVSKITE.name.lower(): PEROVSKITE,
+}
+
+GRANDEZAS_CENARIO = ("J_ph", "J0", "J_sc", "V_oc_ideal", "V_oc_numerico",
+                     "V_mp", "J_mp", "P_max", "FF", "Eficiencia")
+COLUNAS_SAIDA = (("linha", "status", "erro", "material") + tuple(CAMPOS_CENARIO)
+                 + GRANDEZAS_CENARIO)
+
+# Simulação persistente de cada processo do pool: cenários consecutivos que
+# compartilham entradas reaproveitam J_ph e J0
+_simulacao_processo = None
+
+
+def validar_cenario(bruto: dict) -> dict:
+    """
+    Valida um cenário lido do arquivo, com os limites de CAMPOS_CENARIO.
+
+    Campos ausentes ou vazios recebem o valor padrão (como ENTER nos
+    prompts); campos desconhecidos, colunas além do cabeçalho CSV, valores
+    fora dos limites e tensao_min >= tensao_max são erros.
+
+    Retorna:
+        cenário com "material" (nome do material) e os campos numéricos
+
+    Levanta:
+        ValueError com a descrição do primeiro problema encontrado
+    """
+    if None in bruto:
+        # csv.DictReader guarda sob a chave None os valores além do cabeçalho
+        raise ValueError(f"Colunas extras além do cabeçalho: {bruto[None]}")
+    desconhecidos = set(bruto) - set(CAMPOS_CENARIO) - {"material"}
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos: {sorted(desconhecidos, key=str)}")
+
+    nome_material = str(bruto.get("material") or "si").strip()
+    material = MATERIAIS.get(nome_material.lower())
+    if material is None:
+        raise ValueError(f"Material desconhecido: {nome_material!r}")
+    cenario = {"material": material.name}
+
+    for nome, (padrao, minimo, maximo) in CAMPOS_CENARIO.items():
+        valor = bruto.get(nome)
+        if valor is None or (isinstance(valor, str) and valor.strip() == ""):
+            valor = padrao
+        try:
+            valor = float(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"{nome}: número inválido {valor!r}") from None
+        if np.isnan(valor):
+            raise ValueError(f"{nome}: número inválido {valor!r}")
+        if minimo is not None and valor < minimo:
+            raise ValueError(f"{nome}: valor deve ser >= {minimo}")
+        if maximo is not None and valor > maximo:
+            raise ValueError(f"{nome}: valor deve ser <= {maximo}")
+        cenario[nome] = valor
+
+    cenario["num_pontos"] = int(cenario["num_pontos"])
+    if cenario["tensao_min"] >= cenario["tensao_max"]:
+        raise ValueError("tensao_min deve ser menor que tensao_max")
+    return cenario
+
+
+def ler_cenarios(caminho, delimitador: str = ","):
+    """
+    Lê cenários de um arquivo JSON Lines (.jsonl) ou CSV com cabeçalho,
+    uma linha por vez.
+
+    Produz:
+        (linha, cenário bruto) — linha é o número da linha no arquivo; uma
+        linha JSON inválida produz (linha, ValueError) em vez do dicionário
+    """
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        if str(caminho).endswith(".csv"):
+            leitor = csv.DictReader(arquivo, delimiter=delimitador)
+            for bruto in leitor:
+                yield leitor.line_num, bruto
+            return
+        for linha, texto in enumerate(arquivo, start=1):
+            if not texto.strip():
+                continue
+            try:
+                bruto = json.loads(texto)
+                if not isinstance(bruto, dict):
+                    raise ValueError("a linha não é um objeto JSON")
+            except ValueError as erro:
+                yield linha, ValueError(f"JSON inválido: {erro}")
+            else:
+                yield linha, bruto
+
+
+def simular_cenario(cenario: dict, metodo_jv: str = "lambertw", simulacao=None) -> dict:
+    """
+    Executa um cenário validado (J_ph → J0 → curva J-V → extração).
+
+    Retorna:
+        dicionário com as grandezas de GRANDEZAS_CENARIO (escalares)
+    """
+    material = MATERIAIS[cenario["material"].lower()]
+    if simulacao is None:
+        simulacao = Simulacao()
+    simulacao.definir(
+        material=material,
+        energia_gap_eV=cenario["energia_gap_eV"],
+        temperatura_celula=cenario["temperatura_celula"],
+        temperatura_sol=cenario["temperatura_sol"],
+        fator_idealidade=cenario["fator_idealidade"],
+        resistencia_serie=cenario["resistencia_serie"],
+        resistencia_shunt=cenario["resistencia_shunt"],
+        tensao_min=cenario["tensao_min"],
+        tensao_max=cenario["tensao_max"],
+        num_pontos_tensao=cenario["num_pontos"],
+        metodo_jv=metodo_jv,
+    )
+    resultados = simulacao.obter("resultados")
+    saida = {"J_ph": simulacao.obter("J_ph"), "J0": simulacao.obter("J0")}
+    saida.update((chave, resultados[chave]) for chave in GRANDEZAS_CENARIO[2:])
+    return {chave: float(valor) for chave, valor in saida.items()}
+
+
+def _executar_bloco(tarefa):
+    """
+    Simula um bloco de cenários num processo do pool. Erros ficam
+    restritos ao cenário que os causou.
+    """
+    global _simulacao_processo
+    cenarios, metodo_jv = tarefa
+    if _simulacao_processo is None:
+        _simulacao_processo = Simulacao()
+
+    linhas = []
+    for linha, cenario in cenarios:
+        try:
+            with np.errstate(all="ignore"):
+                resultados = simular_cenario(cenario, metodo_jv, _simulacao_processo)
+        except Exception as erro:
+            _simulacao_processo = Simulacao()
+            linhas.append({"linha": linha, "status": "erro", "erro": str(erro), **cenario})
+        else:
+            linhas.append({"linha": linha, "status": "ok", **cenario, **resultados})
+    return linhas
+
+
+class _EscritorSaida:
+    """Grava linhas de resultado em JSON Lines ou CSV (pela extensão)."""
+
+    def __init__(self, arquivo, caminho):
+        self._arquivo = arquivo
+        self._csv = None
+        if str(caminho).endswith(".csv"):
+            self._csv = csv.DictWriter(arquivo, fieldnames=COLUNAS_SAIDA, restval="",
+                                       extrasaction="ignore")
+            self._csv.writeheader()
+
+    def gravar(self, linhas):
+        for linha in linhas:
+            if self._csv is not None:
+                self._csv.writerow(linha)
+            else:
+                self._arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        self._arquivo.flush()
+
+
+def executar_lote(caminho_entrada,
+                  caminho_saida,
+                  num_processos: int = None,
+                  cenarios_por_tarefa: int = 64,
+                  tarefas_por_processo: int = 2,
+                  metodo_jv: str = "lambertw",
+                  delimitador: str = ",") -> dict:
+    """
+    Executa em lote os cenários de um arquivo JSON Lines ou CSV.
+
+    A entrada é lida de forma incremental e cada cenário é validado com os
+    limites de CAMPOS_CENARIO. Os válidos são agrupados em tarefas de
+    `cenarios_por_tarefa` e enviados a um pool de processos, com no máximo
+    `tarefas_por_processo` tarefas pendentes por processo, de modo que a
+    memória não cresce com o tamanho do arquivo. Cada resultado é gravado
+    assim que sua tarefa termina (ordem de conclusão; a coluna "linha"
+    identifica o cenário). Cenários inválidos ou que falham viram linhas
+    com status "erro" e a mensagem, sem interromper o lote.
+
+    Parâmetros:
+        caminho_entrada : Arquivo .jsonl ou .csv de cenários (colunas:
+                          material e as chaves de CAMPOS_CENARIO)
+        caminho_saida : Arquivo .jsonl ou .csv de resultados (colunas de
+                        COLUNAS_SAIDA)
+        num_processos : Número de processos (None = os.cpu_count();
+                        1 = executa no processo atual)
+        cenarios_por_tarefa : Cenários por tarefa enviada ao pool
+        tarefas_por_processo : Tarefas pendentes por processo
+        metodo_jv : Solver da curva J-V (ver curva_JV_diodo)
+        delimitador : Separador de colunas da entrada CSV
+
+    Retorna:
+        dicionário com total, ok e erros (contagens de cenários)
+    """
+    if num_processos is None:
+        num_processos = os.cpu_count() or 1
+    contagem = {"total": 0, "ok": 0, "erros": 0}
+
+    with open(caminho_saida, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = _EscritorSaida(arquivo, caminho_saida)
+
+        def registrar(linhas):
+            escritor.gravar(linhas)
+            for linha in linhas:
+                contagem["ok" if linha["status"] == "ok" else "erros"] += 1
+
+        def tarefas():
+            # Erros de validação vão direto para a saída, sem passar pelo pool
+            bloco = []
+            for linha, bruto in ler_cenarios(caminho_entrada, delimitador):
+                contagem["total"] += 1
+                try:
+                    if isinstance(bruto, Exception):
+                        raise bruto
+                    bloco.append((linha, validar_cenario(bruto)))
+                except ValueError as erro:
+                    registrar([{"linha": linha, "status": "erro", "erro": str(erro)}])
+                    continue
+                if len(bloco) == cenarios_por_tarefa:
+                    yield bloco, metodo_jv
+                    bloco = []
+            if bloco:
+                yield bloco, metodo_jv
+
+        if num_processos <= 1:
+            for tarefa in tarefas():
+                registrar(_executar_bloco(tarefa))
+            return contagem
+
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            limite = num_processos * tarefas_por_processo
+            pendentes = set()
+            for tarefa in tarefas():
+                if len(pendentes) >= limite:
+                    prontas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                    for futuro in prontas:
+                        registrar(futuro.result())
+                pendentes.add(executor.submit(_executar_bloco, tarefa))
+            for futuro in pendentes:
+                registrar(futuro.result())
+    return contagem
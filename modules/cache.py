@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+from modules.solar import calcular_corrente_fotogerada_limite
+from modules.device import calcular_corrente_saturacao_radiativa
+
+
+class CacheResultados:
+    """
+    Cache de resultados escalares (J_ph, J0, ...) com duas camadas:
+
+      - memória: LRU limitado a `tamanho_maximo` entradas;
+      - disco (opcional): um arquivo JSON por chave em `diretorio`, com nome
+        dado pelo SHA-256 da chave (endereçamento por conteúdo), que
+        sobrevive entre execuções.
+
+    As chaves são tuplas de valores simples (str, float, int). O diretório
+    pode usar "~" (expandido ao ser atribuído) e pode ser compartilhado com
+    outros arquivos: invalidar() só remove os arquivos deste cache.
+    """
+
+    # Nome dos arquivos gravados por _caminho (e dos temporários de obter)
+    _NOME_ARQUIVO = re.compile(r"[0-9a-f]{64}\.json(\.\d+\.tmp)?")
+
+    def __init__(self, tamanho_maximo: int = 256, diretorio=None):
+        self.tamanho_maximo = tamanho_maximo
+        self.diretorio = diretorio
+        self._memoria = OrderedDict()
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+
+    @property
+    def diretorio(self):
+        return self._diretorio
+
+    @diretorio.setter
+    def diretorio(self, diretorio):
+        self._diretorio = (None if diretorio is None
+                           else os.path.expanduser(os.fspath(diretorio)))
+
+    @staticmethod
+    def _hash(chave) -> str:
+        return hashlib.sha256(repr(chave).encode("utf-8")).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, self._hash(chave) + ".json")
+
+    def _guardar_memoria(self, chave, valor):
+        self._memoria[chave] = valor
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.tamanho_maximo:
+            self._memoria.popitem(last=False)
+
+    def obter(self, chave, calcular):
+        """
+        Devolve o valor associado a `chave`, calculando-o com `calcular()`
+        (e guardando-o nas duas camadas) se ainda não estiver em cache.
+        """
+        if chave in self._memoria:
+            self._memoria.move_to_end(chave)
+            self.acertos_memoria += 1
+            return self._memoria[chave]
+
+        if self.diretorio is not None:
+            try:
+                with open(self._caminho(chave), encoding="utf-8") as arquivo:
+                    registro = json.load(arquivo)
+            except (OSError, ValueError):
+                registro = None
+            if registro is not None and registro.get("chave") == repr(chave):
+                self.acertos_disco += 1
+                self._guardar_memoria(chave, registro["valor"])
+                return registro["valor"]
+
+        self.falhas += 1
+        valor = float(calcular())
+        self._guardar_memoria(chave, valor)
+
+        if self.diretorio is not None:
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = self._caminho(chave)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump({"chave": repr(chave), "valor": valor}, arquivo)
+            os.replace(temporario, caminho)
+
+        return valor
+
+    def invalidar(self, chave=None):
+        """
+        Remove `chave` do cache (memória e disco) ou, sem argumento,
+        esvazia o cache inteiro.
+        """
+        if chave is not None:
+            self._memoria.pop(chave, None)
+            if self.diretorio is not None:
+                try:
+                    os.remove(self._caminho(chave))
+                except FileNotFoundError:
+                    pass
+            return
+
+        self._memoria.clear()
+        if self.diretorio is not None and os.path.isdir(self.diretorio):
+            for nome in os.listdir(self.diretorio):
+                caminho = os.path.join(self.diretorio, nome)
+                if self._NOME_ARQUIVO.fullmatch(nome) and (
+                        nome.endswith(".tmp") or self._e_registro(caminho)):
+                    os.remove(caminho)
+
+    @staticmethod
+    def _e_registro(caminho) -> bool:
+        """Se `caminho` é um registro {"chave", "valor"} gravado por obter."""
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                registro = json.load(arquivo)
+        except (OSError, ValueError):
+            return False
+        return isinstance(registro, dict) and set(registro) == {"chave", "valor"}
+
+    def estatisticas(self) -> dict:
+        """Contadores de acertos/falhas e ocupação do cache."""
+        consultas = self.acertos_memoria + self.acertos_disco + self.falhas
+        return {
+            "acertos_memoria": self.acertos_memoria,
+            "acertos_disco": self.acertos_disco,
+            "falhas": self.falhas,
+            "taxa_acerto": (consultas - self.falhas) / consultas if consultas else 0.0,
+            "entradas_memoria": len(self._memoria),
+            "tamanho_maximo": self.tamanho_maximo,
+        }
+
+
+# Cache compartilhado pela calculadora interativa e pela interface gráfica.
+# Para persistir entre execuções: CACHE_PADRAO.diretorio = "~/.cache/..."
+CACHE_PADRAO = CacheResultados()
+
+
+def _exigir_escalar(nome, valor):
+    # O cache guarda um float por chave; arrays e séries vão direto às
+    # funções de solar/device
+    if np.ndim(valor) != 0:
+        raise ValueError(f"{nome} deve ser escalar para usar o cache (recebido {np.shape(valor)})")
+
+
+def corrente_fotogerada_em_cache(energia_gap_eV: float,
+                                 temperatura_sol: float = 5778.0,
+                                 num_pontos_energia: int = 4000,
+                                 integrador: str = "trapezio",
+                                 espectro=None,
+                                 cache: CacheResultados = None) -> float:
+    """
+    calcular_corrente_fotogerada_limite com cache, chaveado em
+    (Eg, T_sol, espectro, integrador, num_pontos_energia). O espectro entra
+    na chave pelo conteúdo (EspectroTabelado.impressao_digital), não pelo
+    nome.
+
+    Levanta:
+        ValueError se Eg ou T_sol não forem escalares ou o espectro for
+        uma série
+    """
+    _exigir_escalar("energia_gap_eV", energia_gap_eV)
+    _exigir_escalar("temperatura_sol", temperatura_sol)
+    if espectro is not None and espectro.num_espectros != 1:
+        raise ValueError(f"Séries de espectros ({espectro.num_espectros}) não usam o cache; "
+                         "use calcular_corrente_fotogerada_limite")
+    cache = CACHE_PADRAO if cache is None else cache
+    id_espectro = ("corpo_negro" if espectro is None
+                   else f"espectro:{espectro.impressao_digital}")
+    chave = ("J_ph", float(energia_gap_eV), float(temperatura_sol),
+             id_espectro, integrador, int(num_pontos_energia))
+    return cache.obter(chave, lambda: calcular_corrente_fotogerada_limite(
+        energia_gap_eV=energia_gap_eV,
+        temperatura_sol=temperatura_sol,
+        num_pontos_energia=num_pontos_energia,
+        integrador=integrador,
+        espectro=espectro,
+    ))
+
+
+def corrente_saturacao_em_cache(energia_gap_eV: float,
+                                temperatura_celula: float = 300.0,
+                                num_pontos_energia: int = 4000,
+                                integrador: str = "trapezio",
+                                cache: CacheResultados = None) -> float:
+    """
+    calcular_corrente_saturacao_radiativa com cache, chaveado em
+    (Eg, T_célula, integrador, num_pontos_energia).
+
+    Levanta:
+        ValueError se Eg ou T_célula não forem escalares
+    """
+    _exigir_escalar("energia_gap_eV", energia_gap_eV)
+    _exigir_escalar("temperatura_celula", temperatura_celula)
+    cache = CACHE_PADRAO if cache is None else cache
+    chave = ("J0", float(energia_gap_eV), float(temperatura_celula),
+             integrador, int(num_pontos_energia))
+    return cache.obter(chave, lambda: calcular_corrente_saturacao_radiativa(
+        energia_gap_eV=energia_gap_eV,
+        temperatura_celula=temperatura_celula,
+        num_pontos_energia=num_pontos_energia,
+        integrador=integrador,
+    ))
@@ -0,0 +1,271 @@
+import numpy as np
+from modules.constants import AREA_CELULA_PADRAO
+from modules.device import tensao_diodo_lambertw
+
+# Tabelas de V_j(y) (ver _tabela_juncao): passo da tabela = passo da grade
+# de correntes / REFINAMENTO_TABELA, e erro máximo tolerado da interpolação
+# cúbica; onde ele não é atingido (joelho da junção) a célula é resolvida
+# exatamente
+REFINAMENTO_TABELA = 16
+TOLERANCIA_TABELA_V = 1e-9
+
+# Células processadas por bloco (múltiplo de celulas_por_subcadeia); blocos
+# pequenos mantêm os temporários no cache
+CELULAS_POR_BLOCO = 384
+
+
+def _tensoes_exatas(J, J_ph, J0, T, n, Rs, Rsh, tensao_ruptura):
+    """V(J) de tensao_diodo_lambertw limitado à ruptura (NaN → ruptura)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.fmax(tensao_diodo_lambertw(J, J_ph, J0, T, n, Rs, Rsh), tensao_ruptura)
+
+
+def _tabela_juncao(J0, T, n, Rsh, y_min, y_max, passo_y):
+    """
+    Tabela uniforme de V_j(y), a tensão de junção em função de
+    y = J_ph + J0 - J (V = V_j(y) - J·Rs), para células que compartilham
+    J0, T, n e Rsh finito.
+
+    Os nós são exatos (tensao_diodo_lambertw com Rs = 0). A interpolação
+    cúbica é conferida contra valores exatos no meio de cada intervalo; na
+    faixa [y_exato_min, y_exato_max) em que o erro passa de
+    TOLERANCIA_TABELA_V (o joelho da junção, onde V_j varia rápido demais
+    para a tabela) as células são resolvidas exatamente.
+
+    Retorna:
+        dicionário com y0, passo, valores (M,), y_exato_min e y_exato_max
+    """
+    y0 = y_min - 2.0 * passo_y
+    num_nos = int(np.ceil((y_max - y0) / passo_y)) + 4
+    y = y0 + passo_y * np.arange(num_nos)
+    valores = tensao_diodo_lambertw(0.0, y - J0, J0, T, n, 0.0, Rsh)
+
+    # Intervalo i da conferência: [y[i + 1], y[i + 2])
+    meios = tensao_diodo_lambertw(0.0, y[1:-2] + 0.5 * passo_y - J0, J0, T, n, 0.0, Rsh)
+    interpolados = (9.0 * (valores[1:-2] + valores[2:-1]) - valores[:-3] - valores[3:]) / 16.0
+    ruins = np.flatnonzero(~(np.abs(interpolados - meios) <= TOLERANCIA_TABELA_V))
+    if ruins.size:
+        y_exato_min, y_exato_max = y[ruins[0]], y[ruins[-1] + 3]
+    else:
+        y_exato_min = y_exato_max = -np.inf
+
+    return {"y0": y0, "passo": passo_y, "valores": valores,
+            "y_exato_min": y_exato_min, "y_exato_max": y_exato_max}
+
+
+def _interpolar_tabela(tabela, J, J_ph, J0, T, n, Rs, Rsh, tensao_ruptura):
+    """
+    V(J) pela tabela de _tabela_juncao, para células do grupo com J_ph e Rs
+    próprios (arrays 1D) sobre a grade uniforme de correntes J.
+
+    A posição de y = J_ph + J0 - J_k na tabela é s - REFINAMENTO_TABELA·k:
+    a fração de interpolação é constante por célula e as amostras de cada
+    célula formam uma linha de uma única vista com passo
+    -REFINAMENTO_TABELA, sem arrays de índices.
+    """
+    R = REFINAMENTO_TABELA
+    num_pontos = J.size
+    valores = tabela["valores"]
+    s = (J_ph + J0 - J[0] - tabela["y0"]) / tabela["passo"]
+    base = np.floor(s).astype(np.int64)
+    t = s - base
+
+    deslocamento = R * (num_pontos - 1)
+    vista = np.lib.stride_tricks.as_strided(
+        valores[deslocamento:], shape=(valores.size - deslocamento, num_pontos),
+        strides=(valores.strides[0], -R * valores.strides[0]), writeable=False,
+    )
+    amostras = vista[(base - deslocamento)[:, None] + np.arange(-1, 3)]
+    pesos = np.stack([-t * (t - 1.0) * (t - 2.0) / 6.0, (t + 1.0) * (t - 1.0) * (t - 2.0) / 2.0,
+                      -(t + 1.0) * t * (t - 2.0) / 2.0, (t + 1.0) * t * (t - 1.0) / 6.0],
+                     axis=-1)
+    tensoes = (pesos[:, None, :] @ amostras)[:, 0]
+    tensoes -= J * Rs[:, None]
+    np.maximum(tensoes, tensao_ruptura, out=tensoes)
+
+    # Pontos na faixa exata: y_exato_min <= J_ph + J0 - J_k < y_exato_max,
+    # um intervalo contíguo de k por célula
+    passo_J = J[1] - J[0]
+    topo = J_ph + J0 - J[0]
+    primeiro = np.clip(np.floor((topo - tabela["y_exato_max"]) / passo_J), 0, num_pontos)
+    ultimo = np.clip(np.ceil((topo - tabela["y_exato_min"]) / passo_J) + 1, 0, num_pontos)
+    contagens = np.maximum(ultimo - primeiro, 0).astype(np.int64)
+    if contagens.any():
+        linhas = np.repeat(np.arange(J_ph.size), contagens)
+        colunas = (primeiro.astype(np.int64)[linhas] + np.arange(linhas.size)
+                   - np.repeat(np.cumsum(contagens) - contagens, contagens))
+        tensoes[linhas, colunas] = _tensoes_exatas(J[colunas], J_ph[linhas], J0, T, n,
+                                                   Rs[linhas], Rsh, tensao_ruptura)
+    return tensoes
+
+
+def _tensoes_subcadeias(grade_corrente_I, parametros, area_celula, celulas_por_subcadeia,
+                        tensao_ruptura):
+    """
+    V(I) de cada subcadeia (soma das tensões das suas células, antes do
+    diodo de bypass) sobre a grade de correntes compartilhada.
+
+    As células são processadas em blocos de subcadeias, vetorizados sobre o
+    bloco; dentro de cada bloco, células com parâmetros idênticos são
+    resolvidas uma única vez. Quando muitas células distintas compartilham
+    a junção (J0, T, n e Rsh finito, variando só J_ph e Rs, como no
+    descasamento e no sombreamento), V(J) vem de uma tabela comum
+    (_tabela_juncao) em vez de um Lambert W por célula e por ponto. Em
+    polarização reversa profunda (V(J) indefinido com Rsh infinito, ou
+    abaixo da ruptura) a tensão é limitada a tensao_ruptura.
+
+    Retorna:
+        tensoes_subcadeias : (N_subcadeias, N_I) [V]
+    """
+    J = grade_corrente_I / area_celula
+    num_pontos = J.size
+    unicas, indice_celula = np.unique(parametros, axis=0, return_inverse=True)
+    indice_celula = indice_celula.ravel()
+    juncoes, grupo = np.unique(unicas[:, [1, 2, 3, 5]], axis=0, return_inverse=True)
+    grupo = grupo.ravel()
+
+    # A tabela só compensa quando custa bem menos que resolver cada célula
+    tabelas = {}
+    if num_pontos > 1:
+        passo_y = (J[1] - J[0]) / REFINAMENTO_TABELA
+        for indice_grupo, (J0, T, n, Rsh) in enumerate(juncoes):
+            J_ph = unicas[grupo == indice_grupo, 0]
+            y_min, y_max = J_ph.min() + J0 - J[-1], J_ph.max() + J0 - J[0]
+            if np.isfinite(Rsh) and J_ph.size * num_pontos > 4 * (y_max - y_min) / passo_y:
+                tabelas[indice_grupo] = _tabela_juncao(J0, T, n, Rsh, y_min, y_max, passo_y)
+    tabelada = np.isin(grupo, list(tabelas))
+
+    celulas_por_bloco = max(1, CELULAS_POR_BLOCO // celulas_por_subcadeia) * celulas_por_subcadeia
+    tensoes_subcadeias = np.empty((indice_celula.size // celulas_por_subcadeia, num_pontos))
+    for inicio in range(0, indice_celula.size, celulas_por_bloco):
+        locais, inverso = np.unique(indice_celula[inicio:inicio + celulas_por_bloco],
+                                    return_inverse=True)
+        tensoes = np.empty((locais.size, num_pontos))
+
+        diretas = ~tabelada[locais]
+        if diretas.any():
+            J_ph, J0, T, n, Rs, Rsh = (unicas[locais[diretas]][:, [i]] for i in range(6))
+            tensoes[diretas] = _tensoes_exatas(J, J_ph, J0, T, n, Rs, Rsh, tensao_ruptura)
+        for indice_grupo, tabela in tabelas.items():
+            selecao = grupo[locais] == indice_grupo
+            if selecao.any():
+                J0, T, n, Rsh = juncoes[indice_grupo]
+                linhas = unicas[locais[selecao]]
+                tensoes[selecao] = _interpolar_tabela(tabela, J, linhas[:, 0], J0, T, n,
+                                                      linhas[:, 4], Rsh, tensao_ruptura)
+
+        primeira = inicio // celulas_por_subcadeia
+        tensoes_subcadeias[primeira:primeira + inverso.size // celulas_por_subcadeia] = (
+            tensoes[inverso].reshape(-1, celulas_por_subcadeia, num_pontos).sum(axis=1)
+        )
+    return tensoes_subcadeias
+
+
+def curva_IV_arranjo(J_ph,
+                     J0,
+                     temperatura_celula=300.0,
+                     fator_idealidade=1.0,
+                     resistencia_serie=0.0,
+                     resistencia_shunt=np.inf,
+                     area_celula: float = AREA_CELULA_PADRAO,
+                     celulas_por_subcadeia: int = 24,
+                     subcadeias_por_modulo: int = 3,
+                     modulos_por_string: int = 24,
+                     num_strings: int = 20,
+                     tensao_bypass: float = 0.5,
+                     tensao_ruptura: float = -20.0,
+                     num_pontos_corrente: int = 1000,
+                     num_pontos_tensao: int = 1000) -> dict:
+    """
+    Curva I-V de um arranjo fotovoltaico: strings em paralelo, cada uma com
+    módulos em série, cada módulo com subcadeias de células em série
+    protegidas por um diodo de bypass.
+
+    Composição, sempre sobre grades compartilhadas:
+      1. V(I) de cada célula distinta numa grade comum de correntes
+         (tensao_diodo_lambertw, incluindo polarização reversa, ou uma
+         tabela por junção compartilhada; ver _tensoes_subcadeias);
+      2. subcadeia: soma das tensões das células, limitada a -tensao_bypass
+         quando o diodo de bypass conduz;
+      3. string: soma das subcadeias de todos os módulos (mesma corrente);
+      4. arranjo: soma das correntes das strings numa grade comum de
+         tensões (mesma tensão).
+
+    Os parâmetros de célula são difundidos para a forma
+    (num_strings, modulos_por_string, subcadeias_por_modulo,
+    celulas_por_subcadeia), permitindo células descasadas e sombreamento
+    parcial (ex.: J_ph reduzido em algumas células).
+
+    Parâmetros:
+        J_ph, J0 : Correntes fotogerada e de saturação [A/m^2]
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie, resistencia_shunt : Resistências [Ω·m^2]
+        area_celula : Área de cada célula [m^2]
+        celulas_por_subcadeia, subcadeias_por_modulo,
+        modulos_por_string, num_strings : Topologia do arranjo
+        tensao_bypass : Queda de tensão do diodo de bypass em condução [V]
+        tensao_ruptura : Tensão reversa mínima de uma célula [V]
+        num_pontos_corrente : Pontos da grade de correntes das strings
+        num_pontos_tensao : Pontos da grade de tensões do arranjo
+
+    Retorna:
+        dicionário com:
+            - tensoes_V, correntes_I, potencias_W: curva do arranjo
+            - P_max, V_mp, I_mp: ponto de máxima potência global
+            - maximos_locais: índices (em tensoes_V) de todos os máximos
+              locais de potência
+            - grade_corrente_I, tensoes_strings_V: curvas V(I) das strings
+              (num_strings, num_pontos_corrente)
+    """
+    forma = (num_strings, modulos_por_string, subcadeias_por_modulo, celulas_por_subcadeia)
+    parametros = np.stack([
+        np.broadcast_to(np.asarray(x, dtype=float), forma).ravel()
+        for x in (J_ph, J0, temperatura_celula, fator_idealidade,
+                  resistencia_serie, resistencia_shunt)
+    ], axis=1)
+
+    corrente_max = 1.05 * np.max(parametros[:, 0]) * area_celula
+    grade_corrente_I = np.linspace(-0.05 * corrente_max, corrente_max, num_pontos_corrente)
+
+    # Subcadeias (bypass limitando a -tensao_bypass) e strings (soma das
+    # subcadeias de todos os módulos, mesma corrente)
+    tensoes_subcadeias = _tensoes_subcadeias(
+        grade_corrente_I, parametros, area_celula, celulas_por_subcadeia, tensao_ruptura
+    )
+    tensoes_strings_V = np.maximum(tensoes_subcadeias, -tensao_bypass).reshape(
+        num_strings, -1, num_pontos_corrente
+    ).sum(axis=1)
+
+    # Arranjo: V(I) de cada string é não crescente; inverter para I(V) todas
+    # as strings num único np.interp, deslocando cada string para uma faixa
+    # de tensões própria (as consultas são limitadas à faixa da string, o que
+    # reproduz a extrapolação constante de np.interp)
+    tensoes_V = np.linspace(0.0, np.max(tensoes_strings_V[:, 0]), num_pontos_tensao)
+    crescentes = tensoes_strings_V[:, ::-1]
+    inferior, superior = crescentes[:, :1], crescentes[:, -1:]
+    deslocamentos = (np.max(superior - inferior) + 1.0) * np.arange(num_strings)[:, None]
+    consultas = np.clip(tensoes_V, inferior, superior) - inferior + deslocamentos
+    correntes_I = np.interp(
+        consultas.ravel(), (crescentes - inferior + deslocamentos).ravel(),
+        np.tile(grade_corrente_I[::-1], num_strings),
+    ).reshape(num_strings, num_pontos_tensao).sum(axis=0)
+
+    potencias_W = tensoes_V * correntes_I
+    indice_pmax = np.argmax(potencias_W)
+    interior = potencias_W[1:-1]
+    maximos_locais = np.flatnonzero(
+        (interior > potencias_W[:-2]) & (interior >= potencias_W[2:]) & (interior > 0)
+    ) + 1
+
+    return {
+        "tensoes_V": tensoes_V,
+        "correntes_I": correntes_I,
+        "potencias_W": potencias_W,
+        "P_max": potencias_W[indice_pmax],
+        "V_mp": tensoes_V[indice_pmax],
+        "I_mp": correntes_I[indice_pmax],
+        "maximos_locais": maximos_locais,
+        "grade_corrente_I": grade_corrente_I,
+        "tensoes_strings_V": tensoes_strings_V,
+    }
@@ -1,12 +1,14 @@
-import scipy.constants as const
-
-# Constantes Fundamentais
-k_B = const.k                  # Constante de Boltzmann (J/K)
-h = const.h                    # Constante de Planck (J.s)
-c = const.c                    # Velocidade da luz (m/s)
-q = const.e                    # Carga elementar (C)
-m_0 = const.m_e                # Massa de repouso do elétron (kg)
-epsilon_0 = const.epsilon_0    # Permissividade do vácuo (F/m)
+# Constantes Fundamentais (CODATA 2018; k_B, h, c e q são exatas no SI).
+# Escritas como literais para não carregar scipy.constants na inicialização.
+k_B = 1.380649e-23             # Constante de Boltzmann (J/K)
+h = 6.62607015e-34             # Constante de Planck (J.s)
+c = 299792458.0                # Velocidade da luz (m/s)
+q = 1.602176634e-19            # Carga elementar (C)
+m_0 = 9.1093837015e-31         # Massa de repouso do elétron (kg)
+epsilon_0 = 8.8541878128e-12   # Permissividade do vácuo (F/m)
 
 # Conversões
 eV_to_J = q                    # 1 eV em Joules
+
+# Célula de 156 mm × 156 mm (módulos e arranjos: circuit, datasheet)
+AREA_CELULA_PADRAO = 0.0243    # m^2
@@ -0,0 +1,311 @@
+import numpy as np
+from modules.constants import k_B, q, AREA_CELULA_PADRAO
+
+TEMPERATURA_REFERENCIA = 298.15   # K (STC)
+DELTA_T_COEFICIENTE = 10.0        # K, degrau usado na condição do coeficiente de V_oc
+LIMITE_CONDICIONAMENTO = 1e10
+
+COLUNAS_CATALOGO = ("V_oc", "I_sc", "V_mp", "I_mp", "coef_V_oc", "coef_I_sc",
+                    "num_celulas_serie")
+
+
+def ler_catalogo_csv(caminho, delimitador: str = ","):
+    """
+    Lê um catálogo de módulos (CSV com cabeçalho contendo as colunas de
+    COLUNAS_CATALOGO; colunas extras são ignoradas).
+
+    Coeficientes de temperatura em unidades absolutas: coef_V_oc [V/K] e
+    coef_I_sc [A/K].
+
+    Retorna:
+        dicionário {coluna: array}
+    """
+    dados = np.genfromtxt(caminho, delimiter=delimitador, names=True,
+                          encoding="utf-8", ndmin=1)
+    faltando = [c for c in COLUNAS_CATALOGO if c not in dados.dtype.names]
+    if faltando:
+        raise ValueError(f"Colunas ausentes no catálogo: {faltando}")
+    return {coluna: np.asarray(dados[coluna], dtype=float) for coluna in COLUNAS_CATALOGO}
+
+
+def _condicoes(x, V_oc, I_sc, V_mp, I_mp, coef_V_oc, coef_I_sc, temperatura_gap, T):
+    """
+    Resíduos das três condições restantes depois de eliminar I_L e I_0
+    pelas condições de curto-circuito e circuito aberto.
+
+    x = (ln a, Rs, g), com a = Ns n k_B T / q [V] e g = G V_oc / I_sc a
+    condutância shunt normalizada (G = 1/Rsh; g < 0 corresponde a Rsh
+    negativo e g = 0 a Rsh infinito).
+    O termo I_0 e^{V/a} é escrito como w(V) para não estourar exp().
+
+    Retorna:
+        F : (N, 3) resíduos normalizados por I_sc / I_mp
+        log_I0 : ln I_0 [ln A]
+        I_L : Corrente fotogerada do módulo [A]
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        a = np.exp(x[:, 0])
+        Rs = x[:, 1]
+        G = x[:, 2] * I_sc / V_oc
+
+        # I_0 (e^{V_oc/a} - e^{I_sc Rs/a}) = I_sc (1 + Rs G) - V_oc G
+        numerador = I_sc * (1.0 + Rs * G) - V_oc * G
+        log_I0 = (np.log(numerador) - V_oc / a
+                  - np.log(-np.expm1((I_sc * Rs - V_oc) / a)))
+
+        def w(V):
+            return np.exp(log_I0 + V / a)
+
+        I0 = np.exp(log_I0)
+        I_L = w(V_oc) - I0 + V_oc * G
+
+        # Corrente no ponto de máxima potência
+        V_juncao = V_mp + I_mp * Rs
+        F1 = (I_L - (w(V_juncao) - I0) - V_juncao * G - I_mp) / I_sc
+
+        # dP/dV = I + V dI/dV = 0, dI/dV = -D / (1 + Rs D), D = w/a + G
+        D = w(V_juncao) / a + G
+        F2 = (I_mp - V_mp * D / (1.0 + Rs * D)) / I_mp
+
+        # V_oc em T + ΔT com I_L, I_0 ∝ T³ exp(-Eg / k_B T) e a ∝ T
+        T2 = T + DELTA_T_COEFICIENTE
+        a2 = a * T2 / T
+        V_oc2 = V_oc + coef_V_oc * DELTA_T_COEFICIENTE
+        I_L2 = I_L + coef_I_sc * DELTA_T_COEFICIENTE
+        log_I0_2 = log_I0 + 3.0 * np.log(T2 / T) + temperatura_gap * (1.0 / T - 1.0 / T2)
+        F3 = (I_L2 - (np.exp(log_I0_2 + V_oc2 / a2) - np.exp(log_I0_2))
+              - V_oc2 * G) / I_sc
+
+    F = np.stack([F1, F2, F3], axis=-1)
+    return np.where(np.isfinite(F), F, np.inf), log_I0, I_L
+
+
+def _condicoes_sem_shunt(x, *args):
+    """
+    As duas condições do ponto de máxima potência (F1, F2 de _condicoes)
+    com Rsh infinito; x = (ln a, Rs).
+    """
+    F, log_I0, I_L = _condicoes(np.column_stack([x, np.zeros(len(x))]), *args)
+    return F[:, :2], log_I0, I_L
+
+
+def _jacobiano(condicoes, x, F, args):
+    """Jacobiano de `condicoes` por diferenças finitas progressivas, (N, K, K)."""
+    jacobiano = np.empty(x.shape + (x.shape[1],))
+    for j, passo_relativo in enumerate((1e-7, 1e-9, 1e-7)[:x.shape[1]]):
+        h = passo_relativo * np.maximum(1.0, np.abs(x[:, j]))
+        x_h = x.copy()
+        x_h[:, j] += h
+        with np.errstate(invalid="ignore"):
+            jacobiano[:, :, j] = (condicoes(x_h, *args)[0] - F) / h[:, None]
+    return jacobiano
+
+
+def _numero_condicao(condicoes, x, F, args):
+    """Número de condição do jacobiano em x (infinito se não for finito)."""
+    jacobiano = _jacobiano(condicoes, x, F, args)
+    finito = np.isfinite(jacobiano).all(axis=(1, 2))
+    numero_condicao = np.full(len(x), np.inf)
+    if finito.any():
+        numero_condicao[finito] = np.linalg.cond(jacobiano[finito])
+    return numero_condicao
+
+
+def _newton_amortecido(condicoes, x, args, ativos, tolerancia, max_iteracoes):
+    """
+    Newton amortecido (busca linear por bissecção sobre |F|², Rs mantido
+    ≥ 0) para condicoes(x, *args)[0] = 0, vetorizado sobre as linhas
+    `ativos` de x (N, K); as demais linhas ficam como estão.
+
+    Retorna:
+        x, F, norma (máximo |F| por linha), convergido, iteracoes
+    """
+    x = x.copy()
+    F, _, _ = condicoes(x, *args)
+    norma = np.abs(F).max(axis=1)
+    convergido = norma < tolerancia
+    iteracoes = np.zeros(len(x), dtype=int)
+    ativos = ativos[~convergido[ativos]]
+
+    for _ in range(max_iteracoes):
+        if ativos.size == 0:
+            break
+        iteracoes[ativos] += 1
+        args_k = tuple(v[ativos] if np.ndim(v) else v for v in args)
+        x_k, F_k = x[ativos], F[ativos]
+
+        jacobiano = _jacobiano(condicoes, x_k, F_k, args_k)
+
+        with np.errstate(invalid="ignore"):
+            passo = np.full_like(x_k, np.nan)
+            inversivel = np.isfinite(jacobiano).all(axis=(1, 2)) & (np.abs(np.linalg.det(
+                np.where(np.isfinite(jacobiano), jacobiano, 0.0))) > 0)
+            if inversivel.any():
+                passo[inversivel] = np.linalg.solve(jacobiano[inversivel],
+                                                    -F_k[inversivel][..., None])[..., 0]
+
+        # Busca linear: divide o passo até reduzir |F|²
+        with np.errstate(over="ignore"):
+            merito_k = (F_k ** 2).sum(axis=1)
+        fator = np.ones(ativos.size)
+        aceito = np.zeros(ativos.size, dtype=bool)
+        x_novo, F_novo = x_k.copy(), F_k.copy()
+        for _ in range(30):
+            pendentes = ~aceito & np.isfinite(passo).all(axis=1)
+            if not pendentes.any():
+                break
+            idx = np.flatnonzero(pendentes)
+            x_t = x_k[idx] + fator[idx, None] * passo[idx]
+            x_t[:, 1] = np.maximum(x_t[:, 1], 0.0)
+            F_t, _, _ = condicoes(x_t, *(v[idx] if np.ndim(v) else v for v in args_k))
+            with np.errstate(over="ignore"):
+                melhor = (F_t ** 2).sum(axis=1) < merito_k[idx]
+            x_novo[idx[melhor]] = x_t[melhor]
+            F_novo[idx[melhor]] = F_t[melhor]
+            aceito[idx[melhor]] = True
+            fator[idx[~melhor]] *= 0.5
+
+        x[ativos], F[ativos] = x_novo, F_novo
+        norma[ativos] = np.abs(F_novo).max(axis=1)
+        convergido[ativos] = norma[ativos] < tolerancia
+        ativos = ativos[aceito & ~convergido[ativos]]
+
+    return x, F, norma, convergido, iteracoes
+
+
+def extrair_parametros_datasheet(V_oc,
+                                 I_sc,
+                                 V_mp,
+                                 I_mp,
+                                 coef_V_oc,
+                                 coef_I_sc,
+                                 num_celulas_serie,
+                                 energia_gap_eV: float = 1.12,
+                                 temperatura_referencia: float = TEMPERATURA_REFERENCIA,
+                                 area_celula: float = AREA_CELULA_PADRAO,
+                                 tolerancia: float = 1e-10,
+                                 max_iteracoes: int = 50) -> dict:
+    """
+    Parâmetros do modelo de um diodo (I_L, I_0, a, Rs, Rsh) a partir dos
+    valores de folha de dados, para um catálogo inteiro de uma vez.
+
+    As cinco condições nos pontos-chave são: I(0) = I_sc, I(V_oc) = 0,
+    I(V_mp) = I_mp, dP/dV = 0 no ponto de máxima potência e o coeficiente
+    de temperatura de V_oc (V_oc em T + ΔT com I_0 ∝ T³ exp(-Eg/k_B T)).
+    As duas primeiras eliminam I_L e I_0; as outras três são resolvidas em
+    (ln a, Rs, G V_oc / I_sc) por Newton amortecido (busca linear por
+    bissecção), vetorizado sobre todas as entradas, com jacobiano por
+    diferenças finitas. A condutância shunt G = 1/Rsh é usada no lugar de
+    Rsh porque, com os valores arredondados das folhas de dados, muitos
+    módulos comuns só são reproduzidos exatamente com G ligeiramente
+    negativo: nesses casos Rsh vira infinito e (a, Rs) são recalculados
+    pelas duas condições do ponto de máxima potência, abrindo mão da
+    condição do coeficiente de V_oc.
+
+    Nenhuma entrada interrompe o lote: cada uma recebe um Status
+        "convergido"       : resíduos abaixo da tolerância
+        "rsh_infinito"     : a solução exata pedia Rsh negativo; convergiu
+                             com Rsh infinito, sem a condição do
+                             coeficiente de V_oc
+        "mal_condicionado" : convergiu, mas o jacobiano final tem número de
+                             condição acima de LIMITE_CONDICIONAMENTO
+                             (parâmetros pouco determinados pelos dados)
+        "nao_convergido"   : esgotou as iterações ou a busca linear
+        "invalido"         : dados inconsistentes (I_mp ≥ I_sc, V_mp ≥ V_oc,
+                             valores não positivos) ou solução não física
+
+    Parâmetros:
+        V_oc, I_sc, V_mp, I_mp : Pontos-chave em STC [V, A]
+        coef_V_oc : Coeficiente de temperatura de V_oc [V/K] (negativo)
+        coef_I_sc : Coeficiente de temperatura de I_sc [A/K]
+        num_celulas_serie : Células em série no módulo
+        energia_gap_eV : Energia de gap das células [eV]
+        temperatura_referencia : Temperatura dos dados [K]
+        area_celula : Área de cada célula [m^2], para as densidades
+        tolerancia : Critério de parada nos resíduos normalizados
+        max_iteracoes : Limite de iterações de Newton
+
+    Retorna:
+        dicionário de arrays (N,):
+            - I_L, I_0 [A], a [V], R_s, R_sh [Ω]: parâmetros do módulo
+            - J_ph, J0 [A/m^2], fator_idealidade, resistencia_serie,
+              resistencia_shunt [Ω·m^2]: parâmetros por célula, prontos
+              para curva_JV_diodo / curvas_JV_lote
+            - Status, Residuo (máximo |F| das condições resolvidas),
+              Numero_condicao, Iteracoes
+        Os parâmetros são NaN nas entradas "invalido" e "nao_convergido".
+    """
+    V_oc, I_sc, V_mp, I_mp, coef_V_oc, coef_I_sc, N_s = (
+        np.array(v, dtype=float) for v in np.broadcast_arrays(
+            *(np.atleast_1d(v) for v in (V_oc, I_sc, V_mp, I_mp, coef_V_oc,
+                                         coef_I_sc, num_celulas_serie)))
+    )
+    T = float(temperatura_referencia)
+    tensao_termica = k_B * T / q
+    temperatura_gap = energia_gap_eV * q / k_B   # Eg / k_B [K]
+
+    validos = ((I_sc > 0) & (V_oc > 0) & (I_mp > 0) & (V_mp > 0)
+               & (I_mp < I_sc) & (V_mp < V_oc) & (N_s > 0)
+               & np.isfinite(coef_V_oc) & np.isfinite(coef_I_sc))
+
+    # Palpite inicial: a pela aproximação de dV_oc/dT (De Soto et al.),
+    # Rs pela forma explícita de I(V_mp) com Rsh infinito e Rsh por uma
+    # inclinação típica perto de I_sc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = ((coef_V_oc * T - V_oc)
+             / (coef_I_sc * T / I_sc - 3.0 - energia_gap_eV / tensao_termica))
+    a_min, a_max = 0.8 * N_s * tensao_termica, 2.5 * N_s * tensao_termica
+    a = np.where(np.isfinite(a) & (a > 0), np.clip(a, a_min, a_max), 1.3 * N_s * tensao_termica)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Rs = (a * np.log1p(-I_mp / I_sc) + V_oc - V_mp) / I_mp
+        Rs = np.clip(np.nan_to_num(Rs, nan=0.0), 0.0, None)
+        g = np.maximum(I_sc - I_mp, 1e-12) * V_oc / (20.0 * V_mp * I_sc)
+    x = np.stack([np.log(a), Rs, g], axis=-1)
+
+    args = (V_oc, I_sc, V_mp, I_mp, coef_V_oc, coef_I_sc, temperatura_gap, T)
+    x, F, norma, convergido, iteracoes = _newton_amortecido(
+        _condicoes, x, args, np.flatnonzero(validos), tolerancia, max_iteracoes)
+    numero_condicao = _numero_condicao(_condicoes, x, F, args)
+
+    # Soluções com Rsh negativo: Rsh infinito e só as condições do ponto
+    # de máxima potência, partindo de (a, Rs) da solução exata
+    sem_shunt = np.flatnonzero(validos & convergido & (x[:, 2] < 0))
+    if sem_shunt.size:
+        args_s = tuple(v[sem_shunt] if np.ndim(v) else v for v in args)
+        x_s, F_s, norma[sem_shunt], convergido[sem_shunt], iteracoes_s = _newton_amortecido(
+            _condicoes_sem_shunt, x[sem_shunt, :2], args_s, np.arange(sem_shunt.size),
+            tolerancia, max_iteracoes)
+        x[sem_shunt] = np.column_stack([x_s, np.zeros(sem_shunt.size)])
+        iteracoes[sem_shunt] += iteracoes_s
+        numero_condicao[sem_shunt] = _numero_condicao(_condicoes_sem_shunt, x_s, F_s, args_s)
+
+    _, log_I0, I_L = _condicoes(x, *args)
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        a, Rs, Rsh = np.exp(x[:, 0]), x[:, 1], V_oc / (x[:, 2] * I_sc)
+    fisico = np.isfinite(log_I0) & (I_L > 0) & (Rs >= 0) & (x[:, 2] >= 0)
+
+    status = np.where(convergido, "convergido", "nao_convergido").astype("<U16")
+    status[sem_shunt[convergido[sem_shunt]]] = "rsh_infinito"
+    status[convergido & (numero_condicao > LIMITE_CONDICIONAMENTO)] = "mal_condicionado"
+    status[~validos | (convergido & ~fisico)] = "invalido"
+
+    # Parâmetros só são publicados para entradas resolvidas
+    resolvido = convergido & (status != "invalido")
+    I_L, I0, a, Rs, Rsh = (np.where(resolvido, v, np.nan)
+                           for v in (I_L, np.exp(log_I0), a, Rs, Rsh))
+    return {
+        "I_L": I_L,
+        "I_0": I0,
+        "a": a,
+        "R_s": Rs,
+        "R_sh": Rsh,
+        "J_ph": I_L / area_celula,
+        "J0": I0 / area_celula,
+        "fator_idealidade": a / (N_s * tensao_termica),
+        "resistencia_serie": Rs / N_s * area_celula,
+        "resistencia_shunt": Rsh / N_s * area_celula,
+        "Status": status,
+        "Residuo": norma,
+        "Numero_condicao": numero_condicao,
+        "Iteracoes": iteracoes,
+    }
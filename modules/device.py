@@ -1,10 +1,21 @@
 import numpy as np
 from modules.constants import k_B, q
-from modules.solar import fluxo_fotons_corpo_negro
+from modules import instrumentation
+from modules.solar import (fluxo_fotons_corpo_negro_integrado, integrar_fluxo_trapezio,
+                           tabela_corpo_negro, INTEGRADORES)
+
+# Limite do expoente do diodo (evita overflow em exp)
+LIMITE_EXPOENTE = 100.0
+# Limite de ln(J0·e^u) no solver vetorizado, que calcula o termo do diodo
+# em escala logarítmica (exp transborda acima de ~709)
+LIMITE_LOG_DIODO = 700.0
+
+METODOS_JV = ("newton", "newton_vetorizado", "lambertw")
 
 def calcular_corrente_saturacao_radiativa(energia_gap_eV: float,
                                           temperatura_celula: float = 300.0,
-                                          num_pontos_energia: int = 4000) -> float:
+                                          num_pontos_energia: int = 4000,
+                                          integrador: str = "trapezio") -> float:
     """
     Calcula J0 radiativa aproximada usando um modelo de corpo negro
     para a célula à temperatura T_célula (sem viés, V = 0).
@@ -18,21 +29,30 @@ def calcular_corrente_saturacao_radiativa(energia_gap_eV: float,
         energia_gap_eV : Energia de gap [eV]
         temperatura_celula : Temperatura da célula [K]
         num_pontos_energia : Número de pontos para integração numérica
+        integrador : "trapezio" (malha até 4 eV), "analitico" (série
+                     fechada até o infinito, vetorizada em Eg e T_célula) ou
+                     "tabela" (interpolação na tabela de fluxo acumulado da
+                     célula, em cache; vetorizada em Eg)
     
     Retorna:
         J0 : Corrente de saturação radiativa [A/m^2]
     """
-    Eg_J = energia_gap_eV * q
-    # Limite superior de energia
-    E_max_J = 4.0 * q
+    if integrador not in INTEGRADORES:
+        raise ValueError(f"Integrador desconhecido: {integrador!r} (use um de {INTEGRADORES})")
 
-    energia_J = np.linspace(Eg_J, E_max_J, num_pontos_energia)
+    if integrador == "tabela":
+        tabela = tabela_corpo_negro(float(temperatura_celula), 1.0, num_pontos_energia)
+        return tabela.corrente(energia_gap_eV)
 
-    # Fluxo espectral emitido pela célula (corpo negro)
-    fluxo_emitido = fluxo_fotons_corpo_negro(energia_J, temperatura_celula)
+    if integrador == "analitico":
+        return q * fluxo_fotons_corpo_negro_integrado(
+            np.asarray(energia_gap_eV) * q, temperatura_celula
+        )
 
-    # Integração e conversão em corrente
-    fluxo_total_emitido = np.trapz(fluxo_emitido, energia_J)  # [fótons / (m^2·s)]
+    # Fluxo emitido pela célula (corpo negro) integrado até 4 eV
+    fluxo_total_emitido = integrar_fluxo_trapezio(
+        energia_gap_eV, temperatura_celula, num_pontos_energia
+    )  # [fótons / (m^2·s)]
     J0 = q * fluxo_total_emitido      # [A/m^2]
     return J0
 
@@ -45,7 +65,12 @@ def curva_JV_diodo(J_ph: float,
                     resistencia_shunt: float = np.inf,
                     tensao_min: float = 0.0,
                     tensao_max: float = 1.2,
-                    num_pontos_tensao: int = 400) -> tuple:
+                    num_pontos_tensao: int = 400,
+                    metodo: str = "newton",
+                    malha: str = "uniforme",
+                    tolerancia_interpolacao: float = 1e-4,
+                    callback_progresso=None,
+                    J_inicial=None) -> tuple:
     """
     Gera a curva J(V) para o diodo fotovoltaico:
 
@@ -56,6 +81,26 @@ def curva_JV_diodo(J_ph: float,
     Usa método de Newton para resolver J em função de V quando Rs e/ou Rsh
     são finitos.
 
+    Métodos disponíveis:
+        "newton" : laço ponto a ponto (até 50 iterações por tensão, com o
+                   valor anterior como palpite).
+        "newton_vetorizado" : Newton salvaguardado aplicado ao vetor inteiro
+                   de tensões, com máscara de convergência por elemento.
+                   Converge até |ΔJ| < 1e-10 A/m² em todos os pontos; onde o
+                   laço "newton" também converge, as curvas coincidem dentro
+                   dessa tolerância. Com Rs grande o laço "newton" esgota as
+                   50 iterações antes de convergir, e os resultados diferem.
+        "lambertw" : solução explícita J(V) pela função W de Lambert, sem
+                   iterações de Newton (ver corrente_diodo_lambertw). Não
+                   aplica o limite de ±100 no expoente.
+
+    Malhas de tensão:
+        "uniforme" : np.linspace(tensao_min, tensao_max, num_pontos_tensao).
+        "adaptativa" : malha não uniforme refinada onde a curva se afasta da
+                   interpolação linear (joelho e V_oc), incluindo V_oc e V_mp
+                   exatos; num_pontos_tensao passa a ser o número máximo de
+                   pontos (ver malha_tensao_adaptativa).
+
     Parâmetros:
         J_ph : Corrente fotogerada [A/m^2]
         J0 : Corrente de saturação [A/m^2]
@@ -66,6 +111,27 @@ def curva_JV_diodo(J_ph: float,
         tensao_min : Tensão mínima [V]
         tensao_max : Tensão máxima [V]
         num_pontos_tensao : Número de pontos de tensão
+        metodo : "newton", "newton_vetorizado" ou "lambertw"
+        malha : "uniforme" ou "adaptativa"
+        tolerancia_interpolacao : Erro de interpolação alvo da malha
+                                  adaptativa, como fração de J_ph
+        callback_progresso : Função opcional chamada com a fração concluída
+                             (0–1); no laço "newton" a cada ~1% dos pontos,
+                             em "newton_vetorizado" a cada iteração (ver
+                             _newton_vetorizado), em "lambertw" ao final.
+                             Uma exceção lançada por ela interrompe o
+                             cálculo (cancelamento).
+        J_inicial : Palpite por ponto para "newton_vetorizado" (partida a
+                    quente, ex.: a curva anterior na mesma malha); pontos
+                    que não convergem a partir dele são refeitos com o
+                    palpite a frio. Ignorado pelos demais métodos
+
+    Em "newton_vetorizado" e "lambertw", pontos que não convergem voltam
+    como NaN; o laço "newton" devolve a última iteração.
+
+    Com a instrumentação ligada (modules.instrumentation.instrumentar), cada
+    chamada registra as iterações de Newton por ponto, os pontos não
+    convergidos e os eventos de limite do expoente.
 
     Retorna:
         tensoes_V : array de tensões [V]
@@ -76,18 +142,91 @@ def curva_JV_diodo(J_ph: float,
     Rs = resistencia_serie
     Rsh = resistencia_shunt
 
-    tensoes_V = np.linspace(tensao_min, tensao_max, num_pontos_tensao)
+    if metodo not in METODOS_JV:
+        raise ValueError(f"Método desconhecido: {metodo!r} (use um de {METODOS_JV})")
+
+    relatorio = instrumentation.ATIVO
+    limites_antes = relatorio.eventos_limite if relatorio is not None else 0
+
+    if malha == "adaptativa":
+        tensoes_V, correntes_J = malha_tensao_adaptativa(
+            J_ph, J0, T, n, Rs, Rsh, tensao_min, tensao_max,
+            tolerancia_relativa=tolerancia_interpolacao,
+            max_pontos=num_pontos_tensao,
+        )
+        if metodo == "lambertw":
+            if relatorio is not None:
+                relatorio.registrar_curva(metodo, tensoes_V, correntes_J,
+                                          convergido=np.isfinite(correntes_J))
+            if callback_progresso is not None:
+                callback_progresso(1.0)
+            return tensoes_V, correntes_J
+    elif malha == "uniforme":
+        tensoes_V = np.linspace(tensao_min, tensao_max, num_pontos_tensao)
+    else:
+        raise ValueError(f"Malha desconhecida: {malha!r} (use 'uniforme' ou 'adaptativa')")
+
+    if metodo == "newton_vetorizado":
+        # Último progresso informado: o refazer a frio continua dele
+        progresso = [0.0]
+
+        def progresso_quente(fracao):
+            progresso[0] = fracao
+            callback_progresso(fracao)
+
+        def progresso_frio(fracao):
+            callback_progresso(progresso[0] + fracao * (1.0 - progresso[0]))
+
+        correntes_J, iteracoes, convergido = _newton_vetorizado(
+            tensoes_V, J_ph, J0, q / (n * k_B * T), Rs, 1.0 / Rsh,
+            J_inicial=J_inicial, relatorio=relatorio,
+            callback_progresso=None if callback_progresso is None else progresso_quente,
+        )
+        if J_inicial is not None and not convergido.all():
+            # Partida a quente que não convergiu: refaz esses pontos a frio
+            falhos = ~convergido
+            correntes_J[falhos], iteracoes_frio, convergido[falhos] = _newton_vetorizado(
+                tensoes_V[falhos], J_ph, J0, q / (n * k_B * T), Rs, 1.0 / Rsh,
+                relatorio=relatorio,
+                callback_progresso=None if callback_progresso is None else progresso_frio,
+            )
+            iteracoes[falhos] += iteracoes_frio
+        correntes_J[~convergido] = np.nan
+        if relatorio is not None:
+            relatorio.registrar_curva(metodo, tensoes_V, correntes_J, iteracoes, convergido,
+                                      relatorio.eventos_limite - limites_antes)
+        if callback_progresso is not None:
+            callback_progresso(1.0)
+        return tensoes_V, correntes_J
+
+    if metodo == "lambertw":
+        correntes_J = corrente_diodo_lambertw(tensoes_V, J_ph, J0, T, n, Rs, Rsh)
+        if relatorio is not None:
+            relatorio.registrar_curva(metodo, tensoes_V, correntes_J,
+                                      convergido=np.isfinite(correntes_J))
+        if callback_progresso is not None:
+            callback_progresso(1.0)
+        return tensoes_V, correntes_J
+
     correntes_J = np.zeros_like(tensoes_V)
+    intervalo_progresso = max(1, len(tensoes_V) // 100)
+    if relatorio is not None:
+        iteracoes = np.zeros(len(tensoes_V), dtype=int)
+        convergido = np.zeros(len(tensoes_V), dtype=bool)
+        eventos_limite = 0
 
     # Palpite inicial para o método de Newton (começa em J_ph)
     J_inicial = J_ph
 
     for i, V in enumerate(tensoes_V):
         J = J_inicial  # palpite
+        convergiu = False
 
-        for _ in range(50):
+        for iteracao in range(1, 51):
             # Função f(J) = 0
             expoente = q * (V + J * Rs) / (n * k_B * T)
+            if relatorio is not None and abs(expoente) > LIMITE_EXPOENTE:
+                eventos_limite += 1
             # Limitar expoente para evitar overflow numérico
             expoente = np.clip(expoente, -100, 100)
 
@@ -118,12 +257,534 @@ def curva_JV_diodo(J_ph: float,
             # Critério de convergência
             if abs(J_novo - J) < 1e-10:
                 J = J_novo
+                convergiu = True
                 break
 
             J = J_novo
 
         correntes_J[i] = J
+        if relatorio is not None:
+            iteracoes[i] = iteracao
+            convergido[i] = convergiu
         # Usar o valor atual como palpite para o próximo V
         J_inicial = J
 
+        if callback_progresso is not None and (
+                (i + 1) % intervalo_progresso == 0 or i + 1 == len(tensoes_V)):
+            callback_progresso((i + 1) / len(tensoes_V))
+
+    if relatorio is not None:
+        relatorio.eventos_limite += eventos_limite
+        relatorio.registrar_curva(metodo, tensoes_V, correntes_J, iteracoes, convergido,
+                                  relatorio.eventos_limite - limites_antes)
+    return tensoes_V, correntes_J
+
+
+def corrente_diodo_lambertw(tensoes_V,
+                            J_ph,
+                            J0,
+                            temperatura_celula=300.0,
+                            fator_idealidade=1.0,
+                            resistencia_serie=0.0,
+                            resistencia_shunt=np.inf):
+    """
+    Calcula J(V) do modelo de um diodo de forma explícita (Lambert W):
+
+      J = β (J_ph + J0 - V/Rsh) - (n k_B T / (q Rs)) · W(θ)
+      θ = (q Rs J0 β / (n k_B T)) · exp(q β (Rs (J_ph + J0) + V) / (n k_B T))
+      β = Rsh / (Rs + Rsh)
+
+    W(θ) é avaliado a partir de ln θ, portanto argumentos que estourariam
+    exp() continuam finitos. Com Rs = 0 a equação já é explícita.
+    Todos os argumentos são difundidos (broadcast) entre si.
+
+    Parâmetros:
+        tensoes_V : Tensões [V]
+        J_ph : Corrente fotogerada [A/m^2]
+        J0 : Corrente de saturação [A/m^2]
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+
+    Retorna:
+        correntes_J : array de densidades de corrente [A/m^2]
+    """
+    V = np.asarray(tensoes_V, dtype=float)
+    a = q / (fator_idealidade * k_B * np.asarray(temperatura_celula, dtype=float))
+    Rs = np.asarray(resistencia_serie, dtype=float)
+    G_sh = 1.0 / np.asarray(resistencia_shunt, dtype=float)
+    beta = 1.0 / (1.0 + Rs * G_sh)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        log_theta = (np.log(Rs * J0 * beta * a)
+                     + beta * a * (Rs * (J_ph + J0) + V))
+        J_com_rs = beta * (J_ph + J0 - V * G_sh) - _lambertw_exp(log_theta) / (a * Rs)
+        J_sem_rs = J_ph - J0 * np.expm1(a * V) - V * G_sh
+    return np.where(Rs > 0, J_com_rs, J_sem_rs)
+
+
+def tensao_diodo_lambertw(correntes_J,
+                          J_ph,
+                          J0,
+                          temperatura_celula=300.0,
+                          fator_idealidade=1.0,
+                          resistencia_serie=0.0,
+                          resistencia_shunt=np.inf):
+    """
+    Calcula V(J) do modelo de um diodo (avaliação dirigida por corrente):
+
+      V = (J_ph + J0 - J) Rsh - J Rs - (n k_B T / q) · W(θ)
+      θ = (q J0 Rsh / (n k_B T)) · exp(q Rsh (J_ph + J0 - J) / (n k_B T))
+
+    Usa a identidade ln W(θ) = ln θ - W(θ) para evitar o cancelamento
+    entre os dois termos grandes quando Rsh é alto. Para Rsh infinito,
+    V = (n k_B T / q) ln((J_ph + J0 - J) / J0) - J Rs, definido apenas
+    para J < J_ph + J0.
+
+    Parâmetros:
+        correntes_J : Densidades de corrente [A/m^2]
+        J_ph : Corrente fotogerada [A/m^2]
+        J0 : Corrente de saturação [A/m^2]
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+
+    Retorna:
+        tensoes_V : array de tensões [V]
+    """
+    J = np.asarray(correntes_J, dtype=float)
+    a = q / (fator_idealidade * k_B * np.asarray(temperatura_celula, dtype=float))
+    Rs = np.asarray(resistencia_serie, dtype=float)
+    Rsh = np.asarray(resistencia_shunt, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        V_infinito = np.log((J_ph + J0 - J) / J0) / a - J * Rs
+        if np.all(np.isinf(Rsh)) and np.broadcast_shapes(V_infinito.shape, Rsh.shape) == V_infinito.shape:
+            return V_infinito
+        log_fator = np.log(J0 * Rsh * a)
+        log_theta = log_fator + a * Rsh * (J_ph + J0 - J)
+        w = _lambertw_exp(log_theta)
+        log_w = np.where(log_theta < -700.0, log_theta - w, np.log(w))
+        V_finito = (log_w - log_fator) / a - J * Rs
+    return np.where(np.isinf(Rsh), V_infinito, V_finito)
+
+
+def tensao_maxima_potencia(J_ph,
+                           J0,
+                           temperatura_celula=300.0,
+                           fator_idealidade=1.0,
+                           resistencia_serie=0.0,
+                           resistencia_shunt=np.inf,
+                           tolerancia: float = 1e-9,
+                           max_iteracoes: int = 50) -> tuple:
+    """
+    Tensão do ponto de máxima potência, resolvendo
+
+      dP/dV = J + V dJ/dV = 0   em [0, V_oc]
+
+    por Newton salvaguardado (bissecção quando o passo sai do intervalo).
+    J(V) vem de corrente_diodo_lambertw e as derivadas são analíticas, por
+    diferenciação implícita da equação do diodo:
+
+      dJ/dV = -(D + 1/Rsh) / M,   d²J/dV² = -D a (1 + Rs dJ/dV) / M²
+      D = a J0 exp(a (V + J Rs)),  M = 1 + Rs (D + 1/Rsh),  a = q / (n k_B T)
+
+    Todos os parâmetros são difundidos (broadcast) entre si.
+
+    Parâmetros:
+        J_ph, J0 : Correntes fotogerada e de saturação [A/m^2]
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+        tolerancia : Critério de parada em V [V]
+        max_iteracoes : Limite de iterações
+
+    Retorna:
+        V_mp : Tensão de máxima potência [V]
+        convergido : máscara booleana de convergência
+    """
+    J_ph, J0, T, n, Rs, Rsh = (
+        np.array(x, dtype=float) for x in np.broadcast_arrays(
+            J_ph, J0, temperatura_celula, fator_idealidade,
+            resistencia_serie, resistencia_shunt)
+    )
+    forma = J_ph.shape
+    J_ph, J0, T, n, Rs, Rsh = (x.ravel() for x in (J_ph, J0, T, n, Rs, Rsh))
+    a = q / (n * k_B * T)
+    G_sh = 1.0 / Rsh
+
+    # Intervalo [0, V_oc]: dP/dV = J_sc > 0 em V = 0 e V_oc·J'(V_oc) < 0 em V_oc
+    V_oc = tensao_diodo_lambertw(0.0, J_ph, J0, T, n, Rs, Rsh)
+    V_inf = np.zeros_like(V_oc)
+    V_sup = np.where(V_oc > 0, V_oc, 0.0)
+    tensao_termica = 1.0 / a
+    V_mp = np.clip(V_oc - tensao_termica * np.log1p(np.maximum(V_oc, 0.0) / tensao_termica),
+                   V_inf, V_sup)
+
+    convergido = V_sup <= V_inf
+    ativos = np.flatnonzero(~convergido)
+    for _ in range(max_iteracoes):
+        if ativos.size == 0:
+            break
+        V = V_mp[ativos]
+        J = corrente_diodo_lambertw(V, J_ph[ativos], J0[ativos], T[ativos],
+                                    n[ativos], Rs[ativos], Rsh[ativos])
+
+        # D = a J0 exp(a (V + J Rs)), escrito sem exp a partir da própria equação
+        a_k, Rs_k, G_k = a[ativos], Rs[ativos], G_sh[ativos]
+        D = a_k * (J_ph[ativos] + J0[ativos] - J - (V + J * Rs_k) * G_k)
+        M = 1.0 + Rs_k * (D + G_k)
+        dJ = -(D + G_k) / M
+        d2J = -D * a_k * (1.0 + Rs_k * dJ) / M ** 2
+        g = J + V * dJ
+        dg = 2.0 * dJ + V * d2J
+
+        inf_k = np.where(g > 0, V, V_inf[ativos])
+        sup_k = np.where(g <= 0, V, V_sup[ativos])
+        V_inf[ativos] = inf_k
+        V_sup[ativos] = sup_k
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            V_novo = V - g / dg
+        fora = ~((V_novo > inf_k) & (V_novo < sup_k))
+        V_novo = np.where(fora, 0.5 * (inf_k + sup_k), V_novo)
+
+        feito = (np.abs(V_novo - V) < tolerancia) | (sup_k - inf_k < tolerancia)
+        V_mp[ativos] = V_novo
+        convergido[ativos[feito]] = True
+        ativos = ativos[~feito]
+
+    return V_mp.reshape(forma), convergido.reshape(forma)
+
+def malha_tensao_adaptativa(J_ph,
+                            J0,
+                            temperatura_celula=300.0,
+                            fator_idealidade=1.0,
+                            resistencia_serie=0.0,
+                            resistencia_shunt=np.inf,
+                            tensao_min: float = 0.0,
+                            tensao_max: float = 1.2,
+                            tolerancia_relativa: float = 1e-4,
+                            max_pontos: int = 400,
+                            pontos_iniciais: int = 17) -> tuple:
+    """
+    Gera uma malha de tensões não uniforme para a curva J-V.
+
+    Parte de uma malha uniforme grossa acrescida de V_oc e V_mp exatos
+    (quando dentro da faixa) e bissecciona repetidamente os intervalos cujo
+    ponto médio se afasta da interpolação linear mais que
+    tolerancia_relativa · J_ph. O erro é medido sobre J limitado a
+    [-J_ph, J_ph], de modo que a cauda exponencial muito negativa além de
+    V_oc não consome o orçamento de pontos. Os pontos se concentram, assim,
+    no joelho da curva e em torno de V_oc; as regiões quase lineares
+    (J ≈ J_ph) ficam com poucos pontos. Se o orçamento max_pontos acabar,
+    os intervalos de maior erro são refinados primeiro.
+
+    Parâmetros:
+        J_ph, J0 : Correntes fotogerada e de saturação [A/m^2]
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+        tensao_min, tensao_max : Faixa de tensão [V]
+        tolerancia_relativa : Erro de interpolação alvo (fração de J_ph)
+        max_pontos : Número máximo de pontos da malha
+        pontos_iniciais : Pontos da malha uniforme inicial
+
+    Retorna:
+        tensoes_V : array crescente de tensões [V]
+        correntes_J : densidades de corrente nesses pontos [A/m^2]
+    """
+    modelo = (J_ph, J0, temperatura_celula, fator_idealidade,
+              resistencia_serie, resistencia_shunt)
+
+    V_oc = tensao_diodo_lambertw(0.0, *modelo)
+    V_mp, _ = tensao_maxima_potencia(*modelo)
+    especiais = np.array([V_oc, V_mp], dtype=float)
+    especiais = especiais[(especiais > tensao_min) & (especiais < tensao_max)]
+
+    tensoes_V = np.union1d(
+        np.linspace(tensao_min, tensao_max, min(pontos_iniciais, max_pontos)), especiais
+    )
+    correntes_J = corrente_diodo_lambertw(tensoes_V, *modelo)
+    limite = max(abs(J_ph), np.finfo(float).tiny)
+    tolerancia = tolerancia_relativa * limite
+
+    while tensoes_V.size < max_pontos:
+        V_medio = 0.5 * (tensoes_V[1:] + tensoes_V[:-1])
+        J_medio = corrente_diodo_lambertw(V_medio, *modelo)
+        J_lim = np.clip(correntes_J, -limite, limite)
+        erro = np.abs(np.clip(J_medio, -limite, limite) - 0.5 * (J_lim[1:] + J_lim[:-1]))
+
+        refinar = np.flatnonzero(erro > tolerancia)
+        if refinar.size == 0:
+            break
+        vagas = max_pontos - tensoes_V.size
+        if refinar.size > vagas:
+            refinar = np.sort(refinar[np.argsort(erro[refinar])[::-1][:vagas]])
+
+        tensoes_V = np.insert(tensoes_V, refinar + 1, V_medio[refinar])
+        correntes_J = np.insert(correntes_J, refinar + 1, J_medio[refinar])
+
     return tensoes_V, correntes_J
+
+
+def _lambertw_exp(y):
+    """
+    W(e^y) para y real (ramo principal), sem avaliar e^y diretamente.
+
+    Palpite de Winitzki com ln(1 + e^y) calculado por logaddexp, seguido
+    de quatro passos de Newton fixos em g(w) = w + ln w - y (erro relativo
+    ~1e-16 em toda a faixa).
+    """
+    y = np.asarray(y, dtype=float)
+    L = np.logaddexp(0.0, y)
+    w = L * (1.0 - np.log1p(L) / (2.0 + L))
+    with np.errstate(divide="ignore", invalid="ignore", under="ignore"):
+        for _ in range(4):
+            w = w * (1.0 + y - np.log(w)) / (1.0 + w)
+        # Para y muito negativo W(e^y) ≈ e^y (e w pode ter sido arredondado a 0)
+        x = np.exp(np.minimum(y, -30.0))
+        w = np.where(y < -30.0, x * (1.0 - x), w)
+    return w
+
+
+def _residuo_diodo(J, V, J_ph, J0, inverso_tensao_termica, Rs, G_sh):
+    """
+    Resíduo f(J) da equação do diodo e sua derivada df/dJ (vetorizados).
+
+    O termo do diodo J0·e^u é calculado como exp(ln J0 + u), de modo que
+    junções com J0 muito pequeno (gap largo) não precisam de expoentes
+    limitados; só ln(J0·e^u) > LIMITE_LOG_DIODO é limitado, e aí o termo é
+    constante em J e não contribui para a derivada. Também retorna a
+    máscara dos elementos limitados.
+    """
+    tensao_juncao = V + J * Rs
+    with np.errstate(divide="ignore"):
+        log_termo = np.log(J0) + inverso_tensao_termica * tensao_juncao
+    limitado = log_termo > LIMITE_LOG_DIODO
+    termo_diodo = np.exp(np.minimum(log_termo, LIMITE_LOG_DIODO))   # J0·e^u
+
+    f_J = J_ph - (termo_diodo - J0) - tensao_juncao * G_sh - J
+    dfdJ = (-np.where(limitado, 0.0, termo_diodo * inverso_tensao_termica * Rs)
+            - Rs * G_sh
+            - 1.0)
+    return f_J, dfdJ, limitado
+
+
+def _newton_vetorizado(tensoes_V, J_ph, J0, inverso_tensao_termica, Rs, G_sh,
+                       tolerancia: float = 1e-10,
+                       max_iteracoes: int = 100,
+                       J_inicial=None,
+                       relatorio=None,
+                       callback_progresso=None):
+    """
+    Resolve f(J) = 0 para todos os elementos de uma vez (Newton salvaguardado).
+
+    Todos os argumentos são difundidos (broadcast) entre si, de modo que a
+    mesma rotina resolve uma curva (vetor de tensões) ou um lote de curvas
+    (matriz dispositivos × tensões).
+
+    Cada elemento mantém um intervalo [J_inf, J_sup] com f(J_inf) >= 0 >=
+    f(J_sup), estreitado de início pela tensão de junção (ver abaixo), de
+    modo que um palpite ruim custa poucas bissecções; passos de Newton que
+    saem do intervalo são trocados por bissecção. O termo do diodo é
+    calculado em escala logarítmica (ver _residuo_diodo). Apenas os
+    elementos ainda não convergidos são recalculados.
+
+    Parâmetros:
+        tensoes_V : Tensões [V]
+        J_ph, J0 : Correntes fotogerada e de saturação [A/m^2]
+        inverso_tensao_termica : q / (n k_B T) [1/V]
+        Rs : Resistência série [Ω·m^2]
+        G_sh : Condutância shunt 1/Rsh [1/(Ω·m^2)] (0 para Rsh infinito)
+        tolerancia : Critério de parada |ΔJ| [A/m^2]
+        max_iteracoes : Limite de iterações por elemento
+        J_inicial : Palpite inicial opcional (ex.: curva anterior)
+        relatorio : RelatorioInstrumentacao que acumula os eventos de
+                    limite (None = não conta); curva_JV_diodo passa o
+                    relatório ativo e registra a curva correspondente
+        callback_progresso : Função opcional chamada a cada iteração com a
+                             fração estimada do trabalho (média, por
+                             elemento, das décadas ganhas no passo de Newton
+                             em relação às necessárias; não decresce); uma
+                             exceção lançada por ela interrompe o cálculo
+
+    Retorna:
+        correntes_J : array de densidades de corrente [A/m^2]
+        iteracoes : número de iterações usadas por elemento
+        convergido : máscara booleana de convergência
+    """
+    V, J_ph, J0, a, Rs, G_sh = (
+        np.array(x, dtype=float) for x in
+        np.broadcast_arrays(tensoes_V, J_ph, J0, inverso_tensao_termica, Rs, G_sh)
+    )
+    forma = V.shape
+    V, J_ph, J0, a, Rs, G_sh = (x.ravel() for x in (V, J_ph, J0, a, Rs, G_sh))
+
+    # Intervalo inicial: f(J_sup) <= 0 porque o termo exponencial é >= 0,
+    # e J_inf = J_sup + f(J_sup) satisfaz f(J_inf) >= 0 (f é decrescente,
+    # com f' <= -1), desde que f(J_sup) não tenha sido limitado
+    J_sup = (J_ph + J0 - V * G_sh) / (1.0 + Rs * G_sh)
+    f_sup, _, limitado_sup = _residuo_diodo(J_sup, V, J_ph, J0, a, Rs, G_sh)
+    com_rs = Rs > 0
+    J_inf = np.where(limitado_sup & com_rs, -np.inf, J_sup + f_sup)
+
+    # Com Rs > 0 esse J_inf pode ficar muito longe da raiz (f(J_sup) cresce
+    # como e^(J_sup·Rs/V_t)). Limites justos pela tensão de junção
+    # V_j = V + J·Rs:
+    #   - V_j <= 0 e J <= J_ph dão f(J) >= 0, logo J_inf = min(J_ph, -V/Rs);
+    #   - V_j que satura o diodo com toda a corrente disponível,
+    #     V_j = (n k_B T / q) ln(1 + (J_ph + max(V, 0)/Rs) / J0), dá
+    #     f(J) = -V_j (G_sh + 1/Rs) + min(V, 0)/Rs <= 0, logo é um J_sup
+    #     (e é o palpite da partida a frio)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        corrente_disponivel = J_ph + np.maximum(V, 0.0) / Rs
+        J_saturacao = (np.log1p(corrente_disponivel / J0) / a - V) / Rs
+        J_inf = np.where(com_rs, np.maximum(J_inf, np.minimum(J_ph, -V / Rs)), J_inf)
+        saturacao_valida = com_rs & np.isfinite(J_saturacao)
+        J_sup = np.where(saturacao_valida, np.minimum(J_sup, J_saturacao), J_sup)
+    J_inf = np.minimum(J_inf, J_sup)
+
+    if J_inicial is None:
+        J = np.where(saturacao_valida, J_saturacao, J_sup)
+    else:
+        J = np.broadcast_to(np.asarray(J_inicial, dtype=float), forma).ravel().copy()
+    J = np.clip(J, J_inf, J_sup)
+
+    iteracoes = np.zeros(V.shape, dtype=int)
+    convergido = J_inf == J_sup
+    ativos = np.flatnonzero(~convergido)
+    passo_inicial, progresso = None, 0.0
+
+    for _ in range(max_iteracoes):
+        if ativos.size == 0:
+            break
+        Jk = J[ativos]
+        f_J, dfdJ, limitado = _residuo_diodo(Jk, V[ativos], J_ph[ativos], J0[ativos],
+                                             a[ativos], Rs[ativos], G_sh[ativos])
+        if relatorio is not None:
+            relatorio.eventos_limite += int(np.count_nonzero(limitado))
+
+        # Atualizar o intervalo com o sinal do resíduo
+        inf_k = np.where(f_J >= 0, Jk, J_inf[ativos])
+        sup_k = np.where(f_J <= 0, Jk, J_sup[ativos])
+        J_inf[ativos] = inf_k
+        J_sup[ativos] = sup_k
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            J_novo = Jk - f_J / dfdJ
+        fora = ~((J_novo >= inf_k) & (J_novo <= sup_k))
+        J_novo = np.where(fora, 0.5 * (inf_k + sup_k), J_novo)
+
+        limiar = tolerancia + 4.0 * np.finfo(float).eps * np.abs(J_novo)
+        # Resíduo no nível do arredondamento dos termos de f (o termo do
+        # diodo herda o erro do expoente, ampliado por |u|): com |J| grande
+        # os passos de Newton oscilam entre dois vizinhos acima do limiar
+        tensao_juncao = V[ativos] + Jk * Rs[ativos]
+        escala_f = ((np.abs(J_ph[ativos]) + np.abs(Jk) + np.abs(tensao_juncao * G_sh[ativos]))
+                    * (1.0 + np.abs(a[ativos] * tensao_juncao)))
+        feito = ((np.abs(J_novo - Jk) < limiar)
+                 | (np.abs(f_J) <= 16.0 * np.finfo(float).eps * escala_f)
+                 | (sup_k - inf_k < limiar))
+
+        if callback_progresso is not None:
+            # Progresso por elemento: décadas já ganhas no tamanho do passo,
+            # relativas às que o primeiro passo ainda precisava ganhar até o
+            # limiar; convergidos valem 1 (a média nunca recua)
+            passo = np.abs(J_novo - Jk)
+            if passo_inicial is None:
+                passo_inicial = passo
+            passo_inicial = passo_inicial[~feito]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fracao = (np.log(passo_inicial / passo[~feito])
+                          / np.log(passo_inicial / limiar[~feito]))
+            fracao = np.clip(np.nan_to_num(fracao), 0.0, 1.0)
+            progresso = max(progresso, (np.count_nonzero(convergido) + np.count_nonzero(feito)
+                                        + fracao.sum()) / convergido.size)
+
+        J[ativos] = J_novo
+        iteracoes[ativos] += 1
+        convergido[ativos[feito]] = True
+        ativos = ativos[~feito]
+        if callback_progresso is not None:
+            callback_progresso(1.0 if ativos.size == 0 else progresso)
+
+    return (J.reshape(forma), iteracoes.reshape(forma),
+            convergido.reshape(forma))
+
+
+def curvas_JV_lote(J_ph,
+                   J0,
+                   temperatura_celula=300.0,
+                   fator_idealidade=1.0,
+                   resistencia_serie=0.0,
+                   resistencia_shunt=np.inf,
+                   tensao_min: float = 0.0,
+                   tensao_max: float = 1.2,
+                   num_pontos_tensao: int = 400,
+                   metodo: str = "lambertw",
+                   max_elementos_bloco: int = 2 ** 20,
+                   saida=None) -> tuple:
+    """
+    Gera as curvas J(V) de um lote de dispositivos de uma só vez.
+
+    Os seis parâmetros do diodo são difundidos (broadcast) para um vetor de
+    N dispositivos; todos compartilham a mesma malha de tensões. O cálculo
+    é feito em blocos de linhas com no máximo `max_elementos_bloco`
+    elementos, o que limita a memória temporária do solver.
+
+    Parâmetros:
+        J_ph, J0 : Correntes fotogerada e de saturação [A/m^2]
+        temperatura_celula : Temperatura da célula [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+        tensao_min, tensao_max : Faixa de tensão [V]
+        num_pontos_tensao : Número de pontos de tensão
+        metodo : "lambertw" ou "newton_vetorizado"
+        max_elementos_bloco : Tamanho máximo de cada bloco (elementos)
+        saida : Matriz (N, num_pontos_tensao) opcional para receber o
+                resultado (ex.: np.memmap para lotes maiores que a RAM)
+
+    Retorna:
+        tensoes_V : array de tensões [V] (num_pontos_tensao,)
+        correntes_J : matriz de densidades de corrente [A/m^2]
+                      (N_dispositivos, num_pontos_tensao); NaN onde o
+                      solver não convergiu
+    """
+    if metodo not in ("lambertw", "newton_vetorizado"):
+        raise ValueError(f"Método desconhecido para lote: {metodo!r}")
+
+    parametros = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in
+          (J_ph, J0, temperatura_celula, fator_idealidade,
+           resistencia_serie, resistencia_shunt))
+    )
+    J_ph, J0, T, n, Rs, Rsh = (p.ravel() for p in parametros)
+    num_dispositivos = J_ph.size
+
+    tensoes_V = np.linspace(tensao_min, tensao_max, num_pontos_tensao)
+    if saida is None:
+        saida = np.empty((num_dispositivos, num_pontos_tensao))
+
+    linhas_bloco = max(1, max_elementos_bloco // num_pontos_tensao)
+    for inicio in range(0, num_dispositivos, linhas_bloco):
+        bloco = slice(inicio, min(inicio + linhas_bloco, num_dispositivos))
+        J_ph_b, J0_b, T_b, n_b, Rs_b, Rsh_b = (
+            x[bloco, None] for x in (J_ph, J0, T, n, Rs, Rsh)
+        )
+        if metodo == "lambertw":
+            saida[bloco] = corrente_diodo_lambertw(
+                tensoes_V, J_ph_b, J0_b, T_b, n_b, Rs_b, Rsh_b
+            )
+        else:
+            correntes_J, _, convergido = _newton_vetorizado(
+                tensoes_V, J_ph_b, J0_b, q / (n_b * k_B * T_b), Rs_b, 1.0 / Rsh_b
+            )
+            saida[bloco] = np.where(convergido, correntes_J, np.nan)
+
+    return tensoes_V, saida
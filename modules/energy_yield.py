@@ -0,0 +1,168 @@
+from itertools import islice
+
+import numpy as np
+from modules.solar import calcular_corrente_fotogerada_limite
+from modules.device import calcular_corrente_saturacao_radiativa
+from modules.analysis import extrair_parametros_modelo
+
+IRRADIANCIA_REFERENCIA = 1000.0   # W/m^2 (condição padrão de teste)
+TEMPERATURA_REFERENCIA = 298.15   # K (25 °C)
+KELVIN = 273.15
+
+
+def ler_csv_clima(caminho,
+                  tamanho_bloco: int = 10_080,
+                  coluna_irradiancia: int = 0,
+                  coluna_temperatura: int = 1,
+                  delimitador: str = ",",
+                  linhas_cabecalho: int = 1):
+    """
+    Lê um arquivo CSV de clima em blocos de tamanho fixo.
+
+    Apenas `tamanho_bloco` linhas ficam em memória por vez; cada bloco é
+    convertido de uma só vez por np.loadtxt.
+
+    Parâmetros:
+        caminho : Arquivo CSV
+        tamanho_bloco : Registros por bloco (padrão: 1 semana a 1 min)
+        coluna_irradiancia : Índice da coluna de irradiância no plano [W/m^2]
+        coluna_temperatura : Índice da coluna de temperatura ambiente [°C]
+        delimitador : Separador de colunas
+        linhas_cabecalho : Linhas a ignorar no início do arquivo
+
+    Produz:
+        dicionários {"irradiancia": array, "temperatura_ambiente": array}
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        for _ in range(linhas_cabecalho):
+            next(arquivo, None)
+        while True:
+            linhas = list(islice(arquivo, tamanho_bloco))
+            if not linhas:
+                return
+            dados = np.loadtxt(linhas, delimiter=delimitador, ndmin=2,
+                               usecols=(coluna_irradiancia, coluna_temperatura))
+            yield {"irradiancia": dados[:, 0], "temperatura_ambiente": dados[:, 1]}
+
+
+def ler_binario_clima(caminho, tamanho_bloco: int = 10_080):
+    """
+    Lê registros de clima de um arquivo .npy float64 com forma (N, 2)
+    (irradiância [W/m^2], temperatura ambiente [°C]) por memória mapeada,
+    copiando um bloco de cada vez.
+
+    Produz:
+        dicionários {"irradiancia": array, "temperatura_ambiente": array}
+    """
+    dados = np.load(caminho, mmap_mode="r")
+    if dados.ndim != 2 or dados.shape[1] < 2:
+        raise ValueError(f"Formato de clima inválido em {caminho}: {dados.shape}")
+    for inicio in range(0, dados.shape[0], tamanho_bloco):
+        bloco = np.array(dados[inicio:inicio + tamanho_bloco, :2], dtype=float)
+        yield {"irradiancia": bloco[:, 0], "temperatura_ambiente": bloco[:, 1]}
+
+
+def temperatura_celula_noct(irradiancia, temperatura_ambiente_C, noct: float = 45.0):
+    """
+    Temperatura da célula pelo modelo NOCT [K]:
+    T_cel = T_amb + (NOCT - 20) / 800 · G
+    """
+    return temperatura_ambiente_C + KELVIN + (noct - 20.0) / 800.0 * irradiancia
+
+
+def simular_producao(blocos,
+                     energia_gap_eV: float = 1.12,
+                     fator_idealidade: float = 1.0,
+                     resistencia_serie: float = 0.0,
+                     resistencia_shunt: float = np.inf,
+                     area_m2: float = 1.0,
+                     passo_horas: float = 1.0,
+                     noct: float = 45.0,
+                     temperatura_sol: float = 5778.0) -> dict:
+    """
+    Simula a produção de energia a partir de registros de clima em blocos
+    (ex.: ler_csv_clima, ler_binario_clima ou o gerador de céu claro).
+
+    Para cada bloco, de forma vetorizada: J_ph é escalado pela irradiância
+    (J_ph(G) = J_ph,ref · G / 1000), a temperatura da célula vem do modelo
+    NOCT, J0 é recalculado nessa temperatura e o ponto de operação é o de
+    máxima potência (extrair_parametros_modelo). Só os acumuladores
+    permanecem entre blocos, então a memória não cresce com o arquivo.
+
+    As perdas são decompostas em cascata, sempre em relação à potência
+    anterior:
+        irradiancia  : η_ideal(STC) · G  →  diodo ideal a 25 °C sob G
+        temperatura  : diodo ideal a 25 °C  →  diodo ideal a T_cel
+        resistiva    : diodo ideal a T_cel  →  diodo com Rs/Rsh a T_cel
+
+    Parâmetros:
+        blocos : Iterável de dicionários com "irradiancia" [W/m^2] e
+                 "temperatura_ambiente" [°C]
+        energia_gap_eV : Energia de gap [eV]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+        area_m2 : Área ativa [m^2]
+        passo_horas : Duração de cada registro [h] (1/60 para dados por minuto)
+        noct : Temperatura nominal de operação da célula [°C]
+        temperatura_sol : Temperatura do Sol para J_ph de referência [K]
+
+    Retorna:
+        dicionário com energia produzida e incidente [kWh], perdas [kWh],
+        razão de desempenho, número de registros e horas simuladas
+    """
+    J_ph_ref = calcular_corrente_fotogerada_limite(
+        energia_gap_eV, temperatura_sol, integrador="analitico"
+    )
+    J0_ref = calcular_corrente_saturacao_radiativa(
+        energia_gap_eV, TEMPERATURA_REFERENCIA, integrador="analitico"
+    )
+    eficiencia_ideal_stc = extrair_parametros_modelo(
+        J_ph_ref, J0_ref, TEMPERATURA_REFERENCIA, fator_idealidade
+    )["Eficiencia"]
+
+    kwh = area_m2 * passo_horas / 1000.0   # (W/m^2) → kWh por registro
+    totais = {
+        "energia_kWh": 0.0,
+        "energia_incidente_kWh": 0.0,
+        "perda_irradiancia_kWh": 0.0,
+        "perda_temperatura_kWh": 0.0,
+        "perda_resistiva_kWh": 0.0,
+    }
+    num_registros = 0
+
+    for bloco in blocos:
+        G = np.asarray(bloco["irradiancia"], dtype=float)
+        T_amb = np.asarray(bloco["temperatura_ambiente"], dtype=float)
+        num_registros += G.size
+
+        dia = G > 0
+        G = G[dia]
+        if G.size == 0:
+            continue
+        T_cel = temperatura_celula_noct(G, T_amb[dia], noct)
+
+        J_ph = J_ph_ref * G / IRRADIANCIA_REFERENCIA
+        J0 = calcular_corrente_saturacao_radiativa(energia_gap_eV, T_cel, integrador="analitico")
+
+        P_linear = eficiencia_ideal_stc * G
+        P_ideal_25 = extrair_parametros_modelo(
+            J_ph, J0_ref, TEMPERATURA_REFERENCIA, fator_idealidade)["P_max"]
+        P_ideal = extrair_parametros_modelo(J_ph, J0, T_cel, fator_idealidade)["P_max"]
+        P_real = extrair_parametros_modelo(
+            J_ph, J0, T_cel, fator_idealidade,
+            resistencia_serie, resistencia_shunt)["P_max"]
+        P_real = np.maximum(P_real, 0.0)
+
+        totais["energia_kWh"] += P_real.sum() * kwh
+        totais["energia_incidente_kWh"] += G.sum() * kwh
+        totais["perda_irradiancia_kWh"] += (P_linear - P_ideal_25).sum() * kwh
+        totais["perda_temperatura_kWh"] += (P_ideal_25 - P_ideal).sum() * kwh
+        totais["perda_resistiva_kWh"] += (P_ideal - P_real).sum() * kwh
+
+    energia_referencia = eficiencia_ideal_stc * totais["energia_incidente_kWh"]
+    totais["razao_desempenho"] = (totais["energia_kWh"] / energia_referencia
+                                  if energia_referencia > 0 else 0.0)
+    totais["num_registros"] = num_registros
+    totais["horas"] = num_registros * passo_horas
+    return totais
@@ -0,0 +1,309 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from modules.constants import k_B, q
+from modules.device import corrente_diodo_lambertw
+
+# Ordem dos parâmetros ajustados: θ = (J_ph, ln J0, n, Rs, G_sh = 1/Rsh)
+NUM_PARAMETROS = 5
+LIMITES_INFERIORES = np.array([-np.inf, -np.inf, 0.3, 0.0, 0.0])
+LIMITES_SUPERIORES = np.array([np.inf, np.inf, 10.0, np.inf, np.inf])
+LIMITE_EXPOENTE_JACOBIANO = 700.0
+# Um ajuste em que λ explodiu só conta como convergido se estiver num ponto
+# estacionário: cosseno entre o resíduo e cada coluna do jacobiano abaixo de
+# TOLERANCIA_GRADIENTE, ou resíduo no nível do arredondamento de J
+TOLERANCIA_GRADIENTE = 1e-6
+
+GRANDEZAS_AJUSTE = ("J_ph", "J0", "fator_idealidade", "resistencia_serie",
+                    "resistencia_shunt", "Residuo_RMS", "Residuo_Max",
+                    "Iteracoes", "Convergido", "Estagnado")
+
+
+def modelo_e_jacobiano(tensoes_V, theta, temperatura_celula):
+    """
+    Avalia o modelo de um diodo e o jacobiano analítico dJ/dθ.
+
+    J(V) vem da forma explícita de Lambert W; as derivadas saem da
+    diferenciação implícita de f(J, V, θ) = 0:
+
+      f = J_ph - J0 (e^u - 1) - (V + J Rs) G_sh - J,   u = q (V + J Rs) / (n k_B T)
+      dJ/dθ = -(∂f/∂θ) / (∂f/∂J)
+
+    Parâmetros:
+        tensoes_V : Tensões [V] (N_curvas, N_pontos)
+        theta : Parâmetros (N_curvas, 5) na ordem (J_ph, ln J0, n, Rs, G_sh)
+        temperatura_celula : Temperatura [K] (escalar ou (N_curvas,))
+
+    Retorna:
+        correntes_J : (N_curvas, N_pontos) [A/m^2]
+        jacobiano : (N_curvas, N_pontos, 5)
+    """
+    J_ph, log_J0, n, Rs, G_sh = (theta[:, i, None] for i in range(NUM_PARAMETROS))
+    T = np.asarray(temperatura_celula, dtype=float)
+    if T.ndim:
+        T = T[:, None]
+    J0 = np.exp(log_J0)
+
+    with np.errstate(divide="ignore"):
+        Rsh = np.where(G_sh > 0, 1.0 / G_sh, np.inf)
+    J = corrente_diodo_lambertw(tensoes_V, J_ph, J0, T, n, Rs, Rsh)
+
+    a = q / (n * k_B * T)
+    tensao_juncao = tensoes_V + J * Rs
+    u = a * tensao_juncao
+    termo_exp = np.exp(np.minimum(log_J0 + u, LIMITE_EXPOENTE_JACOBIANO))  # J0 e^u
+
+    dfdJ = -(termo_exp * a * Rs + Rs * G_sh + 1.0)
+    dfdtheta = (
+        np.ones_like(J),
+        -(termo_exp - J0),
+        termo_exp * u / n,
+        -(termo_exp * a + G_sh) * J,
+        -tensao_juncao,
+    )
+    jacobiano = np.stack([-d / dfdJ for d in dfdtheta], axis=-1)
+    return J, jacobiano
+
+
+def estimar_parametros_iniciais(tensoes_V, correntes_J, temperatura_celula=300.0):
+    """
+    Palpite inicial a partir dos pontos-chave da curva medida, no mesmo
+    espírito de extrair_parametros:
+
+      - J_sc e G_sh pela reta dos primeiros pontos (região de curto);
+      - V_oc pela interpolação linear da troca de sinal de J;
+      - n pela razão das correntes de diodo em V_mp e V_oc;
+      - Rs pela inclinação em V_oc menos a parcela do diodo, n k_B T / (q J_d);
+      - J0 = J_d(V_oc) · exp(-q V_oc / (n k_B T)).
+
+    As curvas devem ter tensões crescentes em cada linha; pontos ausentes
+    são NaN no fim da linha.
+
+    Retorna:
+        theta : (N_curvas, 5) na ordem (J_ph, ln J0, n, Rs, G_sh)
+    """
+    V = np.atleast_2d(tensoes_V)
+    J = np.atleast_2d(correntes_J)
+    V = np.broadcast_to(V, J.shape)
+    num_curvas, num_pontos = J.shape
+    linhas = np.arange(num_curvas)
+    tensao_termica = k_B * np.asarray(temperatura_celula, dtype=float) / q
+    validos = np.isfinite(V) & np.isfinite(J)
+
+    # Reta dos primeiros pontos: J ≈ J_sc - G_sh V
+    k = max(3, num_pontos // 10)
+    Vk, Jk = V[:, :k], J[:, :k]
+    Vm, Jm = Vk.mean(axis=1), Jk.mean(axis=1)
+    inclinacao = (((Vk - Vm[:, None]) * (Jk - Jm[:, None])).sum(axis=1)
+                  / ((Vk - Vm[:, None]) ** 2).sum(axis=1))
+    G_sh = np.maximum(-inclinacao, 0.0)
+    J_sc = Jm - inclinacao * Vm
+
+    # Troca de sinal de J (ou extrapolação pelos dois últimos pontos válidos)
+    ultimo = validos.sum(axis=1) - 1
+    negativo = (J <= 0) & validos
+    cruza = negativo.any(axis=1)
+    i2 = np.where(cruza, np.argmax(negativo, axis=1), ultimo)
+    i2 = np.maximum(i2, 1)
+    i1 = i2 - 1
+    V1, V2, J1, J2 = V[linhas, i1], V[linhas, i2], J[linhas, i1], J[linhas, i2]
+    inclinacao_oc = (J2 - J1) / (V2 - V1)
+    V_oc = V1 - J1 / inclinacao_oc
+
+    # Ponto de máxima potência
+    potencias = np.where(validos, V * J, -np.inf)
+    i_mp = np.argmax(potencias, axis=1)
+    V_mp, J_mp = V[linhas, i_mp], J[linhas, i_mp]
+
+    J_diodo_oc = np.maximum(J_sc - V_oc * G_sh, 1e-30)
+    Rs = np.zeros(num_curvas)
+    # n e Rs dependem um do outro (Rs desloca a tensão de junção em V_mp):
+    # poucas substituições sucessivas bastam para um palpite
+    for _ in range(5):
+        V_juncao_mp = V_mp + J_mp * Rs
+        J_diodo_mp = np.clip(J_sc - J_mp - V_juncao_mp * G_sh, 1e-30,
+                             J_diodo_oc * (1 - 1e-9))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = (V_oc - V_juncao_mp) / (tensao_termica * np.log(J_diodo_oc / J_diodo_mp))
+            n = np.clip(np.nan_to_num(n, nan=1.0), 0.8, 3.0)
+            Rs = -1.0 / inclinacao_oc - n * tensao_termica / J_diodo_oc
+        Rs = np.clip(np.nan_to_num(Rs, nan=0.0, posinf=0.0, neginf=0.0), 0.0, None)
+    log_J0 = np.log(J_diodo_oc) - V_oc / (n * tensao_termica)
+
+    return np.stack([J_sc, log_J0, n, Rs, G_sh], axis=-1)
+
+
+def _projetar_limites(theta):
+    """Mantém n na faixa física e Rs, G_sh não negativos."""
+    return np.clip(theta, LIMITES_INFERIORES, LIMITES_SUPERIORES)
+
+
+def _avaliar(V, J_medido, validos, theta, T):
+    J_modelo, jacobiano = modelo_e_jacobiano(V, theta, T)
+    residuo = np.where(validos, J_modelo - J_medido, 0.0)
+    jacobiano = np.where(validos[..., None], jacobiano, 0.0)
+    custo = np.einsum("mp,mp->m", residuo, residuo)
+    custo = np.where(np.isfinite(custo), custo, np.inf)
+    return residuo, jacobiano, custo
+
+
+def _ajustar_bloco(tarefa):
+    """
+    Levenberg–Marquardt em lote (escala de Marquardt, diag(JᵀJ)): cada
+    curva tem o próprio λ e critério de parada; as equações normais 5×5 de
+    todas as curvas ativas são resolvidas juntas. Função de nível de módulo
+    para poder ser enviada a processos.
+    """
+    V, J_medido, T, theta, max_iteracoes, tolerancia = tarefa
+    V = np.broadcast_to(V, J_medido.shape)
+    validos = np.isfinite(V) & np.isfinite(J_medido)
+    V = np.where(validos, V, 0.0)
+    num_curvas = J_medido.shape[0]
+    T = np.broadcast_to(np.asarray(T, dtype=float), (num_curvas,))
+
+    theta = _projetar_limites(theta.copy())
+    residuo, jacobiano, custo = _avaliar(V, J_medido, validos, theta, T)
+    amortecimento = np.full(num_curvas, 1e-3)
+    iteracoes = np.zeros(num_curvas, dtype=int)
+    convergido = np.zeros(num_curvas, dtype=bool)
+    estagnado = np.zeros(num_curvas, dtype=bool)
+    ativos = np.arange(num_curvas)
+
+    for _ in range(max_iteracoes):
+        if ativos.size == 0:
+            break
+        iteracoes[ativos] += 1
+        Jac = jacobiano[ativos]
+        A = np.einsum("mpi,mpj->mij", Jac, Jac)
+        g = np.einsum("mpi,mp->mi", Jac, residuo[ativos])
+        # Parâmetros presos num limite com o gradiente apontando para fora
+        # saem do sistema nesta iteração (conjunto ativo)
+        presos = (((theta[ativos] <= LIMITES_INFERIORES) & (g > 0))
+                  | ((theta[ativos] >= LIMITES_SUPERIORES) & (g < 0)))
+        livres = ~presos
+        A = A * (livres[:, :, None] & livres[:, None, :]) + presos[:, :, None] * np.eye(NUM_PARAMETROS)
+        g = np.where(presos, 0.0, g)
+        diagonal = np.diagonal(A, axis1=1, axis2=2)
+        escala = diagonal + 1e-12 * diagonal.max(axis=1, keepdims=True) + 1e-300
+        A_amortecida = A + amortecimento[ativos, None, None] * (
+            escala[:, :, None] * np.eye(NUM_PARAMETROS))
+        try:
+            passo = -np.linalg.solve(A_amortecida, g[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            passo = -np.stack([np.linalg.lstsq(a, b, rcond=None)[0]
+                               for a, b in zip(A_amortecida, g)])
+
+        theta_novo = _projetar_limites(theta[ativos] + passo)
+        r_novo, jac_novo, custo_novo = _avaliar(
+            V[ativos], J_medido[ativos], validos[ativos], theta_novo, T[ativos])
+
+        aceito = custo_novo < custo[ativos]
+        reducao = np.where(aceito, custo[ativos] - custo_novo, 0.0)
+        idx = ativos[aceito]
+        theta[idx] = theta_novo[aceito]
+        residuo[idx] = r_novo[aceito]
+        jacobiano[idx] = jac_novo[aceito]
+        custo_anterior = custo[ativos]
+        custo[idx] = custo_novo[aceito]
+        amortecimento[ativos] = np.where(aceito, amortecimento[ativos] / 3.0,
+                                         amortecimento[ativos] * 4.0)
+
+        # Parada: redução relativa pequena após um passo aceito, ou λ tão
+        # grande que nenhum passo reduz o custo. O segundo caso é convergência
+        # só num ponto estacionário (mínimo em precisão de máquina); fora
+        # dele o ajuste fica marcado como estagnado
+        pequeno = aceito & (reducao <= tolerancia * custo_anterior)
+        travado = ~pequeno & (amortecimento[ativos] > 1e12)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cosseno = np.abs(g) / np.sqrt(diagonal * custo_anterior[:, None])
+        escala_J = np.abs(np.where(validos[ativos], J_medido[ativos], 0.0)).max(axis=1)
+        estacionario = ((np.nan_to_num(cosseno, nan=0.0).max(axis=1) <= TOLERANCIA_GRADIENTE)
+                        | (custo_anterior <= validos[ativos].sum(axis=1)
+                           * (1e3 * np.finfo(float).eps * escala_J) ** 2))
+        convergido[ativos[pequeno | (travado & estacionario)]] = True
+        estagnado[ativos[travado & ~estacionario]] = True
+        ativos = ativos[~(pequeno | travado)]
+
+    num_validos = np.maximum(validos.sum(axis=1), 1)
+    G_sh = theta[:, 4]
+    with np.errstate(divide="ignore"):
+        Rsh = np.where(G_sh > 0, 1.0 / G_sh, np.inf)
+    return {
+        "J_ph": theta[:, 0],
+        "J0": np.exp(theta[:, 1]),
+        "fator_idealidade": theta[:, 2],
+        "resistencia_serie": theta[:, 3],
+        "resistencia_shunt": Rsh,
+        "Residuo_RMS": np.sqrt(custo / num_validos),
+        "Residuo_Max": np.abs(residuo).max(axis=1),
+        "Iteracoes": iteracoes,
+        "Convergido": convergido & np.isfinite(custo),
+        "Estagnado": estagnado,
+    }
+
+
+def ajustar_curvas_JV(tensoes_V,
+                      correntes_J,
+                      temperatura_celula=300.0,
+                      parametros_iniciais=None,
+                      max_iteracoes: int = 100,
+                      tolerancia: float = 1e-10,
+                      num_processos: int = 1,
+                      curvas_por_bloco: int = 2000) -> dict:
+    """
+    Ajusta o modelo de um diodo (J_ph, J0, n, Rs, Rsh) a curvas J-V medidas.
+
+    Mínimos quadrados em J com Levenberg–Marquardt e jacobiano analítico
+    (ver modelo_e_jacobiano), em lote sobre todas as curvas de cada bloco;
+    os blocos podem ser distribuídos entre processos. J0 é ajustado em
+    escala logarítmica e Rsh pela condutância G_sh = 1/Rsh (G_sh = 0 é
+    shunt infinito).
+
+    Parâmetros:
+        tensoes_V : Tensões [V], (N_pontos,) comum a todas as curvas ou
+                    (N_curvas, N_pontos) crescentes por linha (NaN no fim
+                    para curvas mais curtas)
+        correntes_J : Densidades de corrente medidas [A/m^2]
+                      (N_curvas, N_pontos)
+        temperatura_celula : Temperatura [K] (escalar ou por curva)
+        parametros_iniciais : θ inicial (N_curvas, 5); padrão
+                              estimar_parametros_iniciais
+        max_iteracoes : Máximo de iterações de LM por curva
+        tolerancia : Redução relativa do custo que encerra o ajuste
+        num_processos : Processos (None = os.cpu_count(); 1 = processo atual)
+        curvas_por_bloco : Curvas por bloco de trabalho
+
+    Retorna:
+        dicionário com arrays (N_curvas,) para cada chave de
+        GRANDEZAS_AJUSTE: parâmetros ajustados, resíduo RMS e máximo
+        [A/m^2], número de iterações, indicador de convergência e
+        Estagnado (λ explodiu fora de um ponto estacionário; essas curvas
+        não contam como convergidas)
+    """
+    J = np.atleast_2d(np.asarray(correntes_J, dtype=float))
+    V = np.asarray(tensoes_V, dtype=float)
+    num_curvas = J.shape[0]
+    T = np.broadcast_to(np.asarray(temperatura_celula, dtype=float), (num_curvas,))
+    if parametros_iniciais is None:
+        theta = estimar_parametros_iniciais(V, J, T)
+    else:
+        theta = np.array(parametros_iniciais, dtype=float).reshape(num_curvas, NUM_PARAMETROS)
+
+    tarefas = []
+    for inicio in range(0, num_curvas, curvas_por_bloco):
+        fatia = slice(inicio, inicio + curvas_por_bloco)
+        tarefas.append((V if V.ndim == 1 else V[fatia], J[fatia], T[fatia],
+                        theta[fatia], max_iteracoes, tolerancia))
+
+    if num_processos is None:
+        num_processos = os.cpu_count() or 1
+    num_processos = min(num_processos, len(tarefas))
+
+    if num_processos <= 1:
+        parciais = list(map(_ajustar_bloco, tarefas))
+    else:
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            parciais = list(executor.map(_ajustar_bloco, tarefas))
+
+    return {chave: np.concatenate([p[chave] for p in parciais]) for chave in GRANDEZAS_AJUSTE}
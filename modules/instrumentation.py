@@ -0,0 +1,164 @@
+import contextlib
+import json
+import time
+
+import numpy as np
+
+# Relatório ativo; None = instrumentação desligada. Os pontos instrumentados
+# só consultam este nome, então o custo com a instrumentação desligada é uma
+# leitura de atributo por chamada.
+ATIVO = None
+
+
+class RelatorioInstrumentacao:
+    """
+    Relatório estruturado de uma execução instrumentada.
+
+    Atributos:
+        etapas : lista de intervalos {"nome", "inicio_s", "duracao_s",
+                 "profundidade"}, com inicio_s relativo à criação do
+                 relatório e profundidade = aninhamento
+        curvas : um registro por chamada de curva_JV_diodo, com método,
+                 número de pontos, iterações de Newton por ponto, pontos
+                 não convergidos e eventos de limite do expoente
+        eventos_limite : total de avaliações do resíduo do diodo em que o
+                         expoente foi limitado (±LIMITE_EXPOENTE no laço
+                         "newton", LIMITE_LOG_DIODO no vetorizado), somados
+                         sobre as curvas registradas; curvas_JV_lote não
+                         registra curvas e não entra na conta
+    """
+
+    def __init__(self):
+        self._origem = time.perf_counter()
+        self._profundidade = 0
+        self.etapas = []
+        self.curvas = []
+        self.eventos_limite = 0
+
+    @contextlib.contextmanager
+    def etapa(self, nome: str):
+        """Mede o tempo de parede do bloco como uma etapa do relatório."""
+        inicio = time.perf_counter()
+        self._profundidade += 1
+        try:
+            yield
+        finally:
+            self._profundidade -= 1
+            self.etapas.append({
+                "nome": nome,
+                "inicio_s": inicio - self._origem,
+                "duracao_s": time.perf_counter() - inicio,
+                "profundidade": self._profundidade,
+            })
+
+    def registrar_curva(self, metodo, tensoes_V, correntes_J, iteracoes=None,
+                        convergido=None, eventos_limite=0):
+        """
+        Registra uma curva J-V resolvida.
+
+        Parâmetros:
+            metodo : Solver usado
+            tensoes_V, correntes_J : Curva resolvida
+            iteracoes : Iterações de Newton por ponto (None para "lambertw")
+            convergido : Máscara de convergência por ponto (None = todos)
+            eventos_limite : Eventos de limite do expoente durante a curva
+        """
+        tensoes_V = np.asarray(tensoes_V, dtype=float)
+        correntes_J = np.asarray(correntes_J, dtype=float)
+        if convergido is None:
+            convergido = np.ones(tensoes_V.shape, dtype=bool)
+        nao_convergidos = np.flatnonzero(~np.asarray(convergido))
+
+        registro = {
+            "metodo": metodo,
+            "num_pontos": int(tensoes_V.size),
+            "iteracoes_por_ponto": None,
+            "iteracoes_total": 0,
+            "iteracoes_max": 0,
+            "nao_convergidos": [
+                {"indice": int(i), "tensao_V": float(tensoes_V[i]),
+                 "corrente_J": float(correntes_J[i])}
+                for i in nao_convergidos
+            ],
+            "eventos_limite": int(eventos_limite),
+        }
+        if iteracoes is not None:
+            iteracoes = np.asarray(iteracoes, dtype=int)
+            registro["iteracoes_por_ponto"] = iteracoes.tolist()
+            registro["iteracoes_total"] = int(iteracoes.sum())
+            registro["iteracoes_max"] = int(iteracoes.max(initial=0))
+        self.curvas.append(registro)
+
+    def tempos_por_etapa(self) -> dict:
+        """Tempo total [s] e número de chamadas de cada etapa, pelo nome."""
+        tempos = {}
+        for intervalo in self.etapas:
+            total = tempos.setdefault(intervalo["nome"], {"chamadas": 0, "tempo_total_s": 0.0})
+            total["chamadas"] += 1
+            total["tempo_total_s"] += intervalo["duracao_s"]
+        return tempos
+
+    def para_dict(self) -> dict:
+        return {
+            "etapas": list(self.etapas),
+            "tempos_por_etapa": self.tempos_por_etapa(),
+            "curvas": list(self.curvas),
+            "eventos_limite": self.eventos_limite,
+            "total_nao_convergidos": sum(len(c["nao_convergidos"]) for c in self.curvas),
+        }
+
+    def para_json(self, caminho=None, indent: int = 2) -> str:
+        """Relatório em JSON; grava também em `caminho`, se fornecido."""
+        texto = json.dumps(self.para_dict(), indent=indent, ensure_ascii=False)
+        if caminho is not None:
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.write(texto)
+        return texto
+
+    def resumo(self) -> str:
+        """Resumo legível: tempo por etapa e diagnóstico de cada curva."""
+        linhas = []
+        for nome, total in self.tempos_por_etapa().items():
+            linhas.append(f"{nome:20s} {total['tempo_total_s'] * 1e3:10.3f} ms"
+                          f"  ({total['chamadas']} chamada(s))")
+        for i, curva in enumerate(self.curvas):
+            linhas.append(
+                f"curva {i} [{curva['metodo']}]: {curva['num_pontos']} pontos, "
+                f"{curva['iteracoes_total']} iterações (máx. {curva['iteracoes_max']}), "
+                f"{len(curva['nao_convergidos'])} não convergido(s), "
+                f"{curva['eventos_limite']} limite(s) do expoente"
+            )
+        return "\n".join(linhas)
+
+
+@contextlib.contextmanager
+def instrumentar():
+    """
+    Liga a instrumentação dentro do bloco e fornece o relatório.
+
+    Exemplo:
+        with instrumentar() as relatorio:
+            Simulacao(resistencia_serie=0.5).obter("resultados")
+        print(relatorio.resumo())
+        relatorio.para_json("relatorio.json")
+    """
+    global ATIVO
+    anterior = ATIVO
+    ATIVO = relatorio = RelatorioInstrumentacao()
+    try:
+        yield relatorio
+    finally:
+        ATIVO = anterior
+
+
+_SEM_ETAPA = contextlib.nullcontext()
+
+
+def etapa(nome: str):
+    """
+    Intervalo nomeado no relatório ativo; sem efeito (e sem custo além de
+    uma chamada) quando a instrumentação está desligada.
+    """
+    if ATIVO is None:
+        return _SEM_ETAPA
+    return ATIVO.etapa(nome)
@@ -0,0 +1,231 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from modules.solar import calcular_corrente_fotogerada_limite, INTEGRADORES
+from modules.device import calcular_corrente_saturacao_radiativa
+from modules.analysis import extrair_parametros_modelo
+from modules.sweep import PARAMETROS_VARREDURA, avaliar_por_par_distinto
+
+# Faixas padrão dos histogramas (mín, máx, número de classes)
+FAIXAS_HISTOGRAMA = {
+    "Eficiencia": (0.0, 1.0, 400),
+    "FF": (0.0, 1.0, 200),
+    "V_oc_numerico": (0.0, 2.5, 250),
+    "J_sc": (0.0, 2000.0, 400),
+    "P_max": (0.0, 1000.0, 400),
+}
+
+
+class EstatisticasStreaming:
+    """
+    Estatísticas de uma grandeza acumuladas em fluxo, sem guardar amostras:
+    contagem, média e variância (Welford/Chan, combináveis entre processos),
+    mínimo, máximo e histograma de classes fixas, do qual saem os quantis.
+    """
+
+    def __init__(self, minimo_histograma: float, maximo_histograma: float, num_classes: int = 200):
+        self.bordas = np.linspace(minimo_histograma, maximo_histograma, num_classes + 1)
+        self.histograma = np.zeros(num_classes, dtype=np.int64)
+        self.abaixo = 0             # Amostras abaixo/acima da faixa do histograma
+        self.acima = 0
+        self.invalidas = 0          # Amostras não finitas (descartadas)
+        self.contagem = 0
+        self.media = 0.0
+        self.m2 = 0.0               # Soma dos quadrados dos desvios
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def acumular(self, valores):
+        """Incorpora um lote de amostras."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        finitos = np.isfinite(valores)
+        self.invalidas += int(valores.size - finitos.sum())
+        valores = valores[finitos]
+        if valores.size == 0:
+            return
+
+        lote = EstatisticasStreaming.__new__(EstatisticasStreaming)
+        lote.contagem = valores.size
+        lote.media = float(valores.mean())
+        lote.m2 = float(((valores - lote.media) ** 2).sum())
+        self._combinar_momentos(lote)
+
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+        self.histograma += np.histogram(valores, bins=self.bordas)[0]
+        self.abaixo += int((valores < self.bordas[0]).sum())
+        self.acima += int((valores > self.bordas[-1]).sum())
+
+    def _combinar_momentos(self, outra):
+        total = self.contagem + outra.contagem
+        delta = outra.media - self.media
+        self.media += delta * outra.contagem / total
+        self.m2 += outra.m2 + delta ** 2 * self.contagem * outra.contagem / total
+        self.contagem = total
+
+    def combinar(self, outra):
+        """Incorpora as estatísticas de outro acumulador (mesmas classes)."""
+        if outra.contagem:
+            self._combinar_momentos(outra)
+        self.invalidas += outra.invalidas
+        self.minimo = min(self.minimo, outra.minimo)
+        self.maximo = max(self.maximo, outra.maximo)
+        self.histograma += outra.histograma
+        self.abaixo += outra.abaixo
+        self.acima += outra.acima
+
+    @property
+    def variancia(self):
+        return self.m2 / (self.contagem - 1) if self.contagem > 1 else 0.0
+
+    def quantis(self, probabilidades):
+        """
+        Quantis estimados pelo histograma (interpolação linear dentro da
+        classe); a resolução é a largura de uma classe.
+        """
+        acumulado = np.concatenate([[self.abaixo], self.abaixo + np.cumsum(self.histograma)])
+        alvo = np.asarray(probabilidades, dtype=float) * self.contagem
+        return np.interp(alvo, acumulado, self.bordas)
+
+    def resumo(self) -> dict:
+        """Dicionário com contagem, média, desvio padrão, extremos e quantis."""
+        q05, q25, q50, q75, q95 = self.quantis([0.05, 0.25, 0.5, 0.75, 0.95])
+        return {
+            "contagem": self.contagem,
+            "invalidas": self.invalidas,
+            "media": self.media,
+            "desvio_padrao": float(np.sqrt(self.variancia)),
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+            "q05": q05, "q25": q25, "mediana": q50, "q75": q75, "q95": q95,
+        }
+
+
+def amostrar_distribuicao(gerador, especificacao, tamanho: int):
+    """
+    Sorteia `tamanho` valores de uma especificação de distribuição:
+        valor numérico            → constante
+        ("normal", media, desvio)
+        ("uniforme", minimo, maximo)
+        ("lognormal", mu, sigma)  → parâmetros do logaritmo natural
+        ("normal_truncada", media, desvio, minimo, maximo)
+    """
+    if np.isscalar(especificacao):
+        return np.full(tamanho, float(especificacao))
+
+    tipo, *args = especificacao
+    if tipo == "normal":
+        return gerador.normal(args[0], args[1], tamanho)
+    if tipo == "uniforme":
+        return gerador.uniform(args[0], args[1], tamanho)
+    if tipo == "lognormal":
+        return gerador.lognormal(args[0], args[1], tamanho)
+    if tipo == "normal_truncada":
+        return np.clip(gerador.normal(args[0], args[1], tamanho), args[2], args[3])
+    raise ValueError(f"Distribuição desconhecida: {tipo!r}")
+
+
+def _executar_tarefa(tarefa):
+    """
+    Processa uma tarefa Monte Carlo (função de módulo, enviada a processos):
+    sorteia as amostras em lotes vetorizados com o gerador próprio da
+    tarefa e devolve apenas os acumuladores.
+    """
+    semente, num_amostras, tamanho_lote, distribuicoes, faixas, integrador = tarefa
+    gerador = np.random.default_rng(semente)
+    estatisticas = {nome: EstatisticasStreaming(*faixa) for nome, faixa in faixas.items()}
+
+    for inicio in range(0, num_amostras, tamanho_lote):
+        tamanho = min(tamanho_lote, num_amostras - inicio)
+        amostras = {nome: amostrar_distribuicao(gerador, distribuicoes.get(nome, padrao), tamanho)
+                    for nome, padrao in PARAMETROS_VARREDURA.items()}
+
+        J_ph = avaliar_por_par_distinto(calcular_corrente_fotogerada_limite,
+                                        amostras["energia_gap_eV"], amostras["temperatura_sol"],
+                                        tamanho, integrador)
+        J0 = avaliar_por_par_distinto(calcular_corrente_saturacao_radiativa,
+                                      amostras["energia_gap_eV"], amostras["temperatura_celula"],
+                                      tamanho, integrador)
+        resultados = extrair_parametros_modelo(
+            J_ph, J0,
+            amostras["temperatura_celula"],
+            amostras["fator_idealidade"],
+            amostras["resistencia_serie"],
+            amostras["resistencia_shunt"],
+        )
+        for nome, acumulador in estatisticas.items():
+            acumulador.acumular(resultados[nome])
+
+    return estatisticas
+
+
+def simular_monte_carlo(distribuicoes: dict,
+                        num_amostras: int,
+                        semente: int = 0,
+                        num_processos: int = None,
+                        amostras_por_tarefa: int = 1_000_000,
+                        tamanho_lote: int = 100_000,
+                        faixas_histograma: dict = None,
+                        integrador: str = "trapezio") -> dict:
+    """
+    Simulação Monte Carlo da variabilidade de fabricação.
+
+    Os parâmetros (chaves de PARAMETROS_VARREDURA: Eg, T_célula, T_sol, n,
+    Rs, Rsh) são sorteados das distribuições dadas (ver
+    amostrar_distribuicao; os ausentes ficam no valor padrão) e passam pelo
+    pipeline J_ph → J0 → extrair_parametros_modelo em lotes vetorizados.
+
+    O trabalho é dividido em tarefas de `amostras_por_tarefa` amostras, cada
+    uma com um fluxo aleatório independente (SeedSequence(semente).spawn),
+    distribuídas num pool de processos. Como a divisão não depende do
+    número de processos, o resultado é reprodutível para uma dada semente.
+    Nenhuma amostra é guardada: só os acumuladores EstatisticasStreaming.
+
+    Parâmetros:
+        distribuicoes : {parâmetro: especificação de distribuição}
+        num_amostras : Número total de amostras
+        semente : Semente da SeedSequence raiz
+        num_processos : Processos (None = os.cpu_count(); 1 = processo atual)
+        amostras_por_tarefa : Amostras por tarefa (e por fluxo aleatório)
+        tamanho_lote : Amostras por lote vetorizado dentro da tarefa
+        faixas_histograma : {grandeza: (mín, máx, classes)}; padrão
+                            FAIXAS_HISTOGRAMA
+        integrador : Integrador de J_ph e J0, como em mapa_eficiencia
+                     (padrão: o da CLI; "analitico" é muito mais rápido
+                     quando Eg ou as temperaturas variam)
+
+    Retorna:
+        dicionário {grandeza: EstatisticasStreaming}
+    """
+    desconhecidos = set(distribuicoes) - set(PARAMETROS_VARREDURA)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(desconhecidos)}")
+    if integrador not in INTEGRADORES:
+        raise ValueError(f"Integrador desconhecido: {integrador!r} (use um de {INTEGRADORES})")
+    faixas = FAIXAS_HISTOGRAMA if faixas_histograma is None else faixas_histograma
+
+    num_tarefas = max(1, -(-num_amostras // amostras_por_tarefa))
+    sementes = np.random.SeedSequence(semente).spawn(num_tarefas)
+    tarefas = [
+        (sementes[i],
+         min(amostras_por_tarefa, num_amostras - i * amostras_por_tarefa),
+         tamanho_lote, distribuicoes, faixas, integrador)
+        for i in range(num_tarefas)
+    ]
+
+    if num_processos is None:
+        num_processos = os.cpu_count() or 1
+    num_processos = min(num_processos, num_tarefas)
+
+    if num_processos <= 1:
+        parciais = list(map(_executar_tarefa, tarefas))
+    else:
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            parciais = list(executor.map(_executar_tarefa, tarefas))
+
+    total = parciais[0]
+    for parcial in parciais[1:]:
+        for nome, acumulador in parcial.items():
+            total[nome].combinar(acumulador)
+    return total
@@ -1,3 +1,7 @@
+import csv
+import sqlite3
+from functools import lru_cache
+
 import numpy as np
 from modules.constants import k_B, q, m_0
 
@@ -17,6 +21,93 @@ SILICON = Material("Silício (Si)", 1.17, 4.73e-4, 636, 1.08, 0.56, 2.8e19, 1.04
 GAAS = Material("Arsenieto de Gálio (GaAs)", 1.519, 5.405e-4, 204, 0.067, 0.45, 4.7e17, 7.0e18)
 PEROVSKITE = Material("Perovskita (MAPI)", 1.6, 4e-4, 300, 0.2, 0.2, 1e19, 1e19) # Valores aproximados
 
+class MaterialTable:
+    """
+    Tabela de materiais em colunas (struct-of-arrays): um array NumPy por
+    parâmetro de Material, uma linha por material. Permite avaliar milhares
+    de candidatos de uma só vez em vez de um objeto Material por vez.
+
+    Exemplo:
+        tabela = MaterialTable.from_csv("candidatos.csv")
+        tabela.band_gap(300.0)          # Eg(300 K) de todas as linhas
+        tabela[0]                       # linha 0 como Material
+    """
+
+    COLUNAS = ("Eg_0", "alpha", "beta", "mn", "mp", "Nc_300", "Nv_300")
+
+    def __init__(self, names, **colunas):
+        faltando = [c for c in self.COLUNAS if c not in colunas]
+        if faltando:
+            raise ValueError(f"Colunas ausentes na tabela de materiais: {faltando}")
+        self.names = np.asarray(names, dtype=str)
+        for coluna in self.COLUNAS:
+            valores = np.asarray(colunas[coluna], dtype=float)
+            if valores.shape != self.names.shape:
+                raise ValueError(f"Coluna {coluna!r} com {valores.size} linhas; "
+                                 f"esperado {self.names.size}")
+            setattr(self, coluna, valores)
+
+    def __len__(self):
+        return self.names.size
+
+    def __getitem__(self, indice):
+        if isinstance(indice, (int, np.integer)):
+            return Material(str(self.names[indice]),
+                            *(float(getattr(self, c)[indice]) for c in self.COLUNAS))
+        return MaterialTable(self.names[indice],
+                             **{c: getattr(self, c)[indice] for c in self.COLUNAS})
+
+    @classmethod
+    def from_materials(cls, materiais):
+        """Tabela com um Material por linha."""
+        materiais = list(materiais)
+        return cls([m.name for m in materiais],
+                   **{c: [getattr(m, c) for m in materiais] for c in cls.COLUNAS})
+
+    @classmethod
+    def from_csv(cls, caminho, delimitador: str = ","):
+        """
+        Lê um CSV com cabeçalho contendo a coluna name e as de COLUNAS
+        (colunas extras são ignoradas).
+        """
+        with open(caminho, encoding="utf-8", newline="") as arquivo:
+            leitor = csv.reader(arquivo, delimiter=delimitador)
+            cabecalho = next(leitor)
+            faltando = [c for c in ("name",) + cls.COLUNAS if c not in cabecalho]
+            if faltando:
+                raise ValueError(f"Colunas ausentes em {caminho}: {faltando}")
+            posicoes = [cabecalho.index(c) for c in ("name",) + cls.COLUNAS]
+            linhas = [[linha[i] for i in posicoes] for linha in leitor if linha]
+        if not linhas:
+            return cls([], **{c: [] for c in cls.COLUNAS})
+        colunas = list(zip(*linhas))
+        return cls(colunas[0], **{c: np.asarray(v, dtype=float)
+                                  for c, v in zip(cls.COLUNAS, colunas[1:])})
+
+    @classmethod
+    def from_sqlite(cls, caminho, tabela: str = "materials"):
+        """Lê as colunas name e COLUNAS da tabela `tabela` de um banco SQLite."""
+        if not tabela.isidentifier():
+            raise ValueError(f"Nome de tabela inválido: {tabela!r}")
+        conexao = sqlite3.connect(caminho)
+        try:
+            linhas = conexao.execute(
+                f"SELECT name, {', '.join(cls.COLUNAS)} FROM {tabela}").fetchall()
+        finally:
+            conexao.close()
+        if not linhas:
+            return cls([], **{c: [] for c in cls.COLUNAS})
+        colunas = list(zip(*linhas))
+        return cls(colunas[0], **{c: np.asarray(v, dtype=float)
+                                  for c, v in zip(cls.COLUNAS, colunas[1:])})
+
+    def band_gap(self, T):
+        """Eg(T) de todas as linhas pela equação de Varshni [eV]."""
+        return self.Eg_0 - (self.alpha * T**2) / (T + self.beta)
+
+
+MATERIAIS_PADRAO = MaterialTable.from_materials([SILICON, GAAS, PEROVSKITE])
+
 def calculate_band_gap(material, T):
     """
     Calcula o Band Gap em função da temperatura usando a equação de Varshni:
@@ -39,3 +130,43 @@ def calculate_intrinsic_carrier_concentration(material, T, Eg):
     
     ni = np.sqrt(Nc * Nv) * np.exp(-Eg / (2 * kT))
     return ni, Nc, Nv
+
+
+@lru_cache(maxsize=32)
+def _propriedades_termicas(parametros_material: tuple, temperaturas: bytes) -> dict:
+    Eg_0, alpha, beta, Nc_300, Nv_300 = parametros_material
+    T = np.frombuffer(temperaturas, dtype=float)
+    Eg = Eg_0 - (alpha * T**2) / (T + beta)
+    Nc = Nc_300 * (T / 300.0)**1.5
+    Nv = Nv_300 * (T / 300.0)**1.5
+    ni = np.sqrt(Nc * Nv) * np.exp(-Eg / (2 * k_B * T / q))
+    propriedades = {"T": T, "Eg": Eg, "Nc": Nc, "Nv": Nv, "ni": ni}
+    for valores in propriedades.values():
+        valores.setflags(write=False)
+    return propriedades
+
+
+def propriedades_termicas(material, temperaturas) -> dict:
+    """
+    Eg(T), Nc(T), Nv(T) e ni(T) do material para um vetor de temperaturas,
+    de uma só vez (mesmas equações de calculate_band_gap e
+    calculate_intrinsic_carrier_concentration).
+
+    O resultado fica em cache por material (pelos seus parâmetros) e vetor
+    de temperaturas; os arrays devolvidos são somente leitura.
+
+    Parâmetros:
+        material : Material
+        temperaturas : Temperaturas [K] (escalar ou array)
+
+    Retorna:
+        dicionário com:
+            - T: temperaturas [K]
+            - Eg: band gap (Varshni) [eV]
+            - Nc, Nv: densidades efetivas de estados [cm^-3]
+            - ni: concentração intrínseca [cm^-3]
+    """
+    T = np.ascontiguousarray(np.atleast_1d(temperaturas), dtype=float)
+    parametros = (material.Eg_0, material.alpha, material.beta,
+                  material.Nc_300, material.Nv_300)
+    return _propriedades_termicas(parametros, T.tobytes())
@@ -0,0 +1,97 @@
+import numpy as np
+from modules.solar import calcular_corrente_fotogerada_limite
+from modules.device import calcular_corrente_saturacao_radiativa
+from modules.analysis import extrair_parametros_modelo
+
+GRANDEZAS_TRIAGEM = ("Eficiencia", "V_oc_numerico", "J_sc", "FF", "P_max")
+
+
+def avaliar_materiais(tabela,
+                      temperatura_celula: float = 300.0,
+                      temperatura_sol: float = 5778.0,
+                      fator_idealidade: float = 1.0,
+                      resistencia_serie: float = 0.0,
+                      resistencia_shunt: float = np.inf,
+                      tamanho_bloco: int = 200_000) -> dict:
+    """
+    Eficiência de balanço detalhado de todas as linhas de uma MaterialTable.
+
+    Eg vem da equação de Varshni à temperatura da célula; J_ph e J0 usam o
+    integrador analítico e os parâmetros elétricos vêm de
+    extrair_parametros_modelo, tudo vetorizado sobre a tabela, em blocos
+    de `tamanho_bloco` linhas para limitar a memória temporária.
+
+    Parâmetros:
+        tabela : MaterialTable
+        temperatura_celula : Temperatura da célula [K]
+        temperatura_sol : Temperatura do Sol [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+        tamanho_bloco : Linhas avaliadas por bloco
+
+    Retorna:
+        dicionário com energia_gap e as grandezas de GRANDEZAS_TRIAGEM, um
+        array por chave com uma entrada por linha da tabela
+    """
+    Eg = tabela.band_gap(temperatura_celula)
+    saida = {"energia_gap": Eg}
+    saida.update((chave, np.empty(len(tabela))) for chave in GRANDEZAS_TRIAGEM)
+
+    for inicio in range(0, len(tabela), tamanho_bloco):
+        bloco = slice(inicio, inicio + tamanho_bloco)
+        J_ph = calcular_corrente_fotogerada_limite(Eg[bloco], temperatura_sol,
+                                                   integrador="analitico")
+        J0 = calcular_corrente_saturacao_radiativa(Eg[bloco], temperatura_celula,
+                                                   integrador="analitico")
+        with np.errstate(all="ignore"):
+            resultados = extrair_parametros_modelo(J_ph, J0, temperatura_celula,
+                                                   fator_idealidade, resistencia_serie,
+                                                   resistencia_shunt)
+        for chave in GRANDEZAS_TRIAGEM:
+            saida[chave][bloco] = resultados[chave]
+    return saida
+
+
+def triagem_materiais(tabela, k: int = 10, criterio: str = "Eficiencia", **condicoes) -> dict:
+    """
+    Avalia a tabela inteira (avaliar_materiais) e devolve os k melhores
+    candidatos pelo critério, em ordem decrescente. Linhas com resultado
+    não finito (ex.: Eg(T) não positivo) ficam fora do ranking.
+
+    A seleção usa np.argpartition, portanto só os k escolhidos são
+    ordenados.
+
+    Parâmetros:
+        tabela : MaterialTable
+        k : Número de candidatos
+        criterio : Grandeza de GRANDEZAS_TRIAGEM usada no ranking
+        **condicoes : Repassadas a avaliar_materiais (temperatura_celula,
+                      resistencia_serie, ...)
+
+    Retorna:
+        dicionário com:
+            - indices: linhas da tabela escolhidas, da melhor para a pior
+            - names: nomes dos materiais escolhidos
+            - energia_gap e as grandezas de GRANDEZAS_TRIAGEM dos escolhidos
+            - num_avaliados: número de linhas com resultado válido
+    """
+    if criterio not in GRANDEZAS_TRIAGEM:
+        raise ValueError(f"Critério desconhecido: {criterio!r} (use um de {GRANDEZAS_TRIAGEM})")
+
+    avaliacao = avaliar_materiais(tabela, **condicoes)
+    valores = avaliacao[criterio]
+    validos = np.flatnonzero(np.isfinite(valores) & (avaliacao["energia_gap"] > 0))
+
+    k = min(k, validos.size)
+    if k < validos.size:
+        escolhidos = validos[np.argpartition(-valores[validos], k - 1)[:k]]
+    else:
+        escolhidos = validos
+    escolhidos = escolhidos[np.argsort(-valores[escolhidos], kind="stable")]
+
+    ranking = {"indices": escolhidos, "names": tabela.names[escolhidos]}
+    ranking.update((chave, valores_chave[escolhidos])
+                   for chave, valores_chave in avaliacao.items())
+    ranking["num_avaliados"] = int(validos.size)
+    return ranking
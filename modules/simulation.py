@@ -0,0 +1,217 @@
+import numpy as np
+
+from modules.quantum import SILICON, calculate_band_gap
+from modules.device import curva_JV_diodo
+from modules.analysis import extrair_parametros
+from modules.cache import corrente_fotogerada_em_cache, corrente_saturacao_em_cache
+from modules import instrumentation
+
+# Entradas do grafo e seus valores padrão
+ENTRADAS_PADRAO = {
+    "material": SILICON,
+    "energia_gap_eV": None,          # None = Eg(T) do material (Varshni)
+    "temperatura_celula": 300.0,
+    "temperatura_sol": 5778.0,
+    "fator_idealidade": 1.0,
+    "resistencia_serie": 0.0,
+    "resistencia_shunt": np.inf,
+    "tensao_min": 0.0,
+    "tensao_max": 1.2,
+    "num_pontos_tensao": 400,
+    "num_pontos_energia": 4000,
+    # Newton vetorizado converge em todos os pontos; o laço "newton" esgota
+    # as 50 iterações com Rs alto (ex.: Rs = 0,5 Ω·m²)
+    "metodo_jv": "newton_vetorizado",
+}
+
+
+def _energia_gap(material, energia_gap_eV, temperatura_celula):
+    if energia_gap_eV is not None:
+        return energia_gap_eV
+    return calculate_band_gap(material, temperatura_celula)
+
+
+def _corrente_fotogerada(energia_gap, temperatura_sol, num_pontos_energia):
+    return corrente_fotogerada_em_cache(
+        energia_gap_eV=energia_gap,
+        temperatura_sol=temperatura_sol,
+        num_pontos_energia=num_pontos_energia,
+    )
+
+
+def _corrente_saturacao(energia_gap, temperatura_celula, num_pontos_energia):
+    return corrente_saturacao_em_cache(
+        energia_gap_eV=energia_gap,
+        temperatura_celula=temperatura_celula,
+        num_pontos_energia=num_pontos_energia,
+    )
+
+
+def _curva_JV(J_ph, J0, temperatura_celula, fator_idealidade, resistencia_serie,
+              resistencia_shunt, tensao_min, tensao_max, num_pontos_tensao, metodo_jv,
+              anterior=None, callback_progresso=None):
+    # Partida a quente a partir da curva anterior na mesma malha
+    J_inicial = None
+    if anterior is not None and metodo_jv == "newton_vetorizado":
+        tensoes_anteriores, correntes_anteriores = anterior
+        if (len(tensoes_anteriores) == num_pontos_tensao
+                and tensoes_anteriores[0] == tensao_min
+                and tensoes_anteriores[-1] == tensao_max):
+            J_inicial = correntes_anteriores
+
+    return curva_JV_diodo(
+        J_ph=J_ph,
+        J0=J0,
+        temperatura_celula=temperatura_celula,
+        fator_idealidade=fator_idealidade,
+        resistencia_serie=resistencia_serie,
+        resistencia_shunt=resistencia_shunt,
+        tensao_min=tensao_min,
+        tensao_max=tensao_max,
+        num_pontos_tensao=num_pontos_tensao,
+        metodo=metodo_jv,
+        callback_progresso=callback_progresso,
+        J_inicial=J_inicial,
+    )
+
+
+def _resultados(curva_JV, J_ph, J0, temperatura_celula, fator_idealidade):
+    tensoes_V, correntes_J = curva_JV
+    return extrair_parametros(tensoes_V, correntes_J, J_ph, J0,
+                              temperatura_celula, fator_idealidade)
+
+
+# Nós calculados: nome → (função, dependências na ordem dos argumentos)
+NOS = {
+    "energia_gap": (_energia_gap, ("material", "energia_gap_eV", "temperatura_celula")),
+    "J_ph": (_corrente_fotogerada, ("energia_gap", "temperatura_sol", "num_pontos_energia")),
+    "J0": (_corrente_saturacao, ("energia_gap", "temperatura_celula", "num_pontos_energia")),
+    "curva_JV": (_curva_JV, ("J_ph", "J0", "temperatura_celula", "fator_idealidade",
+                             "resistencia_serie", "resistencia_shunt", "tensao_min",
+                             "tensao_max", "num_pontos_tensao", "metodo_jv")),
+    "resultados": (_resultados, ("curva_JV", "J_ph", "J0", "temperatura_celula",
+                                 "fator_idealidade")),
+}
+
+
+class Simulacao:
+    """
+    Pipeline Eg → J_ph, J0 → curva J-V → extração como grafo de
+    dependências com nós preguiçosos e memoizados.
+
+    Um nó só é calculado quando pedido (obter) e fica guardado até que
+    alguma entrada da qual ele depende mude; `definir` marca como sujos
+    apenas os nós a jusante das entradas alteradas. Um nó sujo só é
+    recalculado se algum de seus argumentos mudou de fato: se um nó
+    recalculado reproduz o valor anterior (ex.: energia_gap com Eg
+    explícito quando só T_célula muda), a propagação para ali (corte
+    antecipado). Após cada consulta, `recalculados` lista os nós
+    efetivamente recalculados, em ordem.
+
+    O nó "curva_JV" recebe a curva anterior, usada como partida a quente
+    quando metodo_jv = "newton_vetorizado", e `callback_progresso` (atributo,
+    não entrada do grafo) é repassado a curva_JV_diodo.
+
+    Com a instrumentação ligada, cada nó recalculado vira uma etapa do
+    relatório (J_ph, J0, curva_JV, resultados = extração).
+
+    Exemplo:
+        sim = Simulacao(energia_gap_eV=1.12, resistencia_serie=1e-4)
+        sim.obter("resultados")            # calcula tudo
+        sim.definir(resistencia_serie=2e-4)
+        sim.obter("resultados")            # reaproveita J_ph e J0
+        sim.recalculados                   # ['curva_JV', 'resultados']
+        sim.definir(temperatura_celula=310.0)
+        sim.obter("resultados")            # Eg explícito: J_ph reaproveitado
+        sim.recalculados                   # ['energia_gap', 'J0', 'curva_JV', 'resultados']
+    """
+
+    def __init__(self, **entradas):
+        desconhecidas = set(entradas) - set(ENTRADAS_PADRAO)
+        if desconhecidas:
+            raise ValueError(f"Entradas desconhecidas: {sorted(desconhecidas)}")
+        self._entradas = {**ENTRADAS_PADRAO, **entradas}
+        self._valores = {}
+        self._argumentos = {}     # nó → argumentos do último cálculo
+        self._sujos = set()
+        self.recalculados = []
+        self.callback_progresso = None
+
+        # Mapa inverso: nó/entrada → nós que dependem diretamente dele
+        self._dependentes = {}
+        for nome, (_, dependencias) in NOS.items():
+            for dependencia in dependencias:
+                self._dependentes.setdefault(dependencia, []).append(nome)
+
+    @property
+    def entradas(self) -> dict:
+        return dict(self._entradas)
+
+    def definir(self, **entradas):
+        """Altera entradas, marcando como sujos só os nós a jusante das que mudaram."""
+        desconhecidas = set(entradas) - set(ENTRADAS_PADRAO)
+        if desconhecidas:
+            raise ValueError(f"Entradas desconhecidas: {sorted(desconhecidas)}")
+        for nome, valor in entradas.items():
+            atual = self._entradas[nome]
+            if valor is atual or (type(valor) is type(atual) and valor == atual):
+                continue
+            self._entradas[nome] = valor
+            self._sujar(nome)
+
+    def _sujar(self, nome):
+        pendentes = list(self._dependentes.get(nome, ()))
+        while pendentes:
+            no = pendentes.pop()
+            if no in self._valores and no not in self._sujos:
+                self._sujos.add(no)
+                pendentes.extend(self._dependentes.get(no, ()))
+
+    def obter(self, nome):
+        """Valor de um nó (ou entrada), calculando o que estiver inválido."""
+        self.recalculados = []
+        return self._avaliar(nome)
+
+    def __getitem__(self, nome):
+        return self.obter(nome)
+
+    def _avaliar(self, nome):
+        if nome in self._entradas:
+            return self._entradas[nome]
+        if nome in self._valores and nome not in self._sujos:
+            return self._valores[nome]
+        if nome not in NOS:
+            raise KeyError(f"Nó desconhecido: {nome!r}")
+
+        funcao, dependencias = NOS[nome]
+        argumentos = [self._avaliar(d) for d in dependencias]
+
+        # Corte antecipado: argumentos iguais aos do último cálculo
+        anteriores = self._argumentos.get(nome)
+        if anteriores is not None and all(map(_mesmo_valor, argumentos, anteriores)):
+            self._sujos.discard(nome)
+            return self._valores[nome]
+
+        with instrumentation.etapa(nome):
+            if nome == "curva_JV":
+                valor = funcao(*argumentos, anterior=self._valores.get(nome),
+                               callback_progresso=self.callback_progresso)
+            else:
+                valor = funcao(*argumentos)
+        self._valores[nome] = valor
+        self._argumentos[nome] = argumentos
+        self._sujos.discard(nome)
+        self.recalculados.append(nome)
+        return valor
+
+
+def _mesmo_valor(a, b) -> bool:
+    """Igualdade para o corte antecipado: identidade ou escalares iguais."""
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):      # arrays/tuplas de arrays: só identidade
+        return False
@@ -1,4 +1,5 @@
 import numpy as np
+from functools import lru_cache
 from math import pi
 from modules.constants import h, c, k_B, q, epsilon_0
 
@@ -7,6 +8,38 @@ RAIO_SOL = 6.9634e8          # m
 DISTANCIA_SOL_TERRA = 1.496e11  # m
 FATOR_GEOMETRICO_SOL_TERRA = (RAIO_SOL / DISTANCIA_SOL_TERRA) ** 2
 
+INTEGRADORES = ("trapezio", "analitico", "tabela")
+
+# Integrador "trapezio": limite superior da malha (4 eV ~ ultravioleta) e
+# amostras de energia avaliadas por bloco quando Eg/T são arrays
+ENERGIA_MAX_TRAPEZIO_EV = 4.0
+AMOSTRAS_POR_BLOCO_TRAPEZIO = 2 ** 20
+
+# Menor fluxo acumulado [fótons/(m^2·s)] guardado na tabela de corpo negro
+PISO_FLUXO_TABELA = 1e-280
+
+# Série de Bose–Einstein / Bernoulli para I(u) = ∫_u^∞ x² / (e^x - 1) dx
+ZETA_3 = 1.2020569031595942
+_TERMOS_SERIE_BE = 24
+_LIMIAR_SERIE_BE = 2.0
+
+
+def _coeficientes_bernoulli(num_termos: int) -> np.ndarray:
+    """
+    Coeficientes b_m = B_m / m! da expansão x / (e^x - 1) = Σ b_m x^m,
+    pela recorrência Σ_{k=0}^{m} b_k / (m - k + 1)! = 0 (m >= 1).
+    """
+    b = np.zeros(num_termos)
+    b[0] = 1.0
+    fatoriais = np.cumprod(np.r_[1.0, np.arange(1.0, num_termos + 1)])
+    for m in range(1, num_termos):
+        b[m] = -np.sum(b[:m] / fatoriais[m - np.arange(m) + 1])
+    return b
+
+
+# ∫_0^u x² / (e^x - 1) dx = Σ b_m u^(m+2) / (m+2), convergente para |u| < 2π
+_COEF_SERIE_BAIXA = _coeficientes_bernoulli(40) / (np.arange(40) + 2.0)
+
 def fluxo_fotons_corpo_negro(energia_J: np.ndarray, temperatura: float) -> np.ndarray:
     """
     Fluxo espectral de fótons (por unidade de energia) de um corpo negro
@@ -33,7 +66,9 @@ def fluxo_fotons_corpo_negro(energia_J: np.ndarray, temperatura: float) -> np.nd
 
 def calcular_corrente_fotogerada_limite(energia_gap_eV: float,
                                         temperatura_sol: float = 5778.0,
-                                        num_pontos_energia: int = 4000) -> float:
+                                        num_pontos_energia: int = 4000,
+                                        integrador: str = "trapezio",
+                                        espectro=None) -> float:
     """
     Calcula a corrente fotogerada J_ph (limite de Shockley–Queisser)
     para uma célula ideal com gap Eg, usando um Sol como corpo negro.
@@ -45,26 +80,219 @@ def calcular_corrente_fotogerada_limite(energia_gap_eV: float,
         energia_gap_eV : Energia de gap [eV]
         temperatura_sol : Temperatura do Sol [K]
         num_pontos_energia : Número de pontos para integração numérica
+        integrador : "trapezio" (malha até 4 eV), "analitico" (série
+                     fechada até o infinito, vetorizada em Eg e T_sol) ou
+                     "tabela" (interpolação na TabelaFluxoAcumulado em cache,
+                     com num_pontos_energia nós; vetorizada em Eg)
+        espectro : EspectroTabelado opcional (modules.spectrum); quando
+                   fornecido substitui o corpo negro e os parâmetros
+                   temperatura_sol/integrador são ignorados
     
     Retorna:
-        J_ph : Corrente fotogerada [A/m^2]
+        J_ph : Corrente fotogerada [A/m^2] (um valor por espectro da série
+               quando o EspectroTabelado contém vários)
     """
-    Eg_J = energia_gap_eV * q
-    # Limite superior de energia (4 eV ~ ultravioleta)
-    E_max_J = 4.0 * q
+    if espectro is not None:
+        J_ph = espectro.corrente_fotogerada(energia_gap_eV)
+        return J_ph[0] if espectro.num_espectros == 1 else J_ph
 
-    # Malha de energia
-    energia_J = np.linspace(Eg_J, E_max_J, num_pontos_energia)
+    if integrador not in INTEGRADORES:
+        raise ValueError(f"Integrador desconhecido: {integrador!r} (use um de {INTEGRADORES})")
 
-    # Fluxo espectral na superfície do Sol
-    fluxo_sol = fluxo_fotons_corpo_negro(energia_J, temperatura_sol)
+    if integrador == "tabela":
+        tabela = tabela_corpo_negro(float(temperatura_sol),
+                                    FATOR_GEOMETRICO_SOL_TERRA,
+                                    num_pontos_energia)
+        return tabela.corrente(energia_gap_eV)
 
-    # Fluxo espectral na Terra (reduzido pelo fator geométrico)
-    fluxo_terra = fluxo_sol * FATOR_GEOMETRICO_SOL_TERRA  # [fótons / (m^2·s·J)]
+    if integrador == "analitico":
+        fluxo_total_fotons = fluxo_fotons_corpo_negro_integrado(
+            np.asarray(energia_gap_eV) * q, temperatura_sol
+        ) * FATOR_GEOMETRICO_SOL_TERRA
+        return q * fluxo_total_fotons
 
-    # Integração numérica
-    fluxo_total_fotons = np.trapz(fluxo_terra, energia_J)  # [fótons / (m^2·s)]
+    # Fluxo na Terra (reduzido pelo fator geométrico) integrado até 4 eV
+    fluxo_total_fotons = integrar_fluxo_trapezio(energia_gap_eV, temperatura_sol,
+                                                 num_pontos_energia,
+                                                 FATOR_GEOMETRICO_SOL_TERRA)  # [fótons / (m^2·s)]
 
     # Corrente fotogerada
     J_ph = q * fluxo_total_fotons  # [A/m^2]
     return J_ph
+
+
+def integrar_fluxo_trapezio(energia_gap_eV,
+                            temperatura,
+                            num_pontos_energia: int = 4000,
+                            fator_escala: float = 1.0):
+    """
+    Fluxo de fótons de um corpo negro entre Eg e ENERGIA_MAX_TRAPEZIO_EV
+    pela regra do trapézio numa malha uniforme (integrador "trapezio"):
+
+      N = ∫_{Eg}^{4 eV} fator_escala · Φ(E, T) dE
+
+    Vetorizada em Eg e T (difundidos entre si), com a malha de energia no
+    último eixo e no máximo AMOSTRAS_POR_BLOCO_TRAPEZIO amostras por bloco;
+    cada ponto dá o mesmo resultado da integração escalar.
+
+    Parâmetros:
+        energia_gap_eV : Energia de gap [eV] (escalar ou array)
+        temperatura : Temperatura do corpo negro [K] (escalar ou array)
+        num_pontos_energia : Número de pontos da malha de energia
+        fator_escala : Fator multiplicativo do fluxo (ex.: geométrico Sol–Terra)
+
+    Retorna:
+        fluxo : [fótons / (m^2·s)], com a forma difundida de Eg e T
+    """
+    Eg_J, T = np.broadcast_arrays(np.asarray(energia_gap_eV, dtype=float) * q,
+                                  np.asarray(temperatura, dtype=float))
+    fluxo = np.empty(Eg_J.shape)
+    Eg_J, T, saida = Eg_J.ravel(), T.ravel(), fluxo.reshape(-1)
+
+    pontos_por_bloco = max(1, AMOSTRAS_POR_BLOCO_TRAPEZIO // num_pontos_energia)
+    for inicio in range(0, Eg_J.size, pontos_por_bloco):
+        bloco = slice(inicio, inicio + pontos_por_bloco)
+        energia_J = np.linspace(Eg_J[bloco], ENERGIA_MAX_TRAPEZIO_EV * q, num_pontos_energia,
+                                axis=-1)
+        fluxo_espectral = fluxo_fotons_corpo_negro(energia_J, T[bloco, None]) * fator_escala
+        saida[bloco] = np.trapz(fluxo_espectral, energia_J, axis=-1)
+    return fluxo[()]
+
+
+def _integral_bose_einstein(u):
+    """
+    I(u) = ∫_u^∞ x² / (e^x - 1) dx, vetorizado (u >= 0).
+
+    Para u >= 2 usa a série I(u) = Σ_k e^{-ku} (u²/k + 2u/k² + 2/k³),
+    equivalente a u² Li₁(e^{-u}) + 2u Li₂(e^{-u}) + 2 Li₃(e^{-u});
+    para u < 2 usa I(u) = 2ζ(3) - Σ b_m u^(m+2) / (m+2). Ambas têm erro
+    relativo ~1e-15.
+    """
+    u = np.asarray(u, dtype=float)
+
+    # Série de Bose–Einstein (u grande)
+    k = np.arange(1, _TERMOS_SERIE_BE + 1).reshape((-1,) + (1,) * u.ndim)
+    u_alto = np.maximum(u, _LIMIAR_SERIE_BE)
+    termos = np.exp(-k * u_alto) * (u_alto ** 2 / k + 2.0 * u_alto / k ** 2 + 2.0 / k ** 3)
+    serie_alta = termos.sum(axis=0)
+
+    # Série de Bernoulli (u pequeno), avaliada por Horner
+    u_baixo = np.minimum(u, _LIMIAR_SERIE_BE)
+    soma = np.zeros_like(u_baixo)
+    for coef in _COEF_SERIE_BAIXA[::-1]:
+        soma = soma * u_baixo + coef
+    serie_baixa = 2.0 * ZETA_3 - soma * u_baixo ** 2
+
+    return np.where(u >= _LIMIAR_SERIE_BE, serie_alta, serie_baixa)
+
+
+def fluxo_fotons_corpo_negro_integrado(energia_min_J, temperatura):
+    """
+    Fluxo total de fótons de um corpo negro acima de uma energia mínima,
+    em forma fechada (sem malha de energia):
+
+    ∫_{E_min}^{∞} Φ(E) dE = 2π (k_B T)³ / (h³ c²) · I(E_min / (k_B T))
+
+    Vetorizado: energia_min_J e temperatura são difundidos entre si.
+
+    Parâmetros:
+        energia_min_J : energia mínima [J] (escalar ou array)
+        temperatura : [K] (escalar ou array)
+
+    Retorna:
+        fluxo : fluxo de fótons [fótons / (m^2·s)]
+    """
+    kT = k_B * np.asarray(temperatura, dtype=float)
+    u = np.asarray(energia_min_J, dtype=float) / kT
+    fluxo = (2.0 * pi / (h ** 3 * c ** 2)) * kT ** 3 * _integral_bose_einstein(u)
+    return fluxo[()]
+
+
+class TabelaFluxoAcumulado:
+    """
+    Fluxo de fótons acumulado N(E) = ∫_E^∞ Φ(E') dE' tabelado numa malha de
+    energia crescente. Como só o limite inferior da integral depende de Eg,
+    J_ph(Eg) = q · N(Eg) vira uma única interpolação, para qualquer número
+    de band gaps.
+
+    A interpolação é linear em ln N(E) quando N > 0 em toda a malha (quase
+    exata para a cauda de Wien) e linear em N caso contrário.
+    """
+
+    def __init__(self, energia_J, fluxo_acumulado, identificador="",
+                 erro_relativo_maximo=np.nan):
+        self.energia_J = np.asarray(energia_J, dtype=float)
+        self.fluxo_acumulado = np.asarray(fluxo_acumulado, dtype=float)
+        self.identificador = identificador        # Ex.: "corpo_negro:5778.0"
+        self.erro_relativo_maximo = erro_relativo_maximo  # Estimado nos pontos médios
+
+        self._escala_log = bool(np.all(self.fluxo_acumulado > 0))
+        self._valores = (np.log(self.fluxo_acumulado) if self._escala_log
+                         else self.fluxo_acumulado)
+
+    def fluxo_acima(self, energia_J):
+        """
+        Fluxo de fótons acima de energia_J [fótons / (m^2·s)].
+
+        Energias fora da faixa tabelada geram ValueError.
+        """
+        energia_J = np.asarray(energia_J, dtype=float)
+        if np.any(energia_J < self.energia_J[0]) or np.any(energia_J > self.energia_J[-1]):
+            raise ValueError(
+                f"Energia fora da tabela [{self.energia_J[0] / q:.3f}, "
+                f"{self.energia_J[-1] / q:.3f}] eV"
+            )
+        valores = np.interp(energia_J, self.energia_J, self._valores)
+        fluxo = np.exp(valores) if self._escala_log else valores
+        return fluxo[()]
+
+    def corrente(self, energia_gap_eV):
+        """Corrente q · N(Eg) [A/m^2] para um ou vários band gaps [eV]."""
+        return q * self.fluxo_acima(np.asarray(energia_gap_eV) * q)
+
+
+@lru_cache(maxsize=32)
+def tabela_corpo_negro(temperatura: float,
+                       fator_escala: float = 1.0,
+                       num_pontos: int = 4000,
+                       energia_min_eV: float = 0.01,
+                       energia_max_eV: float = 10.0) -> TabelaFluxoAcumulado:
+    """
+    Constrói (uma vez, com cache) a TabelaFluxoAcumulado de um corpo negro.
+
+    Os nós vêm da forma fechada fluxo_fotons_corpo_negro_integrado; o erro
+    de interpolação é medido contra ela nos pontos médios da malha e
+    guardado em erro_relativo_maximo, que vale para energias até o último
+    nó com fluxo acima de PISO_FLUXO_TABELA (toda a faixa acima de ~170 K). Com fator_escala = 1 a tabela serve
+    para J0 à temperatura da célula; com FATOR_GEOMETRICO_SOL_TERRA, para
+    J_ph do Sol.
+
+    Parâmetros:
+        temperatura : Temperatura do corpo negro [K]
+        fator_escala : Fator multiplicativo do fluxo (ex.: geométrico Sol–Terra)
+        num_pontos : Número de nós da malha (controle de resolução)
+        energia_min_eV, energia_max_eV : Faixa de energia tabelada [eV]
+
+    Retorna:
+        tabela : TabelaFluxoAcumulado
+    """
+    energia_J = np.linspace(energia_min_eV, energia_max_eV, num_pontos) * q
+    fluxo = fator_escala * fluxo_fotons_corpo_negro_integrado(energia_J, temperatura)
+
+    # Abaixo de ~170 K a cauda de N(E) perto de energia_max_eV sai da faixa
+    # do float64 (vira 0) e, antes disso, perde precisão (e^-u subnormal na
+    # forma fechada). Com um piso a tabela continua interpolando em ln N; só
+    # energias além do último nó acima do piso (N < 1e-280 fótons/(m²·s) no
+    # nó seguinte, J < 1e-298 A/m²) ficam aproximadas
+    piso = PISO_FLUXO_TABELA
+    tabela = TabelaFluxoAcumulado(energia_J, np.maximum(fluxo, piso),
+                                  identificador=f"corpo_negro:{temperatura}")
+
+    # Erro medido só nos intervalos com os dois nós acima do piso
+    representaveis = fluxo[1:] > piso
+    energia_media_J = 0.5 * (energia_J[1:] + energia_J[:-1])[representaveis]
+    exato = fator_escala * fluxo_fotons_corpo_negro_integrado(energia_media_J, temperatura)
+    if exato.size:
+        tabela.erro_relativo_maximo = float(
+            np.max(np.abs(tabela.fluxo_acima(energia_media_J) / exato - 1.0)))
+    return tabela
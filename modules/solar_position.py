@@ -0,0 +1,163 @@
+import numpy as np
+
+# Constante solar e modelo de céu claro de Meinel (simplificado)
+CONSTANTE_SOLAR = 1353.0   # W/m^2
+FRACAO_DIFUSA = 0.1        # DHI ≈ 10% da DNI
+
+
+def _dia_e_hora_utc(instantes):
+    """Dia do ano (1..366) e hora decimal UTC de um array de datetime64."""
+    instantes = np.asarray(instantes, dtype="datetime64[s]")
+    dia = (instantes.astype("datetime64[D]")
+           - instantes.astype("datetime64[Y]").astype("datetime64[D]")).astype(float) + 1.0
+    hora = (instantes - instantes.astype("datetime64[D]")).astype(float) / 3600.0
+    return dia, hora
+
+
+def posicao_solar(instantes, latitude: float, longitude: float) -> tuple:
+    """
+    Posição do Sol (algoritmo NOAA de séries de Fourier), vetorizada sobre
+    os instantes.
+
+    Parâmetros:
+        instantes : array de datetime64 em UTC
+        latitude : Latitude [graus, norte positivo]
+        longitude : Longitude [graus, leste positivo]
+
+    Retorna:
+        zenite : ângulo zenital [graus]
+        azimute : azimute solar [graus, a partir do norte, sentido horário]
+    """
+    dia, hora = _dia_e_hora_utc(instantes)
+    gama = 2.0 * np.pi / 365.0 * (dia - 1.0 + (hora - 12.0) / 24.0)
+
+    equacao_tempo = 229.18 * (0.000075
+                              + 0.001868 * np.cos(gama) - 0.032077 * np.sin(gama)
+                              - 0.014615 * np.cos(2 * gama) - 0.040849 * np.sin(2 * gama))
+    declinacao = (0.006918
+                  - 0.399912 * np.cos(gama) + 0.070257 * np.sin(gama)
+                  - 0.006758 * np.cos(2 * gama) + 0.000907 * np.sin(2 * gama)
+                  - 0.002697 * np.cos(3 * gama) + 0.00148 * np.sin(3 * gama))
+
+    tempo_solar_min = hora * 60.0 + equacao_tempo + 4.0 * longitude
+    angulo_horario = np.radians(tempo_solar_min / 4.0 - 180.0)
+
+    lat = np.radians(latitude)
+    cos_zenite = (np.sin(lat) * np.sin(declinacao)
+                  + np.cos(lat) * np.cos(declinacao) * np.cos(angulo_horario))
+    zenite = np.degrees(np.arccos(np.clip(cos_zenite, -1.0, 1.0)))
+
+    azimute = np.degrees(np.arctan2(
+        np.sin(angulo_horario),
+        np.cos(angulo_horario) * np.sin(lat) - np.tan(declinacao) * np.cos(lat),
+    )) + 180.0
+    return zenite, azimute
+
+
+def irradiancia_ceu_claro(instantes,
+                          latitude: float,
+                          longitude: float,
+                          inclinacao: float = 0.0,
+                          azimute_painel: float = 180.0,
+                          albedo: float = 0.2) -> dict:
+    """
+    Irradiância de céu claro no plano do painel, vetorizada sobre os
+    instantes.
+
+    DNI pelo modelo de Meinel, DNI = S · ε · 0.7^(AM^0.678), com massa de
+    ar de Kasten–Young e correção de excentricidade ε; DHI = 0,1 · DNI;
+    transposição para o plano por modelo de céu isotrópico.
+
+    Parâmetros:
+        instantes : array de datetime64 em UTC
+        latitude, longitude : Coordenadas do local [graus]
+        inclinacao : Inclinação do painel [graus, 0 = horizontal]
+        azimute_painel : Azimute do painel [graus, 180 = voltado ao sul]
+        albedo : Refletância do solo
+
+    Retorna:
+        dicionário com arrays "ghi", "dni", "dhi", "poa" [W/m^2],
+        "zenite" e "azimute" [graus]
+    """
+    zenite, azimute = posicao_solar(instantes, latitude, longitude)
+    dia, _ = _dia_e_hora_utc(instantes)
+    cos_zenite = np.cos(np.radians(zenite))
+    acima_horizonte = cos_zenite > 0
+
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        massa_ar = 1.0 / (cos_zenite + 0.50572 * np.maximum(96.07995 - zenite, 1e-6) ** -1.6364)
+        excentricidade = 1.0 + 0.033 * np.cos(2.0 * np.pi * dia / 365.0)
+        dni = np.where(acima_horizonte,
+                       CONSTANTE_SOLAR * excentricidade * 0.7 ** (massa_ar ** 0.678), 0.0)
+    dhi = FRACAO_DIFUSA * dni
+    ghi = dni * np.maximum(cos_zenite, 0.0) + dhi
+
+    beta = np.radians(inclinacao)
+    cos_incidencia = (cos_zenite * np.cos(beta)
+                      + np.sin(np.radians(zenite)) * np.sin(beta)
+                      * np.cos(np.radians(azimute - azimute_painel)))
+    poa = (dni * np.maximum(cos_incidencia, 0.0)
+           + dhi * (1.0 + np.cos(beta)) / 2.0
+           + ghi * albedo * (1.0 - np.cos(beta)) / 2.0)
+
+    return {"ghi": ghi, "dni": dni, "dhi": dhi, "poa": poa,
+            "zenite": zenite, "azimute": azimute}
+
+
+def temperatura_ambiente_diaria(instantes, longitude: float,
+                                temperatura_media_C: float = 20.0,
+                                amplitude_C: float = 5.0):
+    """
+    Temperatura ambiente sintética [°C]: senoide diária com máximo às
+    15 h de tempo solar médio.
+    """
+    _, hora = _dia_e_hora_utc(instantes)
+    hora_solar = hora + longitude / 15.0
+    return temperatura_media_C + amplitude_C * np.cos(2.0 * np.pi * (hora_solar - 15.0) / 24.0)
+
+
+def gerar_blocos_ceu_claro(inicio,
+                           fim,
+                           latitude: float,
+                           longitude: float,
+                           inclinacao: float = 0.0,
+                           azimute_painel: float = 180.0,
+                           passo=np.timedelta64(1, "m"),
+                           tamanho_bloco: int = 10_080,
+                           albedo: float = 0.2,
+                           temperatura_media_C: float = 20.0,
+                           amplitude_termica_C: float = 5.0):
+    """
+    Gerador preguiçoso de blocos de clima de céu claro em [inicio, fim).
+
+    Cada bloco é um dicionário no formato de modules.energy_yield
+    ("irradiancia" no plano [W/m^2] e "temperatura_ambiente" [°C]), mais
+    "instantes", e pode ser passado diretamente a simular_producao.
+
+    Parâmetros:
+        inicio, fim : Instantes UTC (datetime64 ou texto ISO 8601)
+        latitude, longitude : Coordenadas do local [graus]
+        inclinacao, azimute_painel : Orientação do painel [graus]
+        passo : Intervalo entre registros (timedelta64)
+        tamanho_bloco : Registros por bloco
+        albedo : Refletância do solo
+        temperatura_media_C, amplitude_termica_C : Modelo de temperatura ambiente
+
+    Produz:
+        dicionários {"instantes", "irradiancia", "temperatura_ambiente"}
+    """
+    inicio = np.datetime64(inicio, "s")
+    fim = np.datetime64(fim, "s")
+    passo = np.timedelta64(passo, "s")
+    while inicio < fim:
+        bloco_fim = min(inicio + passo * tamanho_bloco, fim)
+        instantes = np.arange(inicio, bloco_fim, passo)
+        irradiancia = irradiancia_ceu_claro(instantes, latitude, longitude,
+                                            inclinacao, azimute_painel, albedo)
+        yield {
+            "instantes": instantes,
+            "irradiancia": irradiancia["poa"],
+            "temperatura_ambiente": temperatura_ambiente_diaria(
+                instantes, longitude, temperatura_media_C, amplitude_termica_C),
+        }
+        inicio = bloco_fim
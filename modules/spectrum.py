@@ -0,0 +1,174 @@
+import hashlib
+
+import numpy as np
+from modules.constants import h, c, q
+from modules.solar import TabelaFluxoAcumulado
+
+# Elementos convertidos por bloco de linhas em _converter (limita os
+# temporários a alguns MB mesmo para séries memmap grandes)
+ELEMENTOS_POR_BLOCO = 2 ** 20
+
+# Formato em disco: arquivo .npy float64 com duas linhas
+#   [0] comprimento de onda [nm] (crescente)
+#   [1] irradiância espectral [W/(m^2·nm)]
+# ou, para séries (ex.: um espectro por hora do ano), N + 1 linhas que
+# compartilham a malha de comprimento de onda da linha 0.
+
+
+def salvar_espectro(caminho, comprimento_onda_nm, irradiancia):
+    """
+    Grava um espectro (ou uma série de espectros) no formato binário
+    aceito por carregar_espectro.
+
+    Parâmetros:
+        caminho : Arquivo de destino (.npy)
+        comprimento_onda_nm : Malha de comprimento de onda [nm] (M,)
+        irradiancia : Irradiância espectral [W/(m^2·nm)] (M,) ou (N, M)
+    """
+    comprimento_onda_nm = np.asarray(comprimento_onda_nm, dtype=float)
+    irradiancia = np.atleast_2d(np.asarray(irradiancia, dtype=float))
+    np.save(caminho, np.vstack([comprimento_onda_nm, irradiancia]))
+
+
+def carregar_espectro(caminho, identificador=None):
+    """
+    Abre um espectro tabelado por memória mapeada (np.load com
+    mmap_mode="r"): nada é lido do disco até o primeiro uso, de modo que
+    o custo de abertura não depende do tamanho do arquivo.
+
+    Parâmetros:
+        caminho : Arquivo .npy no formato de salvar_espectro
+        identificador : Nome do espectro (padrão: o próprio caminho)
+
+    Retorna:
+        espectro : EspectroTabelado
+    """
+    dados = np.load(caminho, mmap_mode="r")
+    if dados.ndim != 2 or dados.shape[0] < 2:
+        raise ValueError(f"Formato de espectro inválido em {caminho}: {dados.shape}")
+    return EspectroTabelado(dados[0], dados[1:],
+                            identificador if identificador is not None else str(caminho))
+
+
+class EspectroTabelado:
+    """
+    Espectro (ou série de espectros) tabelado em comprimento de onda,
+    convertido uma única vez — no primeiro uso — para fluxo de fótons por
+    faixa de energia e para a tabela de fluxo acumulado usada no cálculo de
+    J_ph. A irradiância pode ser um único espectro (M,) ou uma série (N, M),
+    e os arrays de entrada podem ser memmaps; nada é copiado para listas
+    Python.
+    """
+
+    def __init__(self, comprimento_onda_nm, irradiancia, identificador=""):
+        self.comprimento_onda_nm = comprimento_onda_nm  # (M,)
+        # Um único espectro (M,) vira uma série (1, M); memmaps continuam
+        # memmaps (np.atleast_2d só muda a forma, sem copiar)
+        self.irradiancia = np.atleast_2d(irradiancia)   # (N, M) [W/(m^2·nm)]
+        self.identificador = identificador
+        lam_m = np.asarray(comprimento_onda_nm, dtype=float) * 1e-9
+        self.energia_bordas_J = (h * c / lam_m)[::-1]   # (M,) crescente
+        self._acumulado = None
+        self._tabelas = {}
+        self._impressao_digital = None
+
+    @property
+    def num_espectros(self):
+        return self.irradiancia.shape[0]
+
+    @property
+    def impressao_digital(self) -> str:
+        """
+        SHA-256 (hex) da malha de comprimento de onda e da irradiância em
+        float64: identifica o conteúdo do espectro, independentemente do
+        identificador (que é só um nome). Calculada uma vez, lendo a série
+        em blocos de linhas.
+        """
+        if self._impressao_digital is None:
+            irradiancia = np.asarray(self.irradiancia)
+            resumo = hashlib.sha256(repr(irradiancia.shape).encode("utf-8"))
+            resumo.update(np.ascontiguousarray(self.comprimento_onda_nm, dtype=float).tobytes())
+            linhas_bloco = max(1, ELEMENTOS_POR_BLOCO // max(1, irradiancia.shape[-1]))
+            for inicio in range(0, irradiancia.shape[0], linhas_bloco):
+                bloco = irradiancia[inicio:inicio + linhas_bloco]
+                resumo.update(np.ascontiguousarray(bloco, dtype=float).tobytes())
+            self._impressao_digital = resumo.hexdigest()
+        return self._impressao_digital
+
+    def _converter(self):
+        """
+        Converte irradiância em fluxo de fótons por faixa de energia.
+
+        Cada intervalo [λ_i, λ_{i+1}] vira uma faixa de energia
+        [hc/λ_{i+1}, hc/λ_i]; o número de fótons na faixa é a integral
+        trapezoidal de E_λ · λ / (h c). Guarda-se apenas o fluxo acumulado
+        acima de cada borda de energia (em ordem crescente de energia).
+
+        A série é lida e convertida em blocos de linhas, de modo que um
+        memmap (N, M) nunca é carregado inteiro nem gera temporários N×M.
+        """
+        lam_m = np.asarray(self.comprimento_onda_nm, dtype=float) * 1e-9
+        fator = 1e9 * lam_m / (h * c)        # W/(m^2·nm) → fótons/(m^2·s·m)
+        largura = np.diff(lam_m)
+        num_espectros, num_pontos = self.irradiancia.shape
+        linhas_bloco = max(1, ELEMENTOS_POR_BLOCO // num_pontos)
+
+        acumulado = np.empty((num_espectros, num_pontos))
+        for inicio in range(0, num_espectros, linhas_bloco):
+            bloco = slice(inicio, min(inicio + linhas_bloco, num_espectros))
+            fotons_por_m = np.asarray(self.irradiancia[bloco], dtype=float) * fator
+            fotons_por_faixa = 0.5 * (fotons_por_m[:, 1:] + fotons_por_m[:, :-1]) * largura
+
+            # Em ordem de λ crescente, a soma acumulada das faixas é o fluxo
+            # acima de cada borda de energia (energia decrescente); grava-se
+            # já invertido, em ordem crescente de energia
+            destino = acumulado[bloco, ::-1]
+            destino[:, 0] = 0.0
+            np.cumsum(fotons_por_faixa, axis=1, out=destino[:, 1:])
+
+        self._acumulado = acumulado                     # (N, M)
+
+    @property
+    def fluxo_acumulado(self):
+        """Fluxo de fótons acima de cada borda de energia [fótons / (m^2·s)], (N, M)."""
+        if self._acumulado is None:
+            self._converter()
+        return self._acumulado
+
+    @property
+    def fotons_por_faixa(self):
+        """Fluxo de fótons por faixa de energia [fótons / (m^2·s)], (N, M-1)."""
+        return -np.diff(self.fluxo_acumulado, axis=1)
+
+    def fluxo_acima(self, energia_J):
+        """
+        Fluxo de fótons acima de energia_J para todos os espectros da série,
+        interpolando linearmente dentro da faixa que contém energia_J.
+
+        Retorna:
+            fluxo : array (N,) + energia_J.shape [fótons / (m^2·s)]
+        """
+        acumulado = self.fluxo_acumulado
+        bordas = self.energia_bordas_J
+        energia_J = np.asarray(energia_J, dtype=float)
+        indice = np.clip(np.searchsorted(bordas, energia_J, side="right") - 1, 0, bordas.size - 2)
+        fracao = np.clip((energia_J - bordas[indice]) / (bordas[indice + 1] - bordas[indice]), 0.0, 1.0)
+        return acumulado[:, indice] * (1.0 - fracao) + acumulado[:, indice + 1] * fracao
+
+    def tabela(self, indice: int = 0) -> TabelaFluxoAcumulado:
+        """TabelaFluxoAcumulado (em cache) do espectro de índice `indice`."""
+        if indice not in self._tabelas:
+            self._tabelas[indice] = TabelaFluxoAcumulado(
+                self.energia_bordas_J, self.fluxo_acumulado[indice],
+                identificador=f"{self.identificador}[{indice}]"
+            )
+        return self._tabelas[indice]
+
+    def corrente_fotogerada(self, energia_gap_eV):
+        """
+        J_ph = q · ∫_{Eg} Φ(E) dE [A/m^2] para todos os espectros da série.
+
+        Retorna:
+            J_ph : array (N,) + energia_gap_eV.shape
+        """
+        return q * self.fluxo_acima(np.asarray(energia_gap_eV) * q)
@@ -0,0 +1,155 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from modules.solar import calcular_corrente_fotogerada_limite, INTEGRADORES
+from modules.device import calcular_corrente_saturacao_radiativa
+from modules.analysis import extrair_parametros_modelo
+
+# Parâmetros que podem ser eixos (ou valores fixos) de uma varredura
+PARAMETROS_VARREDURA = {
+    "energia_gap_eV": 1.12,
+    "temperatura_celula": 300.0,
+    "temperatura_sol": 5778.0,
+    "fator_idealidade": 1.0,
+    "resistencia_serie": 0.0,
+    "resistencia_shunt": np.inf,
+}
+
+GRANDEZAS_MAPA = ("J_sc", "V_oc_numerico", "FF", "Eficiencia", "P_max", "V_mp")
+
+# Blocos por processo que mapa_eficiencia procura gerar, para que o pool
+# continue balanceado quando alguns blocos terminam antes dos outros
+BLOCOS_POR_PROCESSO = 4
+
+
+def avaliar_por_par_distinto(funcao, energia_gap_eV, temperatura, tamanho, integrador):
+    """
+    Aplica funcao(Eg, T, integrador=...) (J_ph ou J0) uma única vez por par
+    (Eg, T) distinto entre `tamanho` pontos (numa grade, os pares se
+    repetem ao longo dos outros eixos; no Monte Carlo, quando Eg e T não
+    variam). O integrador "tabela" só é
+    vetorizado em Eg: é chamado uma vez por temperatura distinta.
+    """
+    pares = np.stack([np.broadcast_to(energia_gap_eV, (tamanho,)),
+                      np.broadcast_to(temperatura, (tamanho,))], axis=1)
+    distintos, indice = np.unique(pares, axis=0, return_inverse=True)
+    if integrador == "tabela":
+        valores = np.empty(len(distintos))
+        for T in np.unique(distintos[:, 1]):
+            selecao = distintos[:, 1] == T
+            valores[selecao] = funcao(distintos[selecao, 0], T, integrador=integrador)
+    else:
+        valores = funcao(distintos[:, 0], distintos[:, 1], integrador=integrador)
+    return valores[indice.ravel()]
+
+
+def _avaliar_bloco(tarefa):
+    """
+    Avalia o pipeline J_ph → J0 → extração para os pontos [inicio, fim) da
+    grade achatada (ordem C). Função de nível de módulo para poder ser
+    enviada a processos.
+    """
+    inicio, fim, nomes, valores_eixos, fixos, integrador = tarefa
+    forma = tuple(len(v) for v in valores_eixos)
+    indices = np.unravel_index(np.arange(inicio, fim), forma)
+
+    parametros = dict(fixos)
+    for nome, valores, indice in zip(nomes, valores_eixos, indices):
+        parametros[nome] = valores[indice]
+
+    J_ph = avaliar_por_par_distinto(calcular_corrente_fotogerada_limite, parametros["energia_gap_eV"],
+                             parametros["temperatura_sol"], fim - inicio, integrador)
+    J0 = avaliar_por_par_distinto(calcular_corrente_saturacao_radiativa, parametros["energia_gap_eV"],
+                           parametros["temperatura_celula"], fim - inicio, integrador)
+    resultados = extrair_parametros_modelo(
+        J_ph, J0,
+        parametros["temperatura_celula"],
+        parametros["fator_idealidade"],
+        parametros["resistencia_serie"],
+        parametros["resistencia_shunt"],
+    )
+    return inicio, {chave: np.broadcast_to(resultados[chave], (fim - inicio,))
+                    for chave in GRANDEZAS_MAPA}
+
+
+def _coletar_blocos(blocos, saida):
+    """Copia cada bloco (inicio, resultados) para sua posição em `saida`."""
+    for inicio, resultados in blocos:
+        for chave, valores in resultados.items():
+            saida[chave][inicio:inicio + len(valores)] = valores
+
+
+def mapa_eficiencia(eixos: dict,
+                    num_processos: int = None,
+                    tamanho_bloco: int = 50_000,
+                    integrador: str = "trapezio",
+                    **fixos) -> dict:
+    """
+    Mapa de eficiência (Shockley–Queisser com resistências) sobre uma grade
+    N-dimensional de parâmetros.
+
+    Cada ponto da grade passa por J_ph, J0 (com o mesmo integrador da CLI e
+    do lote por padrão, calculados uma vez por par (Eg, T) distinto) e por
+    extrair_parametros_modelo. A grade achatada é dividida em blocos de
+    até `tamanho_bloco` pontos (menores se preciso para gerar ao menos
+    BLOCOS_POR_PROCESSO blocos por processo), distribuídos num pool; os
+    resultados são remontados pela posição de cada bloco, portanto a saída
+    não depende da ordem em que os processos terminam.
+
+    Parâmetros:
+        eixos : dicionário ordenado {nome: valores} com os eixos da grade;
+                nomes válidos são as chaves de PARAMETROS_VARREDURA
+        num_processos : Número de processos (None = os.cpu_count();
+                        1 = executa no processo atual)
+        tamanho_bloco : Máximo de pontos por bloco de trabalho
+        integrador : Integrador de J_ph e J0 (ver
+                     calcular_corrente_fotogerada_limite); "analitico" é
+                     muito mais rápido em grades grandes, mas integra até o
+                     infinito em vez de até 4 eV
+        **fixos : Valores fixos para os parâmetros que não são eixos
+
+    Retorna:
+        dicionário com:
+            - dimensoes: tupla com os nomes dos eixos, na ordem da saída
+            - eixos: {nome: array de valores}
+            - J_sc, V_oc_numerico, FF, Eficiencia, P_max, V_mp: arrays
+              N-dimensionais com forma (len(eixo_1), ..., len(eixo_N))
+    """
+    desconhecidos = (set(eixos) | set(fixos)) - set(PARAMETROS_VARREDURA)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos na varredura: {sorted(desconhecidos)}")
+    if integrador not in INTEGRADORES:
+        raise ValueError(f"Integrador desconhecido: {integrador!r} (use um de {INTEGRADORES})")
+
+    nomes = tuple(eixos)
+    valores_eixos = [np.atleast_1d(np.asarray(eixos[nome], dtype=float)) for nome in nomes]
+    forma = tuple(len(v) for v in valores_eixos)
+    total = int(np.prod(forma))
+
+    valores_fixos = {nome: fixos.get(nome, padrao)
+                     for nome, padrao in PARAMETROS_VARREDURA.items() if nome not in eixos}
+
+    if num_processos is None:
+        num_processos = os.cpu_count() or 1
+    tamanho_bloco = max(1, min(tamanho_bloco,
+                               -(-total // (BLOCOS_POR_PROCESSO * max(num_processos, 1)))))
+
+    tarefas = [(inicio, min(inicio + tamanho_bloco, total), nomes, valores_eixos, valores_fixos,
+                integrador)
+               for inicio in range(0, total, tamanho_bloco)]
+    num_processos = min(num_processos, len(tarefas))
+
+    saida = {chave: np.empty(total) for chave in GRANDEZAS_MAPA}
+    if num_processos <= 1:
+        _coletar_blocos(map(_avaliar_bloco, tarefas), saida)
+    else:
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            _coletar_blocos(executor.map(_avaliar_bloco, tarefas), saida)
+
+    mapa = {
+        "dimensoes": nomes,
+        "eixos": dict(zip(nomes, valores_eixos)),
+    }
+    mapa.update({chave: valores.reshape(forma) for chave, valores in saida.items()})
+    return mapa
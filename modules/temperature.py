@@ -0,0 +1,109 @@
+import numpy as np
+from modules.quantum import propriedades_termicas
+from modules.solar import calcular_corrente_fotogerada_limite
+from modules.device import calcular_corrente_saturacao_radiativa, curvas_JV_lote
+from modules.analysis import extrair_parametros_modelo
+
+MODELOS_J0 = ("radiativo", "ni2")
+
+GRANDEZAS_TEMPERATURA = ("J_sc", "V_oc_numerico", "FF", "Eficiencia", "P_max", "V_mp")
+
+
+def varredura_temperatura(material,
+                          temperaturas,
+                          temperatura_sol: float = 5778.0,
+                          fator_idealidade: float = 1.0,
+                          resistencia_serie: float = 0.0,
+                          resistencia_shunt: float = np.inf,
+                          modelo_J0: str = "radiativo",
+                          temperatura_referencia: float = 300.0,
+                          num_pontos_tensao: int = None,
+                          tensao_min: float = 0.0,
+                          tensao_max: float = 1.2) -> dict:
+    """
+    Pipeline Eg(T) → J_ph, J0 → parâmetros elétricos para um vetor de
+    temperaturas da célula, numa única chamada vetorizada.
+
+    Eg(T), Nc(T), Nv(T) e ni(T) vêm do material (propriedades_termicas, em
+    cache por material); J_ph e J0 usam o integrador analítico, vetorizado
+    em Eg e T, e os parâmetros elétricos vêm de extrair_parametros_modelo.
+    Os coeficientes de temperatura são derivadas numéricas (np.gradient,
+    segunda ordem) ao longo das temperaturas ordenadas.
+
+    Modelos de J0:
+        "radiativo" : J0 radiativo do corpo negro à temperatura T com Eg(T).
+        "ni2" : J0 de difusão, J0(T) = J0_ref · (ni(T) / ni(T_ref))², com
+                J0_ref o J0 radiativo em temperatura_referencia.
+
+    Parâmetros:
+        material : Material (modules.quantum)
+        temperaturas : Temperaturas da célula [K] (ordenadas na saída)
+        temperatura_sol : Temperatura do Sol [K]
+        fator_idealidade : Fator de idealidade do diodo
+        resistencia_serie : Resistência série [Ω·m^2]
+        resistencia_shunt : Resistência shunt [Ω·m^2]
+        modelo_J0 : "radiativo" ou "ni2"
+        temperatura_referencia : Temperatura de referência do modelo "ni2" [K]
+        num_pontos_tensao : Se fornecido, também gera as curvas J-V
+                            (curvas_JV_lote) com esse número de pontos
+        tensao_min, tensao_max : Faixa de tensão das curvas [V]
+
+    Retorna:
+        dicionário com:
+            - temperaturas, energia_gap, Nc, Nv, ni: arrays por temperatura
+            - J_ph, J0 e as grandezas de GRANDEZAS_TEMPERATURA
+            - dVoc_dT [V/K], dEficiencia_dT [1/K], dFF_dT [1/K], dJsc_dT [A/(m²·K)]
+            - coeficiente_Voc, coeficiente_Eficiencia: coeficientes
+              relativos (1/X · dX/dT) [1/K]
+            - tensoes, correntes: curvas J-V (só com num_pontos_tensao)
+    """
+    if modelo_J0 not in MODELOS_J0:
+        raise ValueError(f"Modelo de J0 desconhecido: {modelo_J0!r} (use um de {MODELOS_J0})")
+
+    T = np.unique(np.asarray(temperaturas, dtype=float))
+    if T.size < 2:
+        raise ValueError("São necessárias ao menos duas temperaturas distintas")
+
+    propriedades = propriedades_termicas(material, T)
+    Eg = propriedades["Eg"]
+
+    J_ph = calcular_corrente_fotogerada_limite(Eg, temperatura_sol, integrador="analitico")
+    if modelo_J0 == "radiativo":
+        J0 = calcular_corrente_saturacao_radiativa(Eg, T, integrador="analitico")
+    else:
+        referencia = propriedades_termicas(material, temperatura_referencia)
+        J0_ref = calcular_corrente_saturacao_radiativa(
+            referencia["Eg"], temperatura_referencia, integrador="analitico")
+        J0 = J0_ref * (propriedades["ni"] / referencia["ni"]) ** 2
+
+    resultados = extrair_parametros_modelo(J_ph, J0, T, fator_idealidade,
+                                           resistencia_serie, resistencia_shunt)
+
+    varredura = {
+        "temperaturas": T,
+        "energia_gap": Eg,
+        "Nc": propriedades["Nc"],
+        "Nv": propriedades["Nv"],
+        "ni": propriedades["ni"],
+        "J_ph": J_ph,
+        "J0": J0,
+    }
+    varredura.update((chave, resultados[chave]) for chave in GRANDEZAS_TEMPERATURA)
+
+    V_oc = resultados["V_oc_numerico"]
+    eficiencia = resultados["Eficiencia"]
+    varredura["dVoc_dT"] = np.gradient(V_oc, T, edge_order=2)
+    varredura["dEficiencia_dT"] = np.gradient(eficiencia, T, edge_order=2)
+    varredura["dFF_dT"] = np.gradient(resultados["FF"], T, edge_order=2)
+    varredura["dJsc_dT"] = np.gradient(resultados["J_sc"], T, edge_order=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        varredura["coeficiente_Voc"] = varredura["dVoc_dT"] / V_oc
+        varredura["coeficiente_Eficiencia"] = varredura["dEficiencia_dT"] / eficiencia
+
+    if num_pontos_tensao is not None:
+        varredura["tensoes"], varredura["correntes"] = curvas_JV_lote(
+            J_ph, J0, T, fator_idealidade, resistencia_serie, resistencia_shunt,
+            tensao_min=tensao_min, tensao_max=tensao_max,
+            num_pontos_tensao=num_pontos_tensao,
+        )
+    return varredura
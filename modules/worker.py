@@ -0,0 +1,208 @@
+import multiprocessing as mp
+import queue
+
+from modules.simulation import Simulacao
+
+# Fração do progresso atribuída a cada etapa do cálculo
+FRACAO_INICIO_JV = 0.1
+FRACAO_FIM_JV = 0.95
+
+
+class CalculoCancelado(Exception):
+    """Lançada pelo callback de progresso quando o pedido foi cancelado."""
+
+
+def calcular_simulacao(valores: dict, callback_progresso=None, simulacao=None) -> dict:
+    """
+    Pipeline J_ph → J0 → curva J-V → extração para os valores da
+    calculadora (mesmas chaves de CalculadoraFotovoltaica.obter_valores).
+
+    Parâmetros:
+        valores : dicionário com energia_gap, temp_celula, temp_sol,
+                  fator_idealidade, res_serie, res_shunt, v_max, num_pontos
+        callback_progresso : Função opcional chamada com a fração concluída
+                             (0–1); uma exceção lançada por ela interrompe o
+                             cálculo
+        simulacao : Simulacao reaproveitada entre chamadas (só os nós
+                    afetados pelos valores alterados são recalculados)
+
+    Retorna:
+        dicionário com os valores de entrada, J_ph, J0, tensoes, correntes,
+        resultados (saída de extrair_parametros) e recalculados (nós
+        recalculados)
+    """
+    def progresso(fracao):
+        if callback_progresso is not None:
+            callback_progresso(fracao)
+
+    if simulacao is None:
+        simulacao = Simulacao()
+    simulacao.definir(
+        energia_gap_eV=valores['energia_gap'],
+        temperatura_celula=valores['temp_celula'],
+        temperatura_sol=valores['temp_sol'],
+        fator_idealidade=valores['fator_idealidade'],
+        resistencia_serie=valores['res_serie'],
+        resistencia_shunt=valores['res_shunt'],
+        tensao_max=valores['v_max'],
+        num_pontos_tensao=valores['num_pontos'],
+    )
+    recalculados = []
+
+    J_ph = simulacao.obter("J_ph")
+    recalculados += simulacao.recalculados
+    progresso(FRACAO_INICIO_JV / 2)
+
+    J0 = simulacao.obter("J0")
+    recalculados += simulacao.recalculados
+    progresso(FRACAO_INICIO_JV)
+
+    simulacao.callback_progresso = lambda fracao: progresso(
+        FRACAO_INICIO_JV + fracao * (FRACAO_FIM_JV - FRACAO_INICIO_JV))
+    try:
+        tensoes_V, correntes_J = simulacao.obter("curva_JV")
+        recalculados += simulacao.recalculados
+    finally:
+        simulacao.callback_progresso = None
+
+    resultados = simulacao.obter("resultados")
+    recalculados += simulacao.recalculados
+    progresso(1.0)
+
+    return {
+        "valores": valores,
+        "J_ph": J_ph,
+        "J0": J0,
+        "tensoes": tensoes_V,
+        "correntes": correntes_J,
+        "resultados": resultados,
+        "recalculados": recalculados,
+    }
+
+
+def _laco_trabalhador(pedidos, respostas, cancelar):
+    """
+    Laço do processo de cálculo: atende um pedido por vez e responde com
+    mensagens (tipo, identificador, conteúdo), tipo em "progresso",
+    "resultado", "cancelado" ou "erro". O cancelamento é cooperativo: o
+    callback de progresso verifica o evento entre pontos da curva (laço
+    "newton") ou entre iterações do Newton vetorizado.
+    """
+    simulacao = Simulacao()
+    while True:
+        pedido = pedidos.get()
+        if pedido is None:
+            return
+        identificador, valores = pedido
+
+        def progresso(fracao):
+            if cancelar.is_set():
+                raise CalculoCancelado
+            respostas.put(("progresso", identificador, fracao))
+
+        try:
+            resultado = calcular_simulacao(valores, progresso, simulacao)
+        except CalculoCancelado:
+            respostas.put(("cancelado", identificador, None))
+        except Exception as erro:
+            respostas.put(("erro", identificador, str(erro)))
+        else:
+            respostas.put(("resultado", identificador, resultado))
+
+
+class TrabalhadorCalculo:
+    """
+    Processo de cálculo em segundo plano para a interface gráfica.
+
+    Há no máximo um pedido em execução. Pedidos feitos enquanto outro roda
+    são agrupados: o atual é cancelado e apenas o último pedido recebido
+    fica pendente, sendo enviado quando o processo fica livre. O processo é
+    persistente e mantém uma Simulacao, então cada pedido só recalcula os
+    nós afetados pelos valores que mudaram.
+
+    A interface consulta `mensagens()` periodicamente (root.after), sem
+    nunca bloquear o laço de eventos.
+    """
+
+    def __init__(self):
+        self._contexto = mp.get_context("spawn")
+        self._proximo_id = 0
+        self._em_execucao = None
+        self._pendente = None
+        self._iniciar_processo()
+
+    def _iniciar_processo(self):
+        self._pedidos = self._contexto.Queue()
+        self._respostas = self._contexto.Queue()
+        self._cancelar = self._contexto.Event()
+        self._processo = self._contexto.Process(
+            target=_laco_trabalhador,
+            args=(self._pedidos, self._respostas, self._cancelar),
+            daemon=True,
+        )
+        self._processo.start()
+
+    @property
+    def ocupado(self) -> bool:
+        return self._em_execucao is not None or self._pendente is not None
+
+    def _enviar(self, valores):
+        self._proximo_id += 1
+        self._em_execucao = self._proximo_id
+        self._cancelar.clear()
+        self._pedidos.put((self._em_execucao, valores))
+
+    def submeter(self, valores: dict):
+        """Pede um cálculo; substitui qualquer pedido ainda não iniciado."""
+        if self._em_execucao is None:
+            self._enviar(valores)
+        else:
+            self._pendente = valores
+            self._cancelar.set()
+
+    def cancelar(self):
+        """Cancela o pedido em execução e descarta o pendente."""
+        self._pendente = None
+        if self._em_execucao is not None:
+            self._cancelar.set()
+
+    def mensagens(self) -> list:
+        """
+        Lê, sem bloquear, as mensagens do processo. Retorna apenas as que
+        interessam à interface: progresso e desfecho do pedido atual; o
+        cancelamento de um pedido substituído por outro não é reportado.
+        """
+        saida = []
+        while True:
+            try:
+                tipo, identificador, conteudo = self._respostas.get_nowait()
+            except queue.Empty:
+                break
+            if identificador != self._em_execucao:
+                continue
+            if tipo == "progresso":
+                saida.append((tipo, conteudo))
+                continue
+
+            self._em_execucao = None
+            if self._pendente is not None:
+                valores, self._pendente = self._pendente, None
+                self._enviar(valores)
+                if tipo == "cancelado":
+                    continue
+            saida.append((tipo, conteudo))
+
+        if self._em_execucao is not None and not self._processo.is_alive():
+            self._em_execucao = None
+            self._pendente = None
+            self._iniciar_processo()
+            saida.append(("erro", "O processo de cálculo terminou inesperadamente."))
+        return saida
+
+    def encerrar(self):
+        """Encerra o processo de cálculo."""
+        self._cancelar.set()
+        self._pedidos.put(None)
+        self._processo.join(timeout=1.0)
+        if self._processo.is_alive():
+            self._processo.terminate()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Os testes importam `modules` e `main` a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from modules.analysis import (extrair_parametros, extrair_parametros_lote,
+                              extrair_parametros_modelo)
+from modules.device import (calcular_corrente_saturacao_radiativa, curva_JV_diodo,
+                            curvas_JV_lote)
+from modules.solar import calcular_corrente_fotogerada_limite
+
+TEMPERATURA = 300.0
+J_PH = calcular_corrente_fotogerada_limite(1.12, integrador="analitico")
+J0 = calcular_corrente_saturacao_radiativa(1.12, TEMPERATURA, integrador="analitico")
+
+
+@pytest.mark.parametrize("max_elementos_bloco", [1, 300, 2 ** 20])
+def test_extrair_parametros_lote_concorda_com_curva_a_curva(tmp_path, max_elementos_bloco):
+    J_ph = J_PH * np.linspace(0.4, 1.0, 6)
+    fator_idealidade = np.array([1.0, 1.2, 1.5, 2.0, 1.0, 1.3])
+    resistencia_serie = np.array([0.0, 1e-4, 1e-3, 0.0, 1e-2, 5e-4])
+    resistencia_shunt = np.array([np.inf, 1e3, 1e2, 10.0, np.inf, 1.0])
+    saida = np.memmap(tmp_path / "curvas.dat", dtype=float, mode="w+", shape=(6, 200))
+    tensoes_V, correntes_J = curvas_JV_lote(J_ph, J0, TEMPERATURA, fator_idealidade,
+                                            resistencia_serie, resistencia_shunt,
+                                            num_pontos_tensao=200,
+                                            max_elementos_bloco=max_elementos_bloco,
+                                            saida=saida)
+    lote = extrair_parametros_lote(tensoes_V, correntes_J, J_ph, J0, TEMPERATURA,
+                                   fator_idealidade)
+
+    for i in range(6):
+        curva = curva_JV_diodo(J_ph[i], J0, TEMPERATURA, fator_idealidade[i],
+                               resistencia_serie[i], resistencia_shunt[i],
+                               num_pontos_tensao=200, metodo="lambertw")
+        esperado = extrair_parametros(*curva, J_ph[i], J0, TEMPERATURA, fator_idealidade[i])
+        for chave, valores in lote.items():
+            assert valores.shape == (6,)
+            assert valores[i] == pytest.approx(esperado[chave], rel=1e-12, abs=1e-12), chave
+
+
+@pytest.mark.parametrize("fator_idealidade, resistencia_serie, resistencia_shunt", [
+    (1.0, 0.0, np.inf),
+    (1.3, 1e-4, 1e3),
+    (1.5, 1e-3, 10.0),
+    (2.0, 1e-2, 1.0),
+])
+def test_extrair_parametros_modelo_concorda_com_malha_densa(fator_idealidade, resistencia_serie,
+                                                           resistencia_shunt):
+    modelo = (J_PH, J0, TEMPERATURA, fator_idealidade, resistencia_serie, resistencia_shunt)
+    # Com n alto e J0 radiativo, V_oc passa de 1,2 V
+    tensoes_V, correntes_J = curva_JV_diodo(*modelo, tensao_max=2.0, num_pontos_tensao=200_001,
+                                            metodo="lambertw")
+    passo = tensoes_V[1] - tensoes_V[0]
+    malha = extrair_parametros(tensoes_V, correntes_J, J_PH, J0, TEMPERATURA, fator_idealidade)
+    exato = extrair_parametros_modelo(*modelo)
+
+    assert exato["Convergido"]
+    assert exato["J_sc"] == pytest.approx(malha["J_sc"], rel=1e-12)
+    assert exato["V_oc_ideal"] == pytest.approx(malha["V_oc_ideal"], rel=1e-12)
+    assert abs(exato["V_oc_numerico"] - malha["V_oc_numerico"]) <= passo
+    assert abs(exato["V_mp"] - malha["V_mp"]) <= passo
+    # A malha só amostra P(V): o máximo exato não fica abaixo dela
+    assert malha["P_max"] <= exato["P_max"] <= malha["P_max"] * (1.0 + 1e-8)
+    assert exato["FF"] == pytest.approx(malha["FF"], rel=1e-5)
+
+
+def test_extrair_parametros_modelo_marca_falhas_das_formas_fechadas():
+    # Um dispositivo normal seguido de parâmetros em que J_sc ou V_oc não
+    # são finitos: J_ph NaN, T = 0, Rs infinito, Rsh nulo ou negativo, J0 = 0
+    with np.errstate(all="ignore"):
+        resultado = extrair_parametros_modelo(
+            J_ph=[J_PH, np.nan, J_PH, J_PH, J_PH, J_PH, J_PH],
+            J0=[J0, J0, J0, J0, J0, J0, 0.0],
+            temperatura_celula=[TEMPERATURA, TEMPERATURA, 0.0, TEMPERATURA, TEMPERATURA,
+                                TEMPERATURA, TEMPERATURA],
+            resistencia_serie=[1e-4, 1e-4, 0.0, np.inf, 0.0, 1e-4, 1e-4],
+            resistencia_shunt=[1e3, 1e3, np.inf, 1e2, 0.0, -5.0, np.inf],
+        )
+
+    np.testing.assert_array_equal(resultado["Convergido"], [True] + [False] * 6)
+    falhou = ~(np.isfinite(resultado["J_sc"]) & np.isfinite(resultado["V_oc_numerico"]))
+    np.testing.assert_array_equal(falhou, [False] + [True] * 6)
@@ -0,0 +1,45 @@
+import csv
+import json
+
+from modules.batch import executar_lote
+
+
+def _ler_saida(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return {linha["linha"]: linha for linha in map(json.loads, arquivo)}
+
+
+def test_linhas_invalidas_viram_erro_sem_interromper_o_lote(tmp_path):
+    entrada = tmp_path / "cenarios.csv"
+    with open(entrada, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["material", "energia_gap_eV", "resistencia_serie"])
+        escritor.writerow(["gaas", "1.42", "1e-4"])
+        escritor.writerow(["si", "1.12", "1e-4", "sobrando"])      # colunas extras
+        escritor.writerow(["si", "9.0", "1e-4"])                   # fora dos limites
+        escritor.writerow(["xx", "1.12", "1e-4"])                  # material desconhecido
+        escritor.writerow(["si", "", ""])                          # padrões
+
+    saida = tmp_path / "resultados.jsonl"
+    contagem = executar_lote(entrada, saida, num_processos=1)
+    linhas = _ler_saida(saida)
+
+    assert contagem == {"total": 5, "ok": 2, "erros": 3}
+    assert linhas[2]["status"] == "ok" and linhas[6]["status"] == "ok"
+    assert "Colunas extras" in linhas[3]["erro"]
+    assert "energia_gap_eV" in linhas[4]["erro"]
+    assert "Material desconhecido" in linhas[5]["erro"]
+
+
+def test_json_invalido_e_campo_desconhecido(tmp_path):
+    entrada = tmp_path / "cenarios.jsonl"
+    entrada.write_text('{"energia_gap_eV": 1.3}\n{quebrado\n{"cor": "azul"}\n',
+                       encoding="utf-8")
+
+    saida = tmp_path / "resultados.jsonl"
+    contagem = executar_lote(entrada, saida, num_processos=1)
+    linhas = _ler_saida(saida)
+
+    assert contagem == {"total": 3, "ok": 1, "erros": 2}
+    assert linhas[2]["erro"].startswith("JSON inválido")
+    assert "cor" in linhas[3]["erro"]
@@ -0,0 +1,85 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from modules.cache import (CacheResultados, corrente_fotogerada_em_cache,
+                           corrente_saturacao_em_cache)
+from modules.spectrum import EspectroTabelado, carregar_espectro, salvar_espectro
+
+COMPRIMENTO_ONDA_NM = np.linspace(300.0, 1100.0, 801)
+
+
+def _espectro_plano(irradiancia, identificador=""):
+    return EspectroTabelado(COMPRIMENTO_ONDA_NM,
+                            np.full((1, COMPRIMENTO_ONDA_NM.size), irradiancia), identificador)
+
+
+def test_espectros_diferentes_com_o_mesmo_nome_nao_compartilham_chave():
+    cache = CacheResultados()
+    J_a = corrente_fotogerada_em_cache(1.12, espectro=_espectro_plano(0.2), cache=cache)
+    J_b = corrente_fotogerada_em_cache(1.12, espectro=_espectro_plano(1.0), cache=cache)
+
+    assert J_b == pytest.approx(5.0 * J_a)
+    assert cache.estatisticas()["falhas"] == 2
+
+    # Mesmo conteúdo com outro nome: acerto
+    corrente_fotogerada_em_cache(1.12, espectro=_espectro_plano(1.0, "outro"), cache=cache)
+    assert cache.estatisticas()["acertos_memoria"] == 1
+
+
+def test_arquivo_reescrito_nao_devolve_resultado_antigo(tmp_path):
+    caminho = tmp_path / "espectro.npy"
+    cache = CacheResultados(diretorio=tmp_path / "cache")
+
+    salvar_espectro(caminho, COMPRIMENTO_ONDA_NM, np.full(COMPRIMENTO_ONDA_NM.size, 0.2))
+    J_a = corrente_fotogerada_em_cache(1.12, espectro=carregar_espectro(caminho), cache=cache)
+    salvar_espectro(caminho, COMPRIMENTO_ONDA_NM, np.full(COMPRIMENTO_ONDA_NM.size, 1.0))
+    J_b = corrente_fotogerada_em_cache(1.12, espectro=carregar_espectro(caminho),
+                                       cache=CacheResultados(diretorio=tmp_path / "cache"))
+
+    assert J_b == pytest.approx(5.0 * J_a)
+
+
+def test_entradas_nao_escalares_sao_rejeitadas():
+    cache = CacheResultados()
+    serie = EspectroTabelado(COMPRIMENTO_ONDA_NM, np.ones((3, COMPRIMENTO_ONDA_NM.size)))
+
+    with pytest.raises(ValueError, match="Séries"):
+        corrente_fotogerada_em_cache(1.12, espectro=serie, cache=cache)
+    with pytest.raises(ValueError, match="energia_gap_eV"):
+        corrente_fotogerada_em_cache(np.array([1.1, 1.4]), cache=cache)
+    with pytest.raises(ValueError, match="temperatura_celula"):
+        corrente_saturacao_em_cache(1.12, np.array([300.0, 310.0]), cache=cache)
+
+
+def test_acerto_em_disco_entre_instancias(tmp_path):
+    primeiro = CacheResultados(diretorio=tmp_path)
+    J0 = corrente_saturacao_em_cache(1.12, cache=primeiro)
+
+    segundo = CacheResultados(diretorio=tmp_path)
+    assert corrente_saturacao_em_cache(1.12, cache=segundo) == J0
+    assert segundo.estatisticas()["acertos_disco"] == 1
+
+
+def test_invalidar_so_remove_arquivos_do_cache(tmp_path):
+    cache = CacheResultados(diretorio=tmp_path)
+    corrente_saturacao_em_cache(1.12, cache=cache)
+    corrente_saturacao_em_cache(1.4, cache=cache)
+    (tmp_path / "config.json").write_text("{}", encoding="utf-8")
+    (tmp_path / ("a" * 64 + ".json")).write_text(json.dumps({"outro": 1}), encoding="utf-8")
+
+    cache.invalidar()
+
+    assert sorted(os.listdir(tmp_path)) == sorted(["config.json", "a" * 64 + ".json"])
+
+
+def test_diretorio_com_til_e_expandido(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    cache = CacheResultados()
+    cache.diretorio = "~/.cache/fotovoltaico"
+    corrente_saturacao_em_cache(1.12, cache=cache)
+
+    assert cache.diretorio == str(tmp_path / ".cache" / "fotovoltaico")
+    assert len(os.listdir(tmp_path / ".cache" / "fotovoltaico")) == 1
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from modules import circuit
+from modules.circuit import curva_IV_arranjo
+from modules.constants import AREA_CELULA_PADRAO
+from modules.device import tensao_diodo_lambertw
+
+J0 = 1e-10
+TEMPERATURA = 300.0
+FATOR_IDEALIDADE = 1.2
+TENSAO_BYPASS = 0.5
+TENSAO_RUPTURA = -20.0
+
+
+def _tensoes_celula(correntes_I, J_ph, resistencia_serie, resistencia_shunt):
+    """V(I) exato de uma célula, limitado à ruptura."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tensoes = tensao_diodo_lambertw(correntes_I / AREA_CELULA_PADRAO, J_ph, J0, TEMPERATURA,
+                                        FATOR_IDEALIDADE, resistencia_serie, resistencia_shunt)
+    return np.fmax(tensoes, TENSAO_RUPTURA)
+
+
+@pytest.mark.parametrize("resistencia_shunt", [0.05, 10.0, 1e4])
+def test_tabela_concorda_com_composicao_exata(monkeypatch, resistencia_shunt):
+    # Descasamento e sombreamento parcial: centenas de células distintas
+    # com a mesma junção, o caso em que _tensoes_subcadeias usa a tabela
+    gerador = np.random.default_rng(0)
+    forma = (2, 4, 3, 24)
+    J_ph = gerador.normal(400.0, 8.0, forma)
+    J_ph[:, 0, 1, :5] *= 0.3
+    resistencia_serie = gerador.uniform(1e-5, 1e-3, forma)
+
+    tabelas = []
+    tabela_juncao = circuit._tabela_juncao
+    monkeypatch.setattr(circuit, "_tabela_juncao",
+                        lambda *args: tabelas.append(args) or tabela_juncao(*args))
+    resultado = curva_IV_arranjo(J_ph, J0, TEMPERATURA, FATOR_IDEALIDADE, resistencia_serie,
+                                 resistencia_shunt, modulos_por_string=4, num_strings=2)
+    assert len(tabelas) == 1
+
+    tensoes_celulas = _tensoes_celula(resultado["grade_corrente_I"], J_ph[..., None],
+                                      resistencia_serie[..., None], resistencia_shunt)
+    tensoes_subcadeias = np.maximum(tensoes_celulas.sum(axis=3), -TENSAO_BYPASS)
+    esperado = tensoes_subcadeias.sum(axis=(1, 2))
+    assert np.max(np.abs(resultado["tensoes_strings_V"] - esperado)) < 1e-7
+
+
+def test_diodo_de_bypass_limita_subcadeia_sombreada():
+    J_ph = np.full((1, 1, 3, 24), 400.0)
+    J_ph[0, 0, 0, 0] = 120.0
+    # Ruptura abaixo da soma das outras 23 células, para o bypass conduzir
+    resultado = curva_IV_arranjo(J_ph, J0, TEMPERATURA, FATOR_IDEALIDADE, 1e-4, 1e4,
+                                 modulos_por_string=1, num_strings=1, tensao_ruptura=-40.0)
+
+    # Acima da corrente da célula sombreada a subcadeia dela é desviada
+    correntes_I = resultado["grade_corrente_I"]
+    desviada = ((correntes_I > 1.1 * 120.0 * AREA_CELULA_PADRAO)
+                & (correntes_I < 0.9 * 400.0 * AREA_CELULA_PADRAO))
+    assert desviada.any()
+    tensao_subcadeia = 24 * _tensoes_celula(correntes_I[desviada], 400.0, 1e-4, 1e4)
+    np.testing.assert_allclose(resultado["tensoes_strings_V"][0, desviada],
+                               2 * tensao_subcadeia - TENSAO_BYPASS, atol=1e-9)
+
+
+def test_sombreamento_parcial_gera_multiplos_maximos_locais():
+    # Metade das subcadeias a 30 % da irradiância: dois degraus na curva I-V
+    J_ph = np.full((1, 2, 3, 24), 400.0)
+    J_ph[0, 1] = 120.0
+    resultado = curva_IV_arranjo(J_ph, J0, TEMPERATURA, FATOR_IDEALIDADE, 1e-4, 1e4,
+                                 modulos_por_string=2, num_strings=1)
+
+    maximos = resultado["maximos_locais"]
+    potencias_W = resultado["potencias_W"]
+    assert maximos.size >= 2
+    assert resultado["P_max"] == potencias_W.max()
+    assert np.argmax(potencias_W) in maximos
+    # O máximo global não é o de maior tensão (subcadeias sombreadas ativas)
+    assert resultado["V_mp"] < resultado["tensoes_V"][maximos[-1]]
+
+
+def test_arranjo_soma_correntes_das_strings():
+    gerador = np.random.default_rng(1)
+    J_ph = gerador.normal(400.0, 20.0, (3, 2, 3, 24))
+    resultado = curva_IV_arranjo(J_ph, J0, TEMPERATURA, FATOR_IDEALIDADE, 1e-4, 1e4,
+                                 modulos_por_string=2, num_strings=3)
+
+    esperado = sum(np.interp(resultado["tensoes_V"], tensoes[::-1],
+                             resultado["grade_corrente_I"][::-1])
+                   for tensoes in resultado["tensoes_strings_V"])
+    np.testing.assert_allclose(resultado["correntes_I"], esperado, rtol=0, atol=1e-12)
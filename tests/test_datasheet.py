@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+
+from modules import datasheet
+from modules.constants import AREA_CELULA_PADRAO, k_B, q
+from modules.datasheet import (DELTA_T_COEFICIENTE, TEMPERATURA_REFERENCIA,
+                               extrair_parametros_datasheet)
+from modules.device import corrente_diodo_lambertw
+
+ENERGIA_GAP_EV = 1.12
+
+
+def _folha_de_dados(J_ph, J0, n, Rs, Rsh, num_celulas, coef_J_ph):
+    """
+    Valores de folha de dados de um módulo com células idênticas, pelo
+    mesmo modelo de extrair_parametros_datasheet (inclusive a lei de
+    temperatura de J_ph e J0), parametrizados pela tensão de junção V_j.
+    """
+    def ponto(V_j, J_ph, J0, T):
+        tensao_termica = n * k_B * T / q
+        J = J_ph - J0 * np.expm1(V_j / tensao_termica) - V_j / Rsh
+        D = J0 / tensao_termica * np.exp(V_j / tensao_termica) + 1.0 / Rsh
+        return J, V_j - J * Rs, D
+
+    def raiz(funcao):
+        return brentq(funcao, -1.0, 1.5, xtol=1e-15, rtol=4 * np.finfo(float).eps)
+
+    def V_oc(J_ph, J0, T):
+        return raiz(lambda V_j: ponto(V_j, J_ph, J0, T)[0])
+
+    T = TEMPERATURA_REFERENCIA
+    J_sc = ponto(raiz(lambda V_j: ponto(V_j, J_ph, J0, T)[1]), J_ph, J0, T)[0]
+    # dP/dV_j = J dV/dV_j + V dJ/dV_j = J (1 + Rs D) - V D
+    J_mp, V_mp, _ = ponto(raiz(lambda V_j: (lambda J, V, D: J * (1.0 + Rs * D) - V * D)(
+        *ponto(V_j, J_ph, J0, T))), J_ph, J0, T)
+
+    T2 = T + DELTA_T_COEFICIENTE
+    J0_2 = J0 * (T2 / T) ** 3 * np.exp(ENERGIA_GAP_EV * q / k_B * (1.0 / T - 1.0 / T2))
+    J_ph_2 = J_ph + coef_J_ph * DELTA_T_COEFICIENTE
+
+    A = AREA_CELULA_PADRAO
+    return {
+        "V_oc": num_celulas * V_oc(J_ph, J0, T),
+        "I_sc": J_sc * A,
+        "V_mp": num_celulas * V_mp,
+        "I_mp": J_mp * A,
+        "coef_V_oc": num_celulas * (V_oc(J_ph_2, J0_2, T2) - V_oc(J_ph, J0, T)) / DELTA_T_COEFICIENTE,
+        "coef_I_sc": coef_J_ph * A,
+        "num_celulas_serie": num_celulas,
+    }
+
+
+@pytest.mark.parametrize("J_ph, J0, n, Rs, Rsh, num_celulas", [
+    (380.0, 5e-9, 1.05, 1.2e-4, 0.2, 60),
+    (410.0, 2e-8, 1.15, 2.0e-4, 0.5, 72),
+    (240.0, 1e-9, 1.00, 0.5e-4, 0.1, 36),
+])
+def test_ida_e_volta_parametros_folha_de_dados(J_ph, J0, n, Rs, Rsh, num_celulas):
+    folha = _folha_de_dados(J_ph, J0, n, Rs, Rsh, num_celulas, coef_J_ph=0.2)
+    parametros = extrair_parametros_datasheet(**folha, energia_gap_eV=ENERGIA_GAP_EV)
+
+    assert parametros["Status"][0] == "convergido"
+    np.testing.assert_allclose(
+        [parametros[chave][0] for chave in ("J_ph", "J0", "fator_idealidade",
+                                            "resistencia_serie", "resistencia_shunt")],
+        [J_ph, J0, n, Rs, Rsh], rtol=1e-6)
+
+
+def test_modulos_tipicos_convergem():
+    # 36, 60 e 72 células com valores arredondados de catálogo; os de 60 e
+    # 72 células só são reproduzidos exatamente com Rsh negativo
+    V_oc = np.array([22.0, 37.8, 47.2])
+    I_sc = np.array([5.50, 9.00, 9.82])
+    V_mp = np.array([17.6, 30.5, 38.5])
+    I_mp = np.array([5.11, 8.53, 9.36])
+    parametros = extrair_parametros_datasheet(V_oc, I_sc, V_mp, I_mp, -0.0031 * V_oc,
+                                              0.0005 * I_sc, [36, 60, 72])
+
+    assert list(parametros["Status"]) == ["convergido", "rsh_infinito", "rsh_infinito"]
+    np.testing.assert_array_equal(parametros["R_sh"][1:], np.inf)
+
+    # Os parâmetros por célula reproduzem I_sc, I_mp e V_oc do catálogo
+    num_celulas = np.array([36, 60, 72])
+    tensoes_celula = np.stack([np.zeros(3), V_mp, V_oc], axis=1) / num_celulas[:, None]
+    correntes_I = AREA_CELULA_PADRAO * corrente_diodo_lambertw(
+        tensoes_celula, *(parametros[chave][:, None] for chave in ("J_ph", "J0")),
+        TEMPERATURA_REFERENCIA,
+        *(parametros[chave][:, None] for chave in ("fator_idealidade", "resistencia_serie",
+                                                   "resistencia_shunt")))
+    np.testing.assert_allclose(correntes_I, np.stack([I_sc, I_mp, np.zeros(3)], axis=1),
+                               rtol=0, atol=1e-9)
+
+
+def test_nao_convergido_sem_iteracoes_suficientes():
+    folha = _folha_de_dados(380.0, 5e-9, 1.05, 1.2e-4, 0.2, 60, coef_J_ph=0.2)
+    parametros = extrair_parametros_datasheet(**folha, max_iteracoes=1)
+
+    assert parametros["Status"][0] == "nao_convergido"
+    assert parametros["Iteracoes"][0] == 1
+    assert np.isnan(parametros["R_s"][0])
+
+
+def test_mal_condicionado(monkeypatch):
+    monkeypatch.setattr(datasheet, "LIMITE_CONDICIONAMENTO", 1.0)
+    folha = _folha_de_dados(380.0, 5e-9, 1.05, 1.2e-4, 0.2, 60, coef_J_ph=0.2)
+    parametros = extrair_parametros_datasheet(**folha)
+
+    assert parametros["Status"][0] == "mal_condicionado"
+    assert parametros["Numero_condicao"][0] > 1.0
+    assert np.isfinite(parametros["R_s"][0])
+
+
+def test_entradas_invalidas_nao_interrompem_o_lote():
+    # I_mp ≥ I_sc, V_mp ≥ V_oc e coeficiente ausente, ao lado de um módulo válido
+    parametros = extrair_parametros_datasheet(
+        V_oc=[38.3, 38.3, 38.3, 38.3], I_sc=[9.26, 9.26, 9.26, 9.26],
+        V_mp=[31.2, 31.2, 38.3, 31.2], I_mp=[8.65, 9.26, 8.65, 8.65],
+        coef_V_oc=[-0.12, -0.12, -0.12, np.nan], coef_I_sc=0.0046, num_celulas_serie=60)
+
+    assert list(parametros["Status"]) == ["convergido", "invalido", "invalido", "invalido"]
+    assert np.isnan(parametros["I_L"][1:]).all()
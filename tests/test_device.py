@@ -0,0 +1,247 @@
+import numpy as np
+import pytest
+
+from modules.constants import k_B, q
+from modules.device import (_newton_vetorizado, calcular_corrente_saturacao_radiativa,
+                            corrente_diodo_lambertw, curva_JV_diodo, curvas_JV_lote,
+                            tensao_diodo_lambertw, tensao_maxima_potencia)
+from modules.solar import calcular_corrente_fotogerada_limite
+
+# Faixas dos sliders da interface gráfica: Rs em 10^[-6, 0], Rsh em
+# 10^[-2, 6] Ω·m², n em [1, 3]; mais os casos limite Rs = 0 e Rsh = ∞
+RESISTENCIAS_SERIE = (0.0, *np.logspace(-6.0, 0.0, 7))
+RESISTENCIAS_SHUNT = (*np.logspace(-2.0, 6.0, 5), np.inf)
+FATORES_IDEALIDADE = (1.0, 2.0, 3.0)
+
+TEMPERATURA = 300.0
+J_PH = calcular_corrente_fotogerada_limite(1.12, integrador="analitico")
+J0 = calcular_corrente_saturacao_radiativa(1.12, TEMPERATURA, integrador="analitico")
+TENSOES_V = np.linspace(0.0, 1.2, 400)
+
+
+def _erro_relativo(J, J_referencia):
+    """Erro relativo a |J|, com piso de 1 A/m² perto de J = 0."""
+    return np.max(np.abs(J - J_referencia) / np.maximum(1.0, np.abs(J_referencia)))
+
+
+@pytest.mark.parametrize("fator_idealidade", FATORES_IDEALIDADE)
+@pytest.mark.parametrize("resistencia_shunt", RESISTENCIAS_SHUNT)
+@pytest.mark.parametrize("resistencia_serie", RESISTENCIAS_SERIE)
+def test_lambertw_concorda_com_newton_vetorizado(resistencia_serie, resistencia_shunt,
+                                                 fator_idealidade):
+    J_lambertw = corrente_diodo_lambertw(TENSOES_V, J_PH, J0, TEMPERATURA, fator_idealidade,
+                                         resistencia_serie, resistencia_shunt)
+    J_newton, _, convergido = _newton_vetorizado(
+        TENSOES_V, J_PH, J0, q / (fator_idealidade * k_B * TEMPERATURA),
+        resistencia_serie, 1.0 / resistencia_shunt,
+    )
+
+    assert convergido.all()
+    assert _erro_relativo(J_newton, J_lambertw) < 1e-9
+
+
+@pytest.mark.parametrize("fator_idealidade", FATORES_IDEALIDADE)
+@pytest.mark.parametrize("resistencia_shunt", RESISTENCIAS_SHUNT)
+@pytest.mark.parametrize("resistencia_serie", [Rs for Rs in RESISTENCIAS_SERIE if Rs <= 1e-3])
+def test_lambertw_concorda_com_newton_escalar(resistencia_serie, resistencia_shunt,
+                                              fator_idealidade):
+    # O laço "newton" só converge em 50 iterações com Rs pequeno; acima de
+    # ~1e-3 Ω·m² ele para antes da convergência
+    _, J_newton = curva_JV_diodo(J_PH, J0, TEMPERATURA, fator_idealidade,
+                                 resistencia_serie, resistencia_shunt)
+    J_lambertw = corrente_diodo_lambertw(TENSOES_V, J_PH, J0, TEMPERATURA, fator_idealidade,
+                                         resistencia_serie, resistencia_shunt)
+
+    assert _erro_relativo(J_newton, J_lambertw) < 1e-9
+
+
+def test_curva_JV_newton_vetorizado_concorda_com_lambertw_com_rs_alto():
+    # Padrão da interface gráfica (Rs = 0,5 Ω·m²), onde o laço "newton" falha
+    _, J_newton = curva_JV_diodo(J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4,
+                                 metodo="newton_vetorizado")
+    _, J_lambertw = curva_JV_diodo(J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4, metodo="lambertw")
+
+    assert _erro_relativo(J_newton, J_lambertw) < 1e-9
+
+
+@pytest.mark.parametrize("palpite", ["curva_rs_baixo", "muito_alto", "muito_baixo"])
+def test_newton_vetorizado_converge_com_partida_a_quente_ruim(palpite):
+    # Palpite longe da raiz com Rs alto: o intervalo inicial vinha do resíduo
+    # com expoente limitado (~1e31 A/m² de largura) e a bissecção esgotava
+    # as iterações em 220 dos 400 pontos
+    J_inicial = {
+        "curva_rs_baixo": corrente_diodo_lambertw(TENSOES_V, J_PH, J0, TEMPERATURA, 1.0,
+                                                  1e-4, 1e2),
+        "muito_alto": np.full(TENSOES_V.shape, 1e6),
+        "muito_baixo": np.full(TENSOES_V.shape, -1e6),
+    }[palpite]
+    J_lambertw = corrente_diodo_lambertw(TENSOES_V, J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4)
+
+    J_newton, iteracoes, convergido = _newton_vetorizado(
+        TENSOES_V, J_PH, J0, q / (k_B * TEMPERATURA), 0.5, 1e-4, J_inicial=J_inicial,
+    )
+    assert convergido.all()
+    assert iteracoes.max() < 30
+    assert _erro_relativo(J_newton, J_lambertw) < 1e-9
+
+    _, J_curva = curva_JV_diodo(J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4,
+                                metodo="newton_vetorizado", J_inicial=J_inicial)
+    assert _erro_relativo(J_curva, J_lambertw) < 1e-9
+
+
+@pytest.mark.parametrize("energia_gap_eV", [2.5, 3.0, 4.0])
+def test_newton_vetorizado_com_gap_largo(energia_gap_eV):
+    # J0 < 1e-40 A/m²: perto de V_oc o expoente passa de LIMITE_EXPOENTE
+    J_ph = calcular_corrente_fotogerada_limite(energia_gap_eV, integrador="analitico")
+    J0 = calcular_corrente_saturacao_radiativa(energia_gap_eV, TEMPERATURA,
+                                               integrador="analitico")
+    tensoes_V = np.linspace(0.0, energia_gap_eV, 400)
+    J_lambertw = corrente_diodo_lambertw(tensoes_V, J_ph, J0, TEMPERATURA, 1.0, 1e-4, 1e2)
+
+    J_newton, _, convergido = _newton_vetorizado(
+        tensoes_V, J_ph, J0, q / (k_B * TEMPERATURA), 1e-4, 1e-2,
+    )
+    assert convergido.all()
+    assert _erro_relativo(J_newton, J_lambertw) < 1e-9
+
+
+def test_pontos_que_falham_a_quente_sao_refeitos_a_frio(monkeypatch):
+    from modules import device
+
+    resolver = device._newton_vetorizado
+
+    def falha_a_quente(*argumentos, J_inicial=None, **opcoes):
+        J, iteracoes, convergido = resolver(*argumentos, J_inicial=J_inicial, **opcoes)
+        if J_inicial is not None:
+            convergido[::3] = False
+        return J, iteracoes, convergido
+
+    monkeypatch.setattr(device, "_newton_vetorizado", falha_a_quente)
+    _, J_curva = curva_JV_diodo(J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4,
+                                metodo="newton_vetorizado", J_inicial=np.zeros(400))
+    J_lambertw = corrente_diodo_lambertw(TENSOES_V, J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4)
+
+    assert np.isfinite(J_curva).all()
+    assert _erro_relativo(J_curva, J_lambertw) < 1e-9
+
+
+class _Cancelado(Exception):
+    pass
+
+
+def test_newton_vetorizado_informa_progresso_a_cada_iteracao():
+    fracoes = []
+    curva_JV_diodo(J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4, metodo="newton_vetorizado",
+                   callback_progresso=fracoes.append)
+
+    assert len(fracoes) > 2
+    assert fracoes == sorted(fracoes)
+    assert 0.0 <= fracoes[0] < 1.0 and fracoes[-1] == 1.0
+
+
+def test_newton_vetorizado_cancelado_na_primeira_iteracao():
+    fracoes = []
+
+    def cancelar(fracao):
+        fracoes.append(fracao)
+        raise _Cancelado
+
+    with pytest.raises(_Cancelado):
+        curva_JV_diodo(J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4, metodo="newton_vetorizado",
+                       callback_progresso=cancelar)
+    assert len(fracoes) == 1 and fracoes[0] < 1.0
+
+
+def test_progresso_da_partida_a_quente_continua_no_refazer_a_frio():
+    fracoes = []
+    J_lambertw = corrente_diodo_lambertw(TENSOES_V, J_PH, J0, TEMPERATURA, 1.0, 1e-4, 1e2)
+    # Palpite da curva com Rs/Rsh bem diferentes: parte dos pontos refeita a frio
+    curva_JV_diodo(J_PH, J0, TEMPERATURA, 1.0, 0.5, 1e4, metodo="newton_vetorizado",
+                   J_inicial=J_lambertw, callback_progresso=fracoes.append)
+
+    assert fracoes == sorted(fracoes)
+    assert fracoes[-1] == 1.0
+
+
+@pytest.mark.parametrize("energia_gap_eV, fator_idealidade, resistencia_serie, resistencia_shunt", [
+    (1.12, 1.0, 0.0, np.inf),
+    (1.12, 1.2, 1e-4, 1e2),
+    (1.42, 1.0, 5e-5, 1e3),
+    (1.12, 1.5, 5e-4, 10.0),
+])
+def test_malha_adaptativa_equivale_a_malha_uniforme_de_2000_pontos(
+        energia_gap_eV, fator_idealidade, resistencia_serie, resistencia_shunt):
+    J_ph = calcular_corrente_fotogerada_limite(energia_gap_eV, integrador="analitico")
+    modelo = (J_ph, calcular_corrente_saturacao_radiativa(energia_gap_eV, TEMPERATURA,
+                                                          integrador="analitico"),
+              TEMPERATURA, fator_idealidade, resistencia_serie, resistencia_shunt)
+    adaptativa = curva_JV_diodo(*modelo, metodo="lambertw", malha="adaptativa")
+    uniforme = curva_JV_diodo(*modelo, num_pontos_tensao=2000, metodo="lambertw")
+    assert adaptativa[0].size < 200
+
+    V_mp, _ = tensao_maxima_potencia(*modelo)
+    P_max = V_mp * corrente_diodo_lambertw(V_mp, *modelo)
+    V_oc = tensao_diodo_lambertw(0.0, *modelo)
+    # V_oc e P_max pelo menos tão precisos quanto na malha uniforme
+    erros = [(abs(np.max(tensoes_V * correntes_J) - P_max),
+              abs(np.interp(0.0, -correntes_J, tensoes_V) - V_oc))
+             for tensoes_V, correntes_J in (adaptativa, uniforme)]
+    assert erros[0][0] <= erros[1][0] and erros[0][1] <= erros[1][1]
+
+    # Erro de interpolação (J limitado a ±J_ph) da ordem da tolerância
+    tensoes_V = np.linspace(0.0, 1.2, 100_001)
+    referencia = np.clip(corrente_diodo_lambertw(tensoes_V, *modelo), -J_ph, J_ph)
+    interpolada = np.clip(np.interp(tensoes_V, *adaptativa), -J_ph, J_ph)
+    assert np.max(np.abs(interpolada - referencia)) < 2e-4 * J_ph
+
+
+def _lote_variado():
+    """Sete dispositivos com n, Rs e Rsh diferentes (incluindo Rs = 0 e Rsh = ∞)."""
+    return {
+        "J_ph": J_PH * np.linspace(0.5, 1.0, 7),
+        "J0": J0,
+        "temperatura_celula": TEMPERATURA,
+        "fator_idealidade": np.array([1.0, 1.3, 2.0, 1.0, 1.5, 3.0, 1.1]),
+        "resistencia_serie": np.array([0.0, 1e-4, 1e-3, 1e-2, 0.0, 1e-5, 0.5]),
+        "resistencia_shunt": np.array([np.inf, 1e2, 1e4, np.inf, 1.0, 1e-2, 1e6]),
+    }
+
+
+@pytest.mark.parametrize("metodo", ["lambertw", "newton_vetorizado"])
+@pytest.mark.parametrize("max_elementos_bloco", [1, 50, 149, 150, 2 ** 20])
+def test_curvas_JV_lote_independe_dos_blocos(metodo, max_elementos_bloco):
+    # 50 tensões: blocos de 1 linha (inclusive com menos elementos que uma
+    # linha), de 2 linhas com resto e de 3 linhas exatas, e o lote inteiro
+    lote = _lote_variado()
+    _, referencia = curvas_JV_lote(**lote, num_pontos_tensao=50, metodo=metodo,
+                                   max_elementos_bloco=7 * 50)
+    _, correntes_J = curvas_JV_lote(**lote, num_pontos_tensao=50, metodo=metodo,
+                                    max_elementos_bloco=max_elementos_bloco)
+    np.testing.assert_array_equal(correntes_J, referencia)
+
+
+@pytest.mark.parametrize("metodo", ["lambertw", "newton_vetorizado"])
+def test_curvas_JV_lote_concorda_com_curva_JV_diodo(metodo):
+    lote = _lote_variado()
+    tensoes_V, correntes_J = curvas_JV_lote(**lote, num_pontos_tensao=120, metodo=metodo,
+                                            max_elementos_bloco=250)
+    for i, linha in enumerate(correntes_J):
+        parametros = {chave: np.broadcast_to(valor, (7,))[i] for chave, valor in lote.items()}
+        tensoes_curva, correntes_curva = curva_JV_diodo(
+            *parametros.values(), num_pontos_tensao=120, metodo=metodo)
+        np.testing.assert_array_equal(tensoes_V, tensoes_curva)
+        assert _erro_relativo(linha, correntes_curva) < 1e-9
+
+
+def test_curvas_JV_lote_grava_na_saida_memmap(tmp_path):
+    lote = _lote_variado()
+    caminho = tmp_path / "curvas.dat"
+    saida = np.memmap(caminho, dtype=float, mode="w+", shape=(7, 60))
+    _, correntes_J = curvas_JV_lote(**lote, num_pontos_tensao=60, max_elementos_bloco=100,
+                                    saida=saida)
+    assert correntes_J is saida
+    saida.flush()
+
+    _, referencia = curvas_JV_lote(**lote, num_pontos_tensao=60)
+    np.testing.assert_array_equal(np.memmap(caminho, dtype=float, mode="r", shape=(7, 60)),
+                                  referencia)
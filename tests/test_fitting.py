@@ -0,0 +1,35 @@
+import numpy as np
+
+from benchmarks.fitting_throughput import gerar_curvas
+from modules import fitting
+
+
+def test_curvas_sem_ruido_convergem():
+    tensoes_V, correntes_J, referencia = gerar_curvas(50, 120, 0.0)
+    ajuste = fitting.ajustar_curvas_JV(tensoes_V, correntes_J)
+
+    assert ajuste["Convergido"].all()
+    assert not ajuste["Estagnado"].any()
+    np.testing.assert_allclose(ajuste["fator_idealidade"], referencia["fator_idealidade"],
+                               rtol=1e-8)
+
+
+def test_ajuste_travado_fora_do_minimo_nao_conta_como_convergido(monkeypatch):
+    tensoes_V, correntes_J, _ = gerar_curvas(5, 120, 0.05)
+    avaliar = fitting._avaliar
+    chamadas = []
+
+    def rejeita_passos(*argumentos):
+        # Só a avaliação inicial vale; todo passo proposto aumenta o custo
+        residuo, jacobiano, custo = avaliar(*argumentos)
+        chamadas.append(None)
+        if len(chamadas) > 1:
+            custo = np.full_like(custo, np.inf)
+        return residuo, jacobiano, custo
+
+    monkeypatch.setattr(fitting, "_avaliar", rejeita_passos)
+    ajuste = fitting.ajustar_curvas_JV(tensoes_V, correntes_J)
+
+    assert ajuste["Estagnado"].all()
+    assert not ajuste["Convergido"].any()
+    assert (ajuste["Iteracoes"] < 100).all()
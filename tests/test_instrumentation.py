@@ -0,0 +1,37 @@
+import numpy as np
+
+from modules import device
+from modules.device import curva_JV_diodo, curvas_JV_lote
+from modules.instrumentation import instrumentar
+
+J_PH, J0 = 535.0, 1e-12
+
+
+def test_eventos_limite_somam_os_das_curvas_registradas(monkeypatch):
+    # Limite baixo para que o solver vetorizado também produza eventos
+    monkeypatch.setattr(device, "LIMITE_LOG_DIODO", -20.0)
+
+    with instrumentar() as relatorio:
+        curva_JV_diodo(J_PH, J0, resistencia_serie=0.5, resistencia_shunt=1e4,
+                       metodo="newton")
+        curva_JV_diodo(J_PH, J0, resistencia_serie=0.5, resistencia_shunt=1e4,
+                       metodo="newton_vetorizado")
+        curvas_JV_lote(np.full(8, J_PH), J0, resistencia_serie=0.5,
+                       resistencia_shunt=1e4, metodo="newton_vetorizado")
+
+    por_curva = [curva["eventos_limite"] for curva in relatorio.curvas]
+    assert len(por_curva) == 2 and all(eventos > 0 for eventos in por_curva)
+    assert relatorio.eventos_limite == sum(por_curva)
+    assert relatorio.para_dict()["total_nao_convergidos"] == sum(
+        len(curva["nao_convergidos"]) for curva in relatorio.curvas)
+
+
+def test_lote_nao_conta_eventos_sem_curva_registrada(monkeypatch):
+    monkeypatch.setattr(device, "LIMITE_LOG_DIODO", -20.0)
+
+    with instrumentar() as relatorio:
+        curvas_JV_lote(np.full(8, J_PH), J0, resistencia_serie=0.5,
+                       resistencia_shunt=1e4, metodo="newton_vetorizado")
+
+    assert relatorio.curvas == []
+    assert relatorio.eventos_limite == 0
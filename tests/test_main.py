@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+VERIFICACAO = """
+import runpy, sys
+sys.argv = ["main.py", "--sem-graficos"]
+runpy.run_path("main.py", run_name="__main__")
+print(json.dumps(sorted(nome for nome in sys.modules
+                        if nome.split(".")[0] in ("matplotlib", "tkinter", "scipy"))))
+"""
+
+
+def test_execucao_sem_graficos_nao_importa_matplotlib_nem_tk():
+    saida = subprocess.run(
+        [sys.executable, "-c", "import json\n" + VERIFICACAO],
+        cwd=RAIZ, capture_output=True, text=True, check=True, timeout=120,
+    ).stdout
+
+    assert "Eficiência" in saida
+    assert json.loads(saida.strip().splitlines()[-1]) == []
+
+
+def test_varredura_temperatura_usa_resistencias_da_linha_de_comando(monkeypatch, capsys):
+    import main
+
+    chamadas = []
+    varredura = main.varredura_temperatura
+
+    def espiao(material, temperaturas, **opcoes):
+        chamadas.append(opcoes)
+        return varredura(material, temperaturas, **opcoes)
+
+    monkeypatch.setattr(main, "varredura_temperatura", espiao)
+    main.main(["--varredura-temperatura", "280", "320", "5"])
+    main.main(["--varredura-temperatura", "280", "320", "5", "--rs", "1e-4", "--rsh", "100"])
+    capsys.readouterr()
+
+    padrao = {"resistencia_serie": main.CAMPOS_CENARIO["resistencia_serie"][0],
+              "resistencia_shunt": main.CAMPOS_CENARIO["resistencia_shunt"][0]}
+    assert chamadas == [padrao, {"resistencia_serie": 1e-4, "resistencia_shunt": 100.0}]
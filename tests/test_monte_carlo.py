@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from modules.analysis import extrair_parametros_modelo
+from modules.device import calcular_corrente_saturacao_radiativa
+from modules.monte_carlo import simular_monte_carlo
+from modules.solar import calcular_corrente_fotogerada_limite
+
+DISTRIBUICOES = {"energia_gap_eV": 1.12, "resistencia_serie": 1e-4, "resistencia_shunt": 1e3}
+
+
+@pytest.mark.parametrize("integrador", ["trapezio", "analitico"])
+def test_amostras_usam_o_integrador_do_pipeline(integrador):
+    argumentos = {} if integrador == "trapezio" else {"integrador": integrador}
+    estatisticas = simular_monte_carlo(DISTRIBUICOES, num_amostras=50, num_processos=1,
+                                       **argumentos)
+
+    J_ph = calcular_corrente_fotogerada_limite(1.12, integrador=integrador)
+    J0 = calcular_corrente_saturacao_radiativa(1.12, integrador=integrador)
+    esperado = extrair_parametros_modelo(J_ph, J0, 300.0, 1.0, 1e-4, 1e3)
+    for nome in ("J_sc", "V_oc_numerico", "Eficiencia"):
+        assert estatisticas[nome].contagem == 50
+        assert estatisticas[nome].minimo == pytest.approx(esperado[nome], rel=1e-12)
+        assert estatisticas[nome].maximo == pytest.approx(esperado[nome], rel=1e-12)
+
+
+def test_integrador_desconhecido():
+    with pytest.raises(ValueError, match="Integrador desconhecido"):
+        simular_monte_carlo(DISTRIBUICOES, num_amostras=10, num_processos=1, integrador="simpson")
@@ -0,0 +1,76 @@
+import numpy as np
+
+from modules.simulation import Simulacao
+
+
+def test_mudanca_de_resistencia_reaproveita_J_ph_e_J0():
+    simulacao = Simulacao(energia_gap_eV=1.12, resistencia_serie=1e-4)
+    simulacao.obter("resultados")
+
+    simulacao.definir(resistencia_serie=2e-4)
+    simulacao.obter("resultados")
+
+    assert simulacao.recalculados == ["curva_JV", "resultados"]
+
+
+def test_corte_antecipado_com_gap_explicito():
+    simulacao = Simulacao(energia_gap_eV=1.12)
+    simulacao.obter("resultados")
+
+    simulacao.definir(temperatura_celula=310.0)
+    simulacao.obter("resultados")
+
+    # energia_gap é refeito mas não muda, então J_ph não é recalculado
+    assert simulacao.recalculados == ["energia_gap", "J0", "curva_JV", "resultados"]
+
+
+def test_gap_de_varshni_propaga_mudanca_de_temperatura():
+    simulacao = Simulacao(energia_gap_eV=None)
+    simulacao.obter("resultados")
+
+    simulacao.definir(temperatura_celula=310.0)
+    simulacao.obter("resultados")
+
+    assert simulacao.recalculados == ["energia_gap", "J_ph", "J0", "curva_JV", "resultados"]
+
+
+def test_resultado_incremental_igual_ao_calculo_do_zero():
+    simulacao = Simulacao(energia_gap_eV=1.12, resistencia_serie=0.5, resistencia_shunt=1e4)
+    simulacao.obter("resultados")
+    simulacao.definir(temperatura_celula=320.0, resistencia_serie=1e-3)
+    incremental = simulacao.obter("resultados")
+
+    do_zero = Simulacao(energia_gap_eV=1.12, temperatura_celula=320.0,
+                        resistencia_serie=1e-3, resistencia_shunt=1e4).obter("resultados")
+
+    for chave in ("J_sc", "V_oc_numerico", "P_max", "FF"):
+        np.testing.assert_allclose(incremental[chave], do_zero[chave], rtol=1e-9)
+
+
+def test_salto_do_slider_com_partida_a_quente_acompanha_lambertw():
+    # Um único salto (como o after_idle da interface agrupa) de Rs baixo para
+    # o padrão Rs = 0,5 Ω·m²: a curva anterior é um palpite ruim
+    simulacao = Simulacao(energia_gap_eV=1.12, resistencia_serie=1e-4, resistencia_shunt=1e2)
+    simulacao.obter("resultados")
+    simulacao.definir(resistencia_serie=0.5, resistencia_shunt=1e4)
+    _, correntes_J = simulacao.obter("curva_JV")
+
+    referencia = Simulacao(energia_gap_eV=1.12, resistencia_serie=0.5, resistencia_shunt=1e4,
+                           metodo_jv="lambertw")
+    _, correntes_referencia = referencia.obter("curva_JV")
+
+    np.testing.assert_allclose(correntes_J, correntes_referencia, rtol=1e-9, atol=1e-9)
+
+
+def test_trabalhador_recebe_progresso_durante_a_curva():
+    from modules.worker import FRACAO_FIM_JV, FRACAO_INICIO_JV, calcular_simulacao
+
+    fracoes = []
+    valores = {"energia_gap": 1.12, "temp_celula": 300.0, "temp_sol": 5778.0,
+               "fator_idealidade": 1.0, "res_serie": 0.5, "res_shunt": 1e4,
+               "v_max": 1.2, "num_pontos": 400}
+    calcular_simulacao(valores, fracoes.append)
+
+    # A curva leva só três iterações de Newton; a do meio já informa progresso
+    assert any(FRACAO_INICIO_JV < f < FRACAO_FIM_JV for f in fracoes)
+    assert fracoes == sorted(fracoes) and fracoes[-1] == 1.0
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from modules import solar
+from modules.solar import _integral_bose_einstein, calcular_corrente_fotogerada_limite
+
+
+def _integral_quadratura(u):
+    """I(u) = ∫_u^∞ x² / (e^x - 1) dx por quadratura adaptativa (cauda além
+    de u + 150 desprezível)."""
+    valor, _ = quad(lambda x: x * x / np.expm1(x), u, u + 150.0, epsabs=0.0, epsrel=1e-13,
+                    limit=200)
+    return valor
+
+
+LIMIAR = solar._LIMIAR_SERIE_BE
+
+
+@pytest.mark.parametrize("u", [1e-8, 1e-3, 0.1, 1.0, 1.9, np.nextafter(LIMIAR, 0.0), LIMIAR,
+                               np.nextafter(LIMIAR, 3.0), 2.1, 5.0, 20.0, 60.0, 200.0])
+def test_integral_bose_einstein_contra_quadratura(u):
+    assert _integral_bose_einstein(u) == pytest.approx(_integral_quadratura(u), rel=1e-13)
+
+
+def test_series_concordam_no_ponto_de_troca():
+    # Bernoulli (40 termos) logo abaixo do limiar e Bose–Einstein no limiar
+    abaixo = _integral_bose_einstein(np.nextafter(LIMIAR, 0.0))
+    no_limiar = _integral_bose_einstein(LIMIAR)
+    assert abaixo == pytest.approx(no_limiar, rel=1e-14)
+
+    # E a troca é contínua dos dois lados, em um vetor
+    u = LIMIAR + np.linspace(-1e-6, 1e-6, 201)
+    assert np.all(np.diff(_integral_bose_einstein(u)) < 0)
+
+
+@pytest.mark.parametrize("temperatura_sol", [4000.0, 5778.0, 7000.0])
+@pytest.mark.parametrize("energia_gap_eV", [0.6, 1.12, 2.0, 3.5])
+def test_analitico_menos_trapezio_e_o_fluxo_acima_de_4_eV(energia_gap_eV, temperatura_sol):
+    analitico = calcular_corrente_fotogerada_limite(energia_gap_eV, temperatura_sol,
+                                                    integrador="analitico")
+    trapezio = calcular_corrente_fotogerada_limite(energia_gap_eV, temperatura_sol)
+    acima_de_4_eV = calcular_corrente_fotogerada_limite(solar.ENERGIA_MAX_TRAPEZIO_EV,
+                                                        temperatura_sol, integrador="analitico")
+
+    assert analitico - trapezio == pytest.approx(acima_de_4_eV, rel=1e-4)
+
+
+def _energias_representaveis(tabela, num_energias=100_000):
+    """Energias sorteadas até o último nó da tabela acima do piso de fluxo."""
+    ultimo = np.flatnonzero(tabela.fluxo_acumulado > solar.PISO_FLUXO_TABELA)[-1]
+    gerador = np.random.default_rng(0)
+    return gerador.uniform(tabela.energia_J[0], tabela.energia_J[ultimo], num_energias)
+
+
+@pytest.mark.parametrize("temperatura, fator_escala, num_pontos", [
+    (5778.0, solar.FATOR_GEOMETRICO_SOL_TERRA, 4000),
+    (300.0, 1.0, 4000),
+    (300.0, 1.0, 500),
+    (150.0, 1.0, 4000),
+    (77.0, 1.0, 4000),
+])
+def test_tabela_respeita_erro_relativo_maximo(temperatura, fator_escala, num_pontos):
+    tabela = solar.tabela_corpo_negro(temperatura, fator_escala, num_pontos)
+    energia_J = _energias_representaveis(tabela)
+    exato = fator_escala * solar.fluxo_fotons_corpo_negro_integrado(energia_J, temperatura)
+
+    erro = np.max(np.abs(tabela.fluxo_acima(energia_J) / exato - 1.0))
+    assert 0.0 < tabela.erro_relativo_maximo < 0.05
+    # Estimado nos pontos médios: o máximo real fica a menos de 1% dele
+    assert erro <= 1.01 * tabela.erro_relativo_maximo
+
+
+@pytest.mark.parametrize("temperatura", [20.0, 77.0, 150.0])
+def test_tabela_abaixo_de_170_K(temperatura):
+    tabela = solar.tabela_corpo_negro(temperatura)
+    energia_J = np.linspace(tabela.energia_J[0], tabela.energia_J[-1], 50_001)
+    fluxo = tabela.fluxo_acima(energia_J)
+
+    # A cauda sai do float64, mas a tabela segue finita, positiva, em ln N
+    # e não crescente em toda a faixa
+    assert solar.fluxo_fotons_corpo_negro_integrado(tabela.energia_J[-1], temperatura) == 0.0
+    assert tabela._escala_log
+    assert np.all(np.isfinite(fluxo)) and np.all(fluxo > 0.0)
+    assert np.all(np.diff(fluxo) <= 0.0)
+    assert np.isfinite(tabela.erro_relativo_maximo)
+
+    # No último nó, já abaixo do piso, J vale q·piso
+    assert tabela.corrente(tabela.energia_J[-1] / solar.q) == pytest.approx(
+        solar.q * solar.PISO_FLUXO_TABELA)
+
+
+@pytest.mark.parametrize("energia_gap_eV", [0.0, 0.005, 10.5, -1.0])
+def test_tabela_fora_da_faixa(energia_gap_eV):
+    tabela = solar.tabela_corpo_negro(300.0)
+    with pytest.raises(ValueError, match="fora da tabela"):
+        tabela.corrente(energia_gap_eV)
+    with pytest.raises(ValueError, match="fora da tabela"):
+        tabela.corrente(np.array([1.12, energia_gap_eV]))
+    with pytest.raises(ValueError, match="fora da tabela"):
+        calcular_corrente_fotogerada_limite(energia_gap_eV, integrador="tabela")
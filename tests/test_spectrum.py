@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from modules.constants import h, c, k_B, q
+from modules.solar import FATOR_GEOMETRICO_SOL_TERRA, calcular_corrente_fotogerada_limite
+from modules.spectrum import EspectroTabelado, carregar_espectro, salvar_espectro
+
+TEMPERATURA_SOL = 5778.0
+COMPRIMENTO_ONDA_NM = np.linspace(250.0, 4000.0, 30_001)
+
+
+def _irradiancia_corpo_negro(comprimento_onda_nm, temperatura):
+    """Irradiância espectral do Sol como corpo negro, na Terra [W/(m^2·nm)]."""
+    lam_m = comprimento_onda_nm * 1e-9
+    radiancia = 2.0 * np.pi * h * c ** 2 / lam_m ** 5 / np.expm1(h * c / (lam_m * k_B * temperatura))
+    return FATOR_GEOMETRICO_SOL_TERRA * radiancia * 1e-9
+
+
+def test_espectro_unico_1d_equivale_a_serie_de_uma_linha():
+    irradiancia = _irradiancia_corpo_negro(COMPRIMENTO_ONDA_NM, TEMPERATURA_SOL)
+    unico = EspectroTabelado(COMPRIMENTO_ONDA_NM, irradiancia)
+    serie = EspectroTabelado(COMPRIMENTO_ONDA_NM, irradiancia[None, :])
+
+    assert unico.num_espectros == 1
+    np.testing.assert_array_equal(unico.corrente_fotogerada([0.9, 1.4]),
+                                  serie.corrente_fotogerada([0.9, 1.4]))
+    assert calcular_corrente_fotogerada_limite(1.12, espectro=unico) == \
+        calcular_corrente_fotogerada_limite(1.12, espectro=serie)
+
+
+def test_arquivo_memmap_ida_e_volta(tmp_path):
+    gerador = np.random.default_rng(0)
+    serie = gerador.uniform(0.5, 1.5, (4, COMPRIMENTO_ONDA_NM.size))
+    caminho = tmp_path / "serie.npy"
+    salvar_espectro(caminho, COMPRIMENTO_ONDA_NM, serie)
+
+    espectro = carregar_espectro(caminho)
+    assert isinstance(espectro.irradiancia, np.memmap)
+    assert espectro.identificador == str(caminho)
+    np.testing.assert_array_equal(espectro.comprimento_onda_nm, COMPRIMENTO_ONDA_NM)
+    np.testing.assert_array_equal(espectro.irradiancia, serie)
+
+    em_memoria = EspectroTabelado(COMPRIMENTO_ONDA_NM, serie)
+    np.testing.assert_array_equal(espectro.corrente_fotogerada(1.12),
+                                  em_memoria.corrente_fotogerada(1.12))
+    assert espectro.impressao_digital == em_memoria.impressao_digital
+
+    # Um espectro 1D gravado volta como série de uma linha
+    salvar_espectro(caminho, COMPRIMENTO_ONDA_NM, serie[2])
+    np.testing.assert_array_equal(carregar_espectro(caminho).irradiancia, serie[2:3])
+
+
+@pytest.mark.parametrize("energia_gap_eV", [0.8, 1.12, 1.8, 3.0])
+def test_corrente_fotogerada_do_corpo_negro_tabelado(energia_gap_eV):
+    espectro = EspectroTabelado(COMPRIMENTO_ONDA_NM,
+                                _irradiancia_corpo_negro(COMPRIMENTO_ONDA_NM, TEMPERATURA_SOL))
+
+    # A tabela só cobre até hc/λ_min: desconta-se o fluxo acima dessa energia
+    energia_max_eV = h * c / (COMPRIMENTO_ONDA_NM[0] * 1e-9) / q
+    esperado = (calcular_corrente_fotogerada_limite(energia_gap_eV, TEMPERATURA_SOL,
+                                                    integrador="analitico")
+                - calcular_corrente_fotogerada_limite(energia_max_eV, TEMPERATURA_SOL,
+                                                      integrador="analitico"))
+    J_ph = calcular_corrente_fotogerada_limite(energia_gap_eV, espectro=espectro)
+    assert J_ph == pytest.approx(esperado, rel=1e-5)
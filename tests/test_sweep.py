@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from modules import sweep
+from modules.analysis import extrair_parametros_modelo
+from modules.device import calcular_corrente_saturacao_radiativa
+from modules.solar import calcular_corrente_fotogerada_limite
+
+EIXOS = {"energia_gap_eV": np.linspace(0.8, 2.0, 1000),
+         "temperatura_celula": np.linspace(250.0, 350.0, 100)}
+
+
+def test_grade_media_gera_varios_blocos_por_processo(monkeypatch):
+    tamanhos = []
+    avaliar = sweep._avaliar_bloco
+
+    def espiao(tarefa):
+        tamanhos.append(tarefa[1] - tarefa[0])
+        return avaliar(tarefa)
+
+    monkeypatch.setattr(sweep, "_avaliar_bloco", espiao)
+    mapa = sweep.mapa_eficiencia(EIXOS, num_processos=1, integrador="analitico")
+
+    assert len(tamanhos) == sweep.BLOCOS_POR_PROCESSO
+    assert sum(tamanhos) == 1000 * 100
+    assert mapa["Eficiencia"].shape == (1000, 100)
+
+
+def test_saida_nao_depende_da_divisao_em_blocos():
+    referencia = sweep.mapa_eficiencia(EIXOS, num_processos=1, tamanho_bloco=100_000,
+                                       integrador="analitico")
+    mapa = sweep.mapa_eficiencia(EIXOS, num_processos=2, tamanho_bloco=777,
+                                 integrador="analitico")
+    for chave in sweep.GRANDEZAS_MAPA:
+        np.testing.assert_array_equal(mapa[chave], referencia[chave])
+
+
+@pytest.mark.parametrize("integrador", ["trapezio", "analitico", "tabela"])
+def test_mapa_concorda_com_pipeline_ponto_a_ponto(integrador):
+    eixos = {"energia_gap_eV": np.array([0.9, 1.12, 1.6]),
+             "temperatura_celula": np.array([280.0, 320.0])}
+    fixos = {"temperatura_sol": 5500.0, "resistencia_serie": 1e-4, "resistencia_shunt": 1e3}
+    argumentos = {} if integrador == "trapezio" else {"integrador": integrador}
+    mapa = sweep.mapa_eficiencia(eixos, num_processos=1, **argumentos, **fixos)
+
+    for i, Eg in enumerate(eixos["energia_gap_eV"]):
+        for j, T in enumerate(eixos["temperatura_celula"]):
+            J_ph = calcular_corrente_fotogerada_limite(Eg, 5500.0, integrador=integrador)
+            J0 = calcular_corrente_saturacao_radiativa(Eg, T, integrador=integrador)
+            esperado = extrair_parametros_modelo(J_ph, J0, T, 1.0, 1e-4, 1e3)
+            for chave in sweep.GRANDEZAS_MAPA:
+                np.testing.assert_allclose(mapa[chave][i, j], esperado[chave], rtol=1e-12)
+
+
+def test_integrador_padrao_trunca_em_4_eV_como_a_cli():
+    eixos = {"energia_gap_eV": np.array([1.12])}
+    padrao = sweep.mapa_eficiencia(eixos, num_processos=1)
+    analitico = sweep.mapa_eficiencia(eixos, num_processos=1, integrador="analitico")
+
+    # O fluxo acima de 4 eV (~11 A/m² para o Sol a 5778 K) fica de fora
+    diferenca = analitico["J_sc"][0] - padrao["J_sc"][0]
+    assert diferenca == pytest.approx(calcular_corrente_fotogerada_limite(4.0, integrador="analitico"),
+                                      rel=1e-3)